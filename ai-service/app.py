@@ -2,15 +2,25 @@ import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Literal, Optional
 import os
+import asyncio
 from dotenv import load_dotenv
 
+# Load environment variables before service modules read their settings
+load_dotenv()
+
 from services.resume_analyzer import analyze_resume_text
 from services.jd_matcher import compare_resume_jd
+from services.full_analysis import run_full_analysis, stream_full_analysis
+from services.job_index import job_index
+from services.cohort_analytics import cohorts
+from services import diagnostics, text_compression, traffic_capture
+from services.admission import AdmissionController, AdmissionMiddleware
 from services.roadmap_generator import generate_learning_roadmap
 from services.chat_mentor import chat_with_mentor
 from services.interview_prep_planner import generate_interview_prep_plan
@@ -19,11 +29,15 @@ from services.classroom_assistants import (
     chat_with_coding_assistant,
     chat_with_aptitude_assistant
 )
+from services.practice_set import run_practice_set, stream_practice_set, PRACTICE_SET_MAX_QUESTIONS
+from services.job_queue import JobQueue
+from services.precompute import Precomputer, run_precompute_job, JOB_TYPE as PRECOMPUTE_JOB_TYPE
+from services.warmup import warm_up, readiness
+from services.session_store import SessionStore
+from services.token_usage import ledger, usage_scope, BudgetExceededError
+from services.http_responses import FastJSONResponse, CompressionMiddleware, fast_response, dumps
 
-# Load environment variables
-load_dotenv()
-
-app = FastAPI(title="AI Placement Mentor - AI Service")
+app = FastAPI(title="AI Placement Mentor - AI Service", default_response_class=FastJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -34,9 +48,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for large JSON bodies (streams are left uncompressed)
+app.add_middleware(CompressionMiddleware)
+
+# Attribute LLM token usage to the endpoint and the caller-supplied user,
+# and report the prompt-input tokens saved by local compression
+@app.middleware("http")
+async def usage_context(request: Request, call_next):
+    with usage_scope(endpoint=request.url.path, user=request.headers.get("X-User-Id")), \
+            text_compression.savings_scope() as savings:
+        response = await call_next(request)
+    if savings["original"]:
+        response.headers["X-Input-Tokens-Saved"] = str(savings["original"] - savings["compressed"])
+    return response
+
+# Admission control: per-endpoint adaptive concurrency limits with short
+# queues; overload is shed with 503 + Retry-After. Endpoints not listed
+# (health, admin, job polling/SSE) are never limited.
+admission = AdmissionController()
+admission.route(r"^/ai/chat$", "light")
+admission.route(r"^/ai/classroom/[^/]+$", "light")
+admission.route(r"^/ai/recommend-jobs$", "light")
+admission.route(r"^/ai/job-profiles", "light", methods=("POST", "DELETE"))
+admission.route(r"^/ai/jobs$", "light")
+admission.route(r"^/ai/analytics/", "light")
+admission.route(r"^/ai/analyze-resume$", "standard")
+admission.route(r"^/ai/compare-resume-jd$", "standard")
+admission.route(r"^/ai/full-analysis$", "standard")
+admission.route(r"^/ai/generate-roadmap$", "heavy")
+admission.route(r"^/ai/interview-prep-plan$", "heavy")
+admission.route(r"^/ai/classroom/[^/]+/practice-set$", "heavy")
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
+# Opt-in traffic capture (TRAFFIC_CAPTURE_PATH) for offline replay; outermost
+# so arrival times and shed requests are recorded as clients saw them
+app.add_middleware(traffic_capture.TrafficCaptureMiddleware, recorder=traffic_capture.recorder)
+
+# Admin endpoints require the X-Admin-Token header to match ADMIN_TOKEN
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if x_admin_token != expected:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
 # Request/Response Models
+class PrecomputeJob(BaseModel):
+    jd_text: str
+    target_role: str
+
+class PrecomputeHints(BaseModel):
+    target_role: Optional[str] = None
+    # Same default as the frontend's roadmap form
+    timeframe_months: int = 6
+    # The drive's current JDs, most relevant first
+    jobs: List[PrecomputeJob] = []
+
 class ResumeAnalysisRequest(BaseModel):
     resume_text: str
+    # Likely follow-ups to generate in the background (needs X-User-Id)
+    precompute: Optional[PrecomputeHints] = None
 
 class ResumeAnalysisResponse(BaseModel):
     skills: List[str]
@@ -58,6 +129,9 @@ class CompareResponse(BaseModel):
     projectSuggestions: List[str]
     learningSuggestions: List[str]
 
+class FullAnalysisResponse(ResumeAnalysisResponse, CompareResponse):
+    pass
+
 class RoadmapRequest(BaseModel):
     target_role: str
     timeframe_months: int
@@ -78,11 +152,15 @@ class ChatMessage(BaseModel):
 
 class ChatRequest(BaseModel):
     message: str
-    conversation_history: List[ChatMessage] = []
+    # Omit the history and pass conversation_id to use the server-side session;
+    # send both only to (re)seed a session the AI service does not know yet
+    conversation_history: Optional[List[ChatMessage]] = None
+    conversation_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
     role: str
+    conversation_id: Optional[str] = None
 
 class InterviewRound(BaseModel):
     roundName: str
@@ -100,11 +178,225 @@ class InterviewPrepRequest(BaseModel):
 class InterviewPrepResponse(BaseModel):
     preparationPlan: dict
 
+class JobProfileItem(BaseModel):
+    id: str
+    title: str
+    jd_text: str
+    company: str = ""
+    owner: Optional[str] = None
+
+class JobProfilesRequest(BaseModel):
+    profiles: List[JobProfileItem]
+
+class RecommendJobsRequest(BaseModel):
+    resume_text: str
+    skills: List[str] = []
+    top_n: int = Field(10, ge=1, le=100)
+    # Restrict to one owner's job profiles (e.g. the backend user id)
+    owner: Optional[str] = None
+    min_score: float = 0.0
+
+class PracticeSetRequest(BaseModel):
+    questions: List[str]
+    # Questions per batched prompt (default PRACTICE_SET_BATCH_SIZE)
+    batch_size: Optional[int] = None
+
+class CohortStudent(BaseModel):
+    id: str
+    skills: List[str] = []
+    # Optional; skills mentioned in it are added to the list above
+    resume_text: str = ""
+
+class CohortJD(BaseModel):
+    id: str
+    title: str = ""
+    required_skills: List[str] = []
+    preferred_skills: List[str] = []
+    # Used for required skills when none are given
+    jd_text: str = ""
+
+class CohortMembersRequest(BaseModel):
+    students: List[CohortStudent] = []
+    jds: List[CohortJD] = []
+
+class CohortReportRequest(BaseModel):
+    # Restrict to these JDs (default: all JDs in the cohort)
+    jd_ids: List[str] = []
+    # Share of a JD's required skills a student needs to count as eligible
+    min_match: float = 0.7
+    # Only report skills missing for at least this share of students
+    gap_threshold: float = 0.0
+    top_skills: int = 20
+
+class JobSubmitRequest(BaseModel):
+    job_type: str
+    payload: dict
+    priority: int = 5
+
+# --------------------------------------------------
+# Async job queue for long-running generations
+# --------------------------------------------------
+async def run_roadmap_job(payload: dict):
+    request = RoadmapRequest(**payload)
+    with usage_scope(endpoint="job:roadmap"):
+        return await generate_learning_roadmap(
+            request.target_role,
+            request.timeframe_months,
+            request.current_skills
+        )
+
+async def run_interview_prep_job(payload: dict):
+    request = InterviewPrepRequest(**payload)
+    with usage_scope(endpoint="job:interview_prep"):
+        result = await generate_interview_prep_plan(
+            request.company,
+            request.position,
+            request.interview_date,
+            [round.model_dump() for round in request.rounds],
+            request.user_skills,
+            request.additional_notes
+        )
+    return {"preparationPlan": result}
+
+JOB_REQUEST_MODELS = {
+    "roadmap": RoadmapRequest,
+    "interview_prep": InterviewPrepRequest,
+}
+
+job_queue = JobQueue(
+    db_path=os.getenv("JOB_QUEUE_DB", os.path.join("data", "jobs.sqlite3")),
+    workers=int(os.getenv("JOB_QUEUE_WORKERS", 4)),
+    result_ttl=int(os.getenv("JOB_RESULT_TTL_SECONDS", 3600))
+)
+job_queue.register("roadmap", run_roadmap_job, max_concurrency=int(os.getenv("JOB_CONCURRENCY_ROADMAP", 2)))
+job_queue.register("interview_prep", run_interview_prep_job, max_concurrency=int(os.getenv("JOB_CONCURRENCY_INTERVIEW_PREP", 3)))
+job_queue.register(PRECOMPUTE_JOB_TYPE, run_precompute_job, max_concurrency=int(os.getenv("JOB_CONCURRENCY_PRECOMPUTE", 1)))
+
+# Speculative follow-ups (roadmap, JD comparisons) queued after a resume
+# analysis and served from the job queue when the request arrives
+precomputer = Precomputer(
+    job_queue,
+    user_budget=int(os.getenv("PRECOMPUTE_USER_BUDGET", 6)),
+    window_seconds=int(os.getenv("PRECOMPUTE_BUDGET_WINDOW_SECONDS", 3600)),
+    max_jobs=int(os.getenv("PRECOMPUTE_MAX_JDS", 3)),
+    wait_seconds=float(os.getenv("PRECOMPUTE_WAIT_SECONDS", 20)),
+    max_users=int(os.getenv("PRECOMPUTE_MAX_USERS", 10000))
+)
+
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+
+# Warm-up runs in the background so liveness answers immediately;
+# set WARMUP_BLOCKING=true to finish it before accepting traffic
+@app.on_event("startup")
+async def start_warmup():
+    if os.getenv("WARMUP_ON_STARTUP", "true").lower() != "true":
+        return
+    if os.getenv("WARMUP_BLOCKING", "false").lower() == "true":
+        await warm_up()
+    else:
+        app.state.warmup_task = asyncio.create_task(warm_up())
+
+# Loop-lag monitor and stall watchdog (DIAG_ENABLED=false to turn off)
+@app.on_event("startup")
+async def start_diagnostics():
+    diagnostics.start()
+
+@app.on_event("shutdown")
+async def stop_diagnostics():
+    diagnostics.stop()
+
+@app.on_event("shutdown")
+async def stop_traffic_capture():
+    await asyncio.to_thread(traffic_capture.close)
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+
+# The job index is saved periodically (and on shutdown) rather than on
+# every upsert, since each save rewrites the whole matrix
+async def flush_job_index():
+    interval = int(os.getenv("JOB_INDEX_FLUSH_SECONDS", 30))
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(job_index.save)
+        except Exception as e:
+            logger.error(f"Job index save failed: {e}")
+
+@app.on_event("startup")
+async def start_job_index_flush():
+    app.state.job_index_flush_task = asyncio.create_task(flush_job_index())
+
+@app.on_event("shutdown")
+async def save_job_index():
+    app.state.job_index_flush_task.cancel()
+    await asyncio.to_thread(job_index.save)
+
+# --------------------------------------------------
+# Server-side conversation sessions
+# --------------------------------------------------
+session_store = SessionStore(
+    max_sessions=int(os.getenv("SESSION_MAX", 1000)),
+    idle_ttl=int(os.getenv("SESSION_IDLE_TTL_SECONDS", 1800)),
+    spill_dir=os.getenv("SESSION_SPILL_DIR") or None
+)
+
+def resolve_session(scope: str, request: ChatRequest):
+    """
+    Look up (or seed) the session for a request carrying a conversation_id.
+    Returns None for legacy requests that ship the full history.
+    """
+    if not request.conversation_id:
+        return None
+    key = SessionStore.make_key(scope, request.conversation_id)
+    if request.conversation_history is None:
+        session = session_store.get(key)
+        if session is None:
+            raise HTTPException(
+                status_code=409,
+                detail="Unknown conversation_id; resend with conversation_history to seed the session"
+            )
+        return session
+    history = [{"role": msg.role, "content": msg.content} for msg in request.conversation_history]
+    return session_store.seed(key, history)
+
+def run_chat_turn(session, request: ChatRequest, chat_fn):
+    if session is None:
+        conversation = [
+            {"role": msg.role, "content": text_compression.compress_text(msg.content, "chat")}
+            for msg in request.conversation_history or []
+        ]
+        return chat_fn(request.message, conversation)
+
+    result = chat_fn(request.message, context=session.context())
+    session.append("user", request.message)
+    session.append(result["role"], result["response"])
+    result["conversation_id"] = request.conversation_id
+    return result
+
 # Health check endpoint - handle both GET and HEAD
 @app.get("/health")
 @app.head("/health")
 async def health_check():
-    return {"status": "ok", "message": "AI Service is running"}
+    state = readiness()
+    return {
+        "status": "ok",
+        "message": "AI Service is running",
+        "live": True,
+        "ready": state["ready"],
+        "warmup": state
+    }
+
+# Readiness probe - 503 until warm-up has finished
+@app.get("/health/ready")
+async def readiness_check():
+    state = readiness()
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content={"ready": False, "warmup": state})
+    return {"ready": True, "warmup": state}
 
 # Root endpoint
 @app.get("/")
@@ -113,47 +405,76 @@ async def root():
 
 # Endpoint 1: Analyze Resume
 @app.post("/ai/analyze-resume", response_model=ResumeAnalysisResponse)
-async def analyze_resume(request: ResumeAnalysisRequest):
+async def analyze_resume(request: ResumeAnalysisRequest, x_user_id: Optional[str] = Header(default=None)):
     logger.info(f"Received resume analysis request, text length: {len(request.resume_text)}")
     try:
         result = await analyze_resume_text(request.resume_text)
-        return result
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing resume: {str(e)}")
 
+    if request.precompute and x_user_id:
+        hints = request.precompute
+        try:
+            precomputer.schedule(
+                x_user_id,
+                request.resume_text,
+                result.get("skills", []),
+                target_role=hints.target_role,
+                timeframe_months=hints.timeframe_months,
+                jobs=[job.model_dump() for job in hints.jobs]
+            )
+        except Exception as e:
+            # Speculation must never fail the analysis itself
+            logger.error(f"Precompute scheduling failed: {e}")
+    return result
+
 # Endpoint 2: Compare Resume with JD
 @app.post("/ai/compare-resume-jd", response_model=CompareResponse)
-async def compare_resume_with_jd(request: CompareRequest):
+async def compare_resume_with_jd(request: CompareRequest, x_user_id: Optional[str] = Header(default=None)):
     try:
+        cached = await precomputer.lookup("compare", request.model_dump(), x_user_id)
+        if cached is not None:
+            return cached
         result = await compare_resume_jd(
             request.resume_text,
             request.jd_text,
             request.target_role
         )
         return result
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error comparing resume and JD: {str(e)}")
 
 # Endpoint 3: Generate Roadmap
 @app.post("/ai/generate-roadmap", response_model=RoadmapResponse)
-async def generate_roadmap(request: RoadmapRequest):
+async def generate_roadmap(request: RoadmapRequest, x_user_id: Optional[str] = Header(default=None)):
     try:
+        cached = await precomputer.lookup("roadmap", request.model_dump(), x_user_id)
+        if cached is not None:
+            return fast_response(cached)
         result = await generate_learning_roadmap(
             request.target_role,
             request.timeframe_months,
             request.current_skills
         )
-        return result
+        # Weeks are already normalized by the service; skip re-validation
+        return fast_response(result)
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating roadmap: {str(e)}")
 
 # Endpoint 4: Chat with Mentor
 @app.post("/ai/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
+    session = resolve_session("mentor", request)
     try:
-        conversation = [{"role": msg.role, "content": msg.content} for msg in request.conversation_history]
-        result = chat_with_mentor(request.message, conversation)
-        return result
+        return await asyncio.to_thread(run_chat_turn, session, request, chat_with_mentor)
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in chat: {str(e)}")
 
@@ -178,40 +499,268 @@ async def generate_prep_plan(request: InterviewPrepRequest):
             request.user_skills,
             request.additional_notes
         )
-        return {"preparationPlan": result}
+        # preparationPlan is a free-form dict; nothing for a model to validate
+        return fast_response({"preparationPlan": result})
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating prep plan: {str(e)}")
 
 # Endpoint 6: Technical Assistant Chat
 @app.post("/ai/classroom/technical", response_model=ChatResponse)
 async def technical_assistant_chat(request: ChatRequest):
+    session = resolve_session("technical", request)
     try:
-        conversation = [{"role": msg.role, "content": msg.content} for msg in request.conversation_history]
-        result = chat_with_technical_assistant(request.message, conversation)
-        return result
+        return await asyncio.to_thread(run_chat_turn, session, request, chat_with_technical_assistant)
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in technical assistant: {str(e)}")
 
 # Endpoint 7: Coding Assistant Chat
 @app.post("/ai/classroom/coding", response_model=ChatResponse)
 async def coding_assistant_chat(request: ChatRequest):
+    session = resolve_session("coding", request)
     try:
-        conversation = [{"role": msg.role, "content": msg.content} for msg in request.conversation_history]
-        result = chat_with_coding_assistant(request.message, conversation)
-        return result
+        return await asyncio.to_thread(run_chat_turn, session, request, chat_with_coding_assistant)
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in coding assistant: {str(e)}")
 
 # Endpoint 8: Aptitude Assistant Chat
 @app.post("/ai/classroom/aptitude", response_model=ChatResponse)
 async def aptitude_assistant_chat(request: ChatRequest):
+    session = resolve_session("aptitude", request)
     try:
-        conversation = [{"role": msg.role, "content": msg.content} for msg in request.conversation_history]
-        result = chat_with_aptitude_assistant(request.message, conversation)
-        return result
+        # Solver and LLM call both block; keep them off the event loop
+        return await asyncio.to_thread(run_chat_turn, session, request, chat_with_aptitude_assistant)
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in aptitude assistant: {str(e)}")
 
+# Endpoint 9: Submit Async Job
+@app.post("/ai/jobs", status_code=202)
+async def submit_job(request: JobSubmitRequest):
+    model = JOB_REQUEST_MODELS.get(request.job_type)
+    if model is None:
+        raise HTTPException(status_code=400, detail=f"Unknown job type: {request.job_type}")
+    try:
+        payload = model(**request.payload).model_dump()
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    try:
+        return job_queue.submit(request.job_type, payload, request.priority)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error submitting job: {str(e)}")
+
+# Endpoint 10: Poll Async Job
+@app.get("/ai/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+# Endpoint 11: Subscribe to Async Job progress (Server-Sent Events)
+@app.get("/ai/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    async def event_stream():
+        async for job in job_queue.subscribe(job_id):
+            yield f"event: {job['status']}\ndata: {dumps(job)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+# Endpoint 12: Cancel Async Job
+@app.delete("/ai/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if not job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job is not queued (already running, finished or unknown)")
+    return job_queue.get(job_id)
+
+# Endpoint 13: Resume analysis and JD comparison in one call
+# (?stream=true returns NDJSON, one line per part as it completes)
+@app.post("/ai/full-analysis", response_model=FullAnalysisResponse)
+async def full_analysis(request: CompareRequest, stream: bool = False):
+    if stream:
+        async def part_stream():
+            async for event in stream_full_analysis(request.resume_text, request.jd_text, request.target_role):
+                yield dumps(event) + "\n"
+
+        return StreamingResponse(part_stream(), media_type="application/x-ndjson")
+    try:
+        result = await run_full_analysis(request.resume_text, request.jd_text, request.target_role)
+        return result
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error in full analysis: {str(e)}")
+
+# Endpoint 14: Add or update job profiles in the recommendation index
+@app.post("/ai/job-profiles")
+async def upsert_job_profiles(request: JobProfilesRequest):
+    try:
+        def index_all():
+            job_index.load()
+            return [
+                job_index.upsert(p.id, p.title, p.jd_text, company=p.company, owner=p.owner)["id"]
+                for p in request.profiles
+            ]
+
+        indexed = await asyncio.to_thread(index_all)
+        return {"indexed": indexed, "indexSize": len(job_index)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error indexing job profiles: {str(e)}")
+
+# Endpoint 15: Remove a job profile from the recommendation index
+@app.delete("/ai/job-profiles/{job_id}")
+async def remove_job_profile(job_id: str):
+    await asyncio.to_thread(job_index.load)
+    if not job_index.remove(job_id):
+        raise HTTPException(status_code=404, detail="Job profile not indexed")
+    return {"removed": job_id, "indexSize": len(job_index)}
+
+# Endpoint 16: Top-N job profiles for a resume (no LLM call)
+@app.post("/ai/recommend-jobs")
+async def recommend_jobs(request: RecommendJobsRequest):
+    try:
+        await asyncio.to_thread(job_index.load)
+        return job_index.query(
+            request.resume_text,
+            skills=request.skills,
+            top_n=request.top_n,
+            owner=request.owner,
+            min_score=request.min_score
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error recommending jobs: {str(e)}")
+
+# Endpoint 17: Drop a user's speculative results (e.g. resume deleted)
+@app.delete("/ai/precompute/{user_id}")
+async def drop_precomputed(user_id: str):
+    return {"dropped": precomputer.invalidate(user_id)}
+
+# Endpoint 18: Add or update a cohort's students and JDs (creates the cohort)
+@app.post("/ai/analytics/cohorts/{cohort_id}/members")
+async def upsert_cohort_members(cohort_id: str, request: CohortMembersRequest):
+    try:
+        cohort = cohorts.get(cohort_id, create=True)
+
+        def upsert_all():
+            if request.jds:
+                cohort.upsert_jds([jd.model_dump() for jd in request.jds])
+            if request.students:
+                cohort.upsert_students([s.model_dump() for s in request.students])
+            return cohort.stats()
+
+        return await asyncio.to_thread(upsert_all)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating cohort: {str(e)}")
+
+# Endpoint 19: Remove a student or JD from a cohort
+@app.delete("/ai/analytics/cohorts/{cohort_id}/{kind}/{item_id}")
+async def remove_cohort_member(cohort_id: str, kind: Literal["students", "jds"], item_id: str):
+    cohort = cohorts.get(cohort_id)
+    if cohort is None:
+        raise HTTPException(status_code=404, detail="Cohort not found")
+    removed = cohort.remove_student(item_id) if kind == "students" else cohort.remove_jd(item_id)
+    if not removed:
+        raise HTTPException(status_code=404, detail=f"Not in cohort: {item_id}")
+    return cohort.stats()
+
+# Endpoint 20: Drop a whole cohort
+@app.delete("/ai/analytics/cohorts/{cohort_id}")
+async def drop_cohort(cohort_id: str):
+    if not cohorts.drop(cohort_id):
+        raise HTTPException(status_code=404, detail="Cohort not found")
+    return {"dropped": cohort_id}
+
+# Endpoint 21: Skill coverage, gaps and per-JD eligibility for a cohort (no LLM call)
+@app.post("/ai/analytics/cohorts/{cohort_id}/report")
+async def cohort_report(cohort_id: str, request: CohortReportRequest):
+    cohort = cohorts.get(cohort_id)
+    if cohort is None:
+        raise HTTPException(status_code=404, detail="Cohort not found (upload its members first)")
+    try:
+        return await asyncio.to_thread(
+            cohort.report,
+            jd_ids=request.jd_ids,
+            min_match=request.min_match,
+            gap_threshold=request.gap_threshold,
+            top_skills=request.top_skills
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building cohort report: {str(e)}")
+
+# Endpoint 22: Cohorts held in memory
+@app.get("/ai/analytics/cohorts")
+async def list_cohorts():
+    return cohorts.stats()
+
+# Endpoint 23: Practice set - several questions answered in a few batched prompts
+# (?stream=true returns NDJSON, one line per answer as its batch completes)
+@app.post("/ai/classroom/{assistant}/practice-set")
+async def classroom_practice_set(assistant: Literal["technical", "aptitude"], request: PracticeSetRequest,
+                                 stream: bool = False):
+    if not 1 <= len(request.questions) <= PRACTICE_SET_MAX_QUESTIONS:
+        raise HTTPException(status_code=400, detail=f"A practice set needs 1-{PRACTICE_SET_MAX_QUESTIONS} questions")
+    if stream:
+        async def answer_stream():
+            async for event in stream_practice_set(request.questions, assistant, request.batch_size):
+                yield dumps(event) + "\n"
+
+        return StreamingResponse(answer_stream(), media_type="application/x-ndjson")
+    try:
+        return await run_practice_set(request.questions, assistant, request.batch_size)
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error in {assistant} practice set: {str(e)}")
+
+# Admin: token usage per endpoint, model and user
+@app.get("/admin/usage", dependencies=[Depends(require_admin)])
+async def token_usage():
+    return {**ledger.snapshot(), "inputCompression": text_compression.stats()}
+
+# Admin: speculative precompute hit rates, budget skips and token spend
+@app.get("/admin/precompute", dependencies=[Depends(require_admin)])
+async def precompute_stats():
+    return precomputer.stats()
+
+# Admin: admission limits, queues and shed counts per endpoint
+@app.get("/admin/admission", dependencies=[Depends(require_admin)])
+async def admission_stats():
+    return admission.stats()
+
+# Admin: traffic capture / LLM replay state
+@app.get("/admin/traffic", dependencies=[Depends(require_admin)])
+async def traffic_stats():
+    return traffic_capture.stats()
+
+# Admin: event-loop lag and recent stalls (with the blocking stack)
+@app.get("/admin/diagnostics", dependencies=[Depends(require_admin)])
+async def loop_diagnostics():
+    return diagnostics.loop_monitor.stats()
+
+# Admin: time-bounded sampling profile as collapsed stacks
+# (feed to flamegraph.pl or load in speedscope)
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def sampling_profile(seconds: float = 5.0, interval_ms: float = 5.0, loop_only: bool = False):
+    try:
+        result = await asyncio.to_thread(
+            diagnostics.sample_profile, seconds, max(interval_ms, 1.0) / 1000, loop_only
+        )
+    except diagnostics.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(
+        result["collapsed"] + "\n",
+        headers={"X-Profile-Samples": str(result["samples"]), "X-Profile-Seconds": str(result["seconds"])}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Cohort analytics benchmark - load time, cold and cached report latency and
+the cost of a single resume arriving, on a synthetic cohort.
+
+Usage:
+    python benchmarks/cohort_analytics_bench.py
+    python benchmarks/cohort_analytics_bench.py --students 20000 --jds 500
+    python benchmarks/cohort_analytics_bench.py --max-ms 500   # non-zero exit if a cold report is slower
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from services.cohort_analytics import Cohort, sparse  # noqa: E402
+from services.skill_normalizer import SKILL_ALIASES  # noqa: E402
+
+
+def synthetic_cohort(rng: random.Random, students: int, jds: int):
+    # Skewed popularity, like real cohorts: a few skills everyone lists, a long tail
+    skills = list(SKILL_ALIASES)
+    weights = [1.0 / (rank + 1) for rank in range(len(skills))]
+
+    def sample(k):
+        return list({s for s in rng.choices(skills, weights=weights, k=k)})
+
+    student_rows = [{"id": f"s{i}", "skills": sample(rng.randint(5, 25))} for i in range(students)]
+    jd_rows = [
+        {"id": f"j{i}", "title": f"Role {i}", "required_skills": sample(rng.randint(4, 12)),
+         "preferred_skills": sample(rng.randint(0, 6))}
+        for i in range(jds)
+    ]
+    return student_rows, jd_rows, sample
+
+
+def timed(fn, runs: int = 1) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cohort analytics latency benchmark")
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--jds", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-ms", type=float, default=0.0, help="fail if a cold report is slower")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    students, jds, sample = synthetic_cohort(rng, args.students, args.jds)
+    cohort = Cohort("bench")
+
+    load_ms = timed(lambda: (cohort.upsert_jds(jds), cohort.upsert_students(students)))
+    cold_ms = timed(cohort.report)
+    cached_ms = timed(cohort.report, args.runs)
+
+    def arrive():
+        cohort.upsert_students([{"id": f"s{rng.randrange(args.students)}", "skills": sample(15)}])
+        cohort.report()
+
+    incremental_ms = timed(arrive, args.runs)
+    top20 = [jd["id"] for jd in jds[:20]]
+    subset_ms = timed(lambda: cohort.report(jd_ids=top20, gap_threshold=0.7))
+
+    stats = cohort.stats()
+    print(f"cohort: {stats['students']:,} students x {stats['jds']:,} JDs, {stats['skills']} skills "
+          f"({'scipy.sparse' if sparse is not None else 'numpy'})")
+    print(f"{'step':<34}{'ms':>10}")
+    for step, ms in (
+        ("load (normalize + index)", load_ms),
+        ("cold report", cold_ms),
+        ("cached report", cached_ms),
+        ("1 resume upsert + report", incremental_ms),
+        ("top-20 JDs, gaps >= 70%", subset_ms),
+    ):
+        print(f"{step:<34}{ms:>10.2f}")
+
+    if args.max_ms and cold_ms > args.max_ms:
+        print(f"FAIL: cold report {cold_ms:.1f} ms > {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Compact output benchmark - completion tokens and generation time of the
+full JSON format vs. the compact format, per endpoint.
+
+Offline (default) it serializes representative responses both ways and
+estimates generation time from each provider's decode speed. With --live
+it sends both prompts to the configured LLMs and times the real calls.
+
+Usage:
+    python benchmarks/compact_output_bench.py
+    python benchmarks/compact_output_bench.py --groq-tps 700 --gemini-tps 90
+    python benchmarks/compact_output_bench.py --live --runs 3
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(os.path.join(SERVICE_DIR, ".env"))
+
+from services.token_usage import count_tokens  # noqa: E402
+from services.roadmap_library import roadmap_from_library  # noqa: E402
+from services.compact_output import compact_prep_plan, compact_roadmap, compact_compare  # noqa: E402
+from serialization_bench import prep_plan_payload  # noqa: E402
+
+ROUNDS = [
+    {"roundName": "Online Assessment", "roundType": "coding", "description": "DSA, 90 minutes"},
+    {"roundName": "Technical Round 1", "roundType": "technical", "description": "CS fundamentals"},
+    {"roundName": "System Design", "roundType": "system-design", "description": ""},
+    {"roundName": "HR", "roundType": "hr", "description": ""},
+]
+
+COMPARE_SAMPLE = {
+    "atsScore": 72,
+    "matchScore": 64,
+    "strengths": ["Solid Python and SQL project work", "Internship with measurable impact",
+                  "Clear, ATS-friendly section structure"],
+    "weaknesses": ["No cloud deployment experience", "Few quantified results in project bullets",
+                   "System design exposure not shown"],
+    "missingSkills": ["AWS", "Docker", "Kubernetes", "CI/CD"],
+    "projectSuggestions": ["Deploy a containerized REST API to AWS with a CI/CD pipeline",
+                           "Build a URL shortener with caching and load testing"],
+    "learningSuggestions": ["AWS Cloud Practitioner certification", "Docker and Kubernetes fundamentals course",
+                            "Grokking the System Design Interview"],
+}
+
+# endpoint -> (provider, verbose response, compact response)
+def samples() -> dict:
+    roadmap = roadmap_from_library("Software Engineer", 4, [])
+    plan = prep_plan_payload(14)["preparationPlan"]
+    return {
+        "/ai/generate-roadmap (4 months)": ("gemini", roadmap, compact_roadmap(roadmap)),
+        "/ai/interview-prep-plan (14 days)": ("groq", plan, compact_prep_plan(plan, ROUNDS)),
+        "/ai/compare-resume-jd": ("groq", COMPARE_SAMPLE, compact_compare(COMPARE_SAMPLE)),
+    }
+
+
+def offline(args):
+    tps = {"groq": args.groq_tps, "gemini": args.gemini_tps}
+    print(f"{'endpoint':<36}{'full tok':>10}{'compact':>10}{'saved':>8}{'est. s full':>13}{'est. s compact':>16}")
+    for endpoint, (provider, verbose, compact) in samples().items():
+        # Models emit pretty-printed JSON for the full format
+        full = count_tokens(json.dumps(verbose, indent=2))
+        short = count_tokens(json.dumps(compact, separators=(",", ":")))
+        print(f"{endpoint:<36}{full:>10}{short:>10}{1 - short / full:>8.0%}"
+              f"{full / tps[provider]:>13.2f}{short / tps[provider]:>16.2f}")
+
+
+def live(args):
+    import asyncio
+    from services import compact_output
+    from services.roadmap_generator import generate_learning_roadmap
+    from services.interview_prep_planner import generate_interview_prep_plan
+    from services.token_usage import ledger
+
+    calls = {
+        "/ai/generate-roadmap": lambda: generate_learning_roadmap("Site Reliability Engineer", 3, ["python"]),
+        "/ai/interview-prep-plan": lambda: generate_interview_prep_plan(
+            "Acme", "SDE", time.strftime("%Y-%m-%d", time.localtime(time.time() + 14 * 86400)), ROUNDS, ["python"]
+        ),
+    }
+    print(f"{'endpoint':<28}{'mode':>9}{'median s':>10}{'completion tok':>16}")
+    for endpoint, call in calls.items():
+        for mode in ("full", "compact"):
+            compact_output.COMPACT_OUTPUT_ENABLED = mode == "compact"
+            # The services read the flag at import time
+            for module in ("services.roadmap_generator", "services.interview_prep_planner"):
+                sys.modules[module].COMPACT_OUTPUT_ENABLED = compact_output.COMPACT_OUTPUT_ENABLED
+            timings, completions = [], []
+            for _ in range(args.runs):
+                before = ledger.snapshot()["totals"]["completionTokens"]
+                started = time.perf_counter()
+                asyncio.run(call())
+                timings.append(time.perf_counter() - started)
+                completions.append(ledger.snapshot()["totals"]["completionTokens"] - before)
+            print(f"{endpoint:<28}{mode:>9}{statistics.median(timings):>10.2f}{statistics.median(completions):>16.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full vs. compact LLM output benchmark")
+    parser.add_argument("--live", action="store_true", help="call the configured LLMs")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--groq-tps", type=float, default=750.0, help="Groq decode tokens/s for estimates")
+    parser.add_argument("--gemini-tps", type=float, default=90.0, help="Gemini decode tokens/s for estimates")
+    args = parser.parse_args()
+    live(args) if args.live else offline(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark - measures how long `import app` takes in a fresh
+interpreter, which is what an autoscaled container pays before serving.
+
+Usage:
+    python benchmarks/import_time.py                 # 5 runs, summary
+    python benchmarks/import_time.py --runs 10 --top 15
+    python benchmarks/import_time.py --max-seconds 2.5   # non-zero exit if slower
+    python benchmarks/import_time.py --record benchmarks/import_history.jsonl
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_once(module: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SERVICE_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def top_imports(module: str, limit: int) -> list:
+    """
+    Top-level imports ranked by cumulative time, from `python -X importtime`
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVICE_DIR,
+        capture_output=True,
+        text=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us = int(match.group(2))
+        depth = len(match.group(3)) // 2
+        entries.append((depth, cumulative_us, match.group(4)))
+
+    top_level = [e for e in entries if e[0] <= 1]
+    top_level.sort(key=lambda e: e[1], reverse=True)
+    return [{"module": name, "seconds": round(us / 1e6, 4)} for _, us, name in top_level[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure AI service cold-start import time")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--record", default=None, help="Append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    samples = [measure_once(args.module) for _ in range(args.runs)]
+    summary = {
+        "timestamp": time.time(),
+        "module": args.module,
+        "runs": args.runs,
+        "medianSeconds": round(statistics.median(samples), 4),
+        "minSeconds": round(min(samples), 4),
+        "maxSeconds": round(max(samples), 4),
+        "topImports": top_imports(args.module, args.top),
+    }
+
+    print(f"import {args.module}: median {summary['medianSeconds']}s "
+          f"(min {summary['minSeconds']}s, max {summary['maxSeconds']}s, {args.runs} runs)")
+    for entry in summary["topImports"]:
+        print(f"  {entry['seconds']:>8.4f}s  {entry['module']}")
+
+    if args.record:
+        with open(args.record, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+
+    if args.max_seconds is not None and summary["medianSeconds"] > args.max_seconds:
+        print(f"FAIL: median cold start {summary['medianSeconds']}s exceeds {args.max_seconds}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
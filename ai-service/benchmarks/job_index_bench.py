@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Job index benchmark - build, persist, memory-mapped reload and top-N query
+latency over synthetic job profiles generated from the skill vocabulary.
+
+Usage:
+    python benchmarks/job_index_bench.py                   # 20k jobs
+    python benchmarks/job_index_bench.py --jobs 50000 --queries 500
+    python benchmarks/job_index_bench.py --max-query-ms 10 # non-zero exit if slower
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from services.job_index import JobIndex, DEFAULT_DIM  # noqa: E402
+from services.skill_normalizer import SKILL_ALIASES  # noqa: E402
+
+TITLES = ["Software Engineer", "Data Analyst", "Frontend Developer", "ML Engineer", "Backend Developer",
+          "DevOps Engineer", "Full Stack Developer", "Business Analyst", "QA Engineer", "Data Scientist"]
+FILLER = ("build scalable services collaborate with product teams own features end to end write clean tested "
+          "code participate in design reviews mentor interns improve reliability and performance").split()
+
+
+def synthetic_jd(rng: random.Random) -> tuple:
+    skills = rng.sample(list(SKILL_ALIASES), 8)
+    body = " ".join(rng.choice(FILLER) for _ in range(120))
+    text = f"Requirements: experience with {', '.join(skills[:5])}.\nNice to have: {', '.join(skills[5:])}.\n{body}"
+    return rng.choice(TITLES), text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job index build/query benchmark")
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    parser.add_argument("--max-query-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = JobIndex(tmp, dim=args.dim)
+        index.load()
+        started = time.perf_counter()
+        for i in range(args.jobs):
+            title, text = synthetic_jd(rng)
+            index.upsert(f"job-{i}", title, text, company=f"Company {i % 500}", owner=f"user-{i % 100}")
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.save()
+        save_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        reloaded = JobIndex(tmp, dim=args.dim)
+        reloaded.load()
+        load_s = time.perf_counter() - started
+
+        resumes = [synthetic_jd(rng)[1] for _ in range(args.queries)]
+        reloaded.query(resumes[0])
+        timings = {"all": [], "owner": []}
+        for resume in resumes:
+            t = time.perf_counter()
+            reloaded.query(resume, top_n=10)
+            timings["all"].append((time.perf_counter() - t) * 1000)
+            t = time.perf_counter()
+            reloaded.query(resume, top_n=10, owner="user-3")
+            timings["owner"].append((time.perf_counter() - t) * 1000)
+
+        size_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1e6
+
+    print(f"jobs={args.jobs} dim={args.dim} on-disk={size_mb:.1f}MB")
+    print(f"build: {build_s:.2f}s ({build_s / args.jobs * 1e6:.0f} us/job)  save: {save_s:.2f}s  mmap load: {load_s * 1000:.1f}ms")
+    for label, values in timings.items():
+        values.sort()
+        print(f"query[{label}]: median {statistics.median(values):.2f}ms  p95 {values[int(len(values) * 0.95) - 1]:.2f}ms")
+
+    if args.max_query_ms is not None and statistics.median(timings["all"]) > args.max_query_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
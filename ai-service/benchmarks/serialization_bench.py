@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark - CPU time and bytes on the wire for the largest
+responses (12-month roadmap, 30-day interview prep plan), comparing the
+previous default FastAPI path (response_model validation + jsonable_encoder
++ stdlib json) with FastJSONResponse returned directly plus compression.
+
+Usage:
+    python benchmarks/serialization_bench.py
+    python benchmarks/serialization_bench.py --iterations 500 --json
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import RoadmapResponse, InterviewPrepResponse  # noqa: E402
+from services.http_responses import FastJSONResponse, CompressionMiddleware, fast_response, brotli  # noqa: E402
+from services.roadmap_library import roadmap_from_library  # noqa: E402
+
+# The test client logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+# --------------------------------------------------
+# Payloads
+# --------------------------------------------------
+def roadmap_payload() -> dict:
+    # 12 months is served by the LLM; a payload of the same size is the
+    # 6-month library roadmap twice over
+    half = roadmap_from_library("Software Engineer", 6, [])["weeks"]
+    return {"weeks": [dict(week, weekNumber=n) for n, week in enumerate(half + half, start=1)]}
+
+
+def prep_plan_payload(days: int = 30) -> dict:
+    return {
+        "preparationPlan": {
+            "totalDays": days,
+            "interviewDate": "2026-12-01",
+            "overallStrategy": "Alternate DSA and system design with a mock interview every fifth day. " * 3,
+            "dailyPlan": [
+                {
+                    "day": d + 1,
+                    "date": f"2026-11-{(d % 30) + 1:02d}",
+                    "focusRound": ["Online Assessment", "Technical Round 1", "System Design", "HR"][d % 4],
+                    "focusArea": f"Day {d + 1}: graphs, dynamic programming and behavioral stories",
+                    "topics": [f"Topic {d}-{t}: sliding window, heaps and BFS on grids" for t in range(4)],
+                    "tasks": [
+                        {"task": f"Solve {5 + t} medium problems on the day's topics and review editorials",
+                         "timeAllocation": f"{t + 1} hours", "priority": ["high", "medium", "low"][t % 3]}
+                        for t in range(4)
+                    ],
+                    "resources": ["NeetCode 150", "System Design Primer", "Company interview experiences"],
+                    "goals": ["Finish the problem set without hints", "Write down two STAR stories"],
+                    "tips": "Explain your approach aloud before coding and state complexity at the end."
+                }
+                for d in range(days)
+            ],
+            "finalDayChecklist": ["Revise notes", "Test your setup", "Sleep early"],
+            "confidenceTips": ["Think aloud", "Ask clarifying questions"],
+            "companyResearch": {"keyAreas": ["Products", "Engineering blog"], "questionsToAsk": ["Team structure?"]},
+        }
+    }
+
+
+# --------------------------------------------------
+# Apps under test
+# --------------------------------------------------
+def build_before(payloads: dict) -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/roadmap", response_model=RoadmapResponse)
+    async def roadmap():
+        return payloads["roadmap"]
+
+    @app.get("/prep-plan", response_model=InterviewPrepResponse)
+    async def prep_plan():
+        return payloads["prep-plan"]
+
+    return app
+
+
+def build_after(payloads: dict) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/roadmap", response_model=RoadmapResponse)
+    async def roadmap():
+        return fast_response(payloads["roadmap"])
+
+    @app.get("/prep-plan", response_model=InterviewPrepResponse)
+    async def prep_plan():
+        return fast_response(payloads["prep-plan"])
+
+    return app
+
+
+def encode_cpu(model, payload: dict, iterations: int) -> dict:
+    """
+    Encoding cost alone: what FastAPI did per response before (validate,
+    dump, jsonable_encoder, stdlib json) vs. FastJSONResponse.render
+    """
+    def before():
+        value = model.model_validate(payload).model_dump(mode="json")
+        return JSONResponse(content=None).render(jsonable_encoder(value))
+
+    def after():
+        return FastJSONResponse(content=None).render(payload)
+
+    result = {}
+    for label, func in (("before", before), ("after", after)):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        result[label + "Us"] = round((time.perf_counter() - started) / iterations * 1e6, 1)
+    result["speedup"] = round(result["beforeUs"] / result["afterUs"], 1)
+    return result
+
+
+def measure(client: TestClient, path: str, headers: dict, iterations: int) -> dict:
+    client.get(path, headers=headers)
+    timings = []
+    wire_bytes = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        timings.append(time.perf_counter() - started)
+        # Content-Length is the size as sent, before the test client decodes it
+        wire_bytes = int(response.headers["content-length"])
+    return {
+        "medianMs": round(statistics.median(timings) * 1000, 3),
+        "p95Ms": round(sorted(timings)[int(len(timings) * 0.95) - 1] * 1000, 3),
+        "bytes": wire_bytes,
+        "encoding": response.headers.get("content-encoding", "identity"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON serialization and compression benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    payloads = {"roadmap": roadmap_payload(), "prep-plan": prep_plan_payload()}
+    before = TestClient(build_before(payloads))
+    after = TestClient(build_after(payloads))
+
+    encodings = {"identity": "identity", "gzip": "gzip"}
+    if brotli is not None:
+        encodings["br"] = "br, gzip"
+
+    models = {"/roadmap": RoadmapResponse, "/prep-plan": InterviewPrepResponse}
+    encoding = {path: encode_cpu(models[path], payloads[path[1:]], args.iterations) for path in models}
+
+    results = {}
+    for path in ("/roadmap", "/prep-plan"):
+        results[path] = {"before": measure(before, path, {"Accept-Encoding": "identity"}, args.iterations)}
+        for label, header in encodings.items():
+            results[path][f"after:{label}"] = measure(after, path, {"Accept-Encoding": header}, args.iterations)
+
+    if args.json:
+        import json
+        print(json.dumps({"encoding": encoding, "endToEnd": results}, indent=2))
+        return
+
+    for path, rows in results.items():
+        cpu = encoding[path]
+        print(f"\n{path}")
+        print(f"  encode CPU: {cpu['beforeUs']} us before, {cpu['afterUs']} us after ({cpu['speedup']}x)")
+        print(f"  {'variant':<16}{'median ms':>11}{'p95 ms':>10}{'bytes':>10}")
+        for variant, row in rows.items():
+            print(f"  {variant:<16}{row['medianMs']:>11}{row['p95Ms']:>10}{row['bytes']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Input compression benchmark - throughput of the cleanup and salience trim
+stages on large synthetic PDF-extracted resumes/JDs, and tokens saved.
+
+Usage:
+    python benchmarks/text_compression_bench.py
+    python benchmarks/text_compression_bench.py --pages 20 --runs 50
+    python benchmarks/text_compression_bench.py --min-mb-s 5   # non-zero exit if slower
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from services.text_compression import clean_text, compress_text, TOKEN_BUDGETS  # noqa: E402
+from services.token_usage import count_tokens  # noqa: E402
+from services.skill_normalizer import SKILL_ALIASES  # noqa: E402
+
+FILLER = ("designed implemented maintained collaborated improved reduced latency across teams using modern "
+          "practices delivered features on schedule documented wrote tests reviewed code").split()
+SECTIONS = ["OBJECTIVE", "SKILLS", "PROJECTS", "EXPERIENCE", "EDUCATION", "CERTIFICATIONS", "HOBBIES", "DECLARATION"]
+
+
+def synthetic_resume(rng: random.Random, pages: int) -> str:
+    """
+    Resume text the way pdf-parse returns it: running header and page
+    numbers at every page break, hyphenated breaks, bullet glyphs, ragged
+    spacing and repeated lines
+    """
+    skills = list(SKILL_ALIASES)
+    header = "Jane Doe  |  jane.doe@example.com  |  +91 98765 43210"
+    lines_per_page = 45
+    total = pages * lines_per_page
+    lines = [header]
+    page = 1
+    for i, section in enumerate(SECTIONS):
+        lines.append(section)
+        while len(lines) < total * (i + 1) // len(SECTIONS):
+            words = [rng.choice(FILLER) for _ in range(rng.randint(10, 22))]
+            words.insert(rng.randint(0, len(words)), rng.choice(skills))
+            line = "\u2022   " + " ".join(words)
+            if rng.random() < 0.3:
+                cut = rng.randint(5, len(line) - 5)
+                if line[cut - 1].isalpha() and line[cut].isalpha():
+                    line = line[:cut] + "-\n" + line[cut:]
+            lines.append(line)
+            if rng.random() < 0.1:
+                lines.append(line)
+            if len(lines) >= page * lines_per_page:
+                lines.extend([f"Page {page} of {pages}", header])
+                page += 1
+    lines.append(f"Page {page} of {pages}")
+    return "\n".join(lines)
+
+
+def measure(fn, text: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Input compression throughput benchmark")
+    parser.add_argument("--pages", type=int, default=8, help="pages of synthetic resume text")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--min-mb-s", type=float, default=0.0, help="fail if full compression is slower")
+    args = parser.parse_args()
+
+    text = synthetic_resume(random.Random(args.seed), args.pages)
+    megabytes = len(text.encode("utf-8")) / 1e6
+    original = count_tokens(text)
+    cleaned = clean_text(text)
+    compressed = compress_text(text, "resume")
+
+    print(f"input: {len(text):,} chars, {original:,} tokens (budget {TOKEN_BUDGETS['resume']})")
+    print(f"{'stage':<22}{'median ms':>10}{'MB/s':>8}{'tokens':>9}{'saved':>8}")
+    for stage, fn, output in (
+        ("clean", clean_text, cleaned),
+        ("clean + trim", lambda t: compress_text(t, "resume"), compressed),
+    ):
+        seconds = measure(fn, text, args.runs)
+        tokens = count_tokens(output)
+        print(f"{stage:<22}{seconds * 1000:>10.2f}{megabytes / seconds:>8.2f}{tokens:>9,}{1 - tokens / original:>8.0%}")
+
+    if args.min_mb_s:
+        throughput = megabytes / measure(lambda t: compress_text(t, "resume"), text, args.runs)
+        if throughput < args.min_mb_s:
+            print(f"FAIL: {throughput:.2f} MB/s < {args.min_mb_s} MB/s")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Offline builder for data/roadmap_library.json - generates a plan per
+(role, timeframe) with the roadmap LLM and stores it in the library's
+compact [focus, topics, tasks, skills] form, so request-time generation
+only personalizes and never calls the model for these roles.
+
+Usage:
+    python scripts/build_roadmap_library.py                      # all roles, 1-12 months
+    python scripts/build_roadmap_library.py --roles sde frontend --months 3 6
+    python scripts/build_roadmap_library.py --dry-run            # print, do not write
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(os.path.join(SERVICE_DIR, ".env"))
+
+from services import roadmap_library  # noqa: E402
+from services.roadmap_generator import get_llm, parse_json_response  # noqa: E402
+from services.prompt_store import get_prompt  # noqa: E402
+from services.skill_normalizer import extract_skills  # noqa: E402
+
+
+def generate_plan(title: str, months: int) -> list:
+    """
+    Generic (no current skills) plan for a role, in compact library form
+    """
+    formatted_prompt = get_prompt("roadmap_prompt.txt").format(
+        target_role=title,
+        timeframe_months=months,
+        current_skills="No specific skills mentioned",
+        num_weeks=months * 4
+    )
+    response = get_llm().invoke(formatted_prompt)
+    weeks = parse_json_response(response.content).get("weeks", [])
+
+    units = []
+    for week in weeks:
+        focus = str(week.get("focus", "")).strip()
+        topics = [str(t) for t in week.get("topics", [])]
+        tasks = [str(t) for t in week.get("tasks", [])]
+        # Skill tags drive personalization: a week is dropped when the
+        # candidate already has every skill it teaches
+        skills = extract_skills(" ".join([focus] + topics))
+        units.append([focus, topics, tasks, skills])
+    return units
+
+
+async def build(path: str, roles: list, months: list, dry_run: bool) -> int:
+    library = roadmap_library.load_library(path)
+    failures = 0
+    for role_id in roles:
+        role = library["roles"].get(role_id)
+        if role is None:
+            print(f"unknown role '{role_id}', skipping", file=sys.stderr)
+            failures += 1
+            continue
+        plans = role.setdefault("plans", {})
+        for m in months:
+            try:
+                units = await asyncio.to_thread(generate_plan, role.get("title", role_id), m)
+            except Exception as e:
+                print(f"{role_id} {m}mo: failed ({e})", file=sys.stderr)
+                failures += 1
+                continue
+            plans[str(m)] = units
+            print(f"{role_id} {m}mo: {len(units)} weeks")
+
+    if dry_run:
+        print(json.dumps(library, indent=2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(library, f, indent=2)
+            f.write("\n")
+        print(f"wrote {path}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--library", default=roadmap_library.LIBRARY_PATH)
+    parser.add_argument("--roles", nargs="*", help="role ids (default: every role in the library)")
+    parser.add_argument("--months", nargs="*", type=int,
+                        default=list(range(roadmap_library.MIN_MONTHS, roadmap_library.MAX_MONTHS + 1)))
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    roles = args.roles or list(roadmap_library.load_library(args.library)["roles"])
+    failures = asyncio.run(build(args.library, roles, args.months, args.dry_run))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Re-drive captured /ai/* traffic against a running build and compare
+latency and throughput with what was recorded.
+
+Capture on the source deployment:
+    TRAFFIC_CAPTURE_PATH=data/traffic.jsonl uvicorn app:app
+
+Start the build under test with the recorded LLM responses (no API keys,
+no provider variance; LLM_REPLAY_LATENCY_SCALE=0 isolates service overhead):
+    LLM_REPLAY_PATH=data/traffic.jsonl uvicorn app:app --port 8001
+
+Replay at 10x the recorded arrival rate:
+    python scripts/replay_traffic.py data/traffic.jsonl --target http://localhost:8001 --speed 10
+    python scripts/replay_traffic.py data/traffic.jsonl --paths '^/ai/chat' --limit 500 --json report.json
+"""
+
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+import aiohttp
+
+MIN_SPEED = 1.0
+MAX_SPEED = 50.0
+
+
+def load_requests(path: str, paths: str = None, limit: int = None) -> list:
+    """
+    Request records in arrival order. Offsets restart with every capture
+    session in the file, so later sessions are shifted to follow earlier ones.
+    """
+    pattern = re.compile(paths) if paths else None
+    requests = []
+    base = 0.0
+    session_end = 0.0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") == "capture":
+                base = session_end + 1.0 if requests else 0.0
+                continue
+            if record.get("type") != "request":
+                continue
+            record["at"] += base
+            session_end = max(session_end, record["at"])
+            if pattern and not pattern.search(record["path"]):
+                continue
+            requests.append(record)
+    requests.sort(key=lambda r: r["at"])
+    return requests[:limit] if limit else requests
+
+
+def percentile(values: list, p: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def send(session: aiohttp.ClientSession, target: str, record: dict, timeout: float) -> dict:
+    url = target.rstrip("/") + record["path"] + (f"?{record['query']}" if record["query"] else "")
+    headers = {"X-Replay-Id": record["id"]}
+    if record.get("user"):
+        headers["X-User-Id"] = record["user"]
+    started = time.perf_counter()
+    try:
+        async with session.request(
+            record["method"], url, json=record["body"], headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            await response.read()
+            status = response.status
+    except asyncio.TimeoutError:
+        status = "timeout"
+    except aiohttp.ClientError as e:
+        status = f"error:{type(e).__name__}"
+    return {"status": status, "ms": (time.perf_counter() - started) * 1000}
+
+
+async def replay(requests: list, target: str, speed: float, timeout: float, connections: int) -> dict:
+    connector = aiohttp.TCPConnector(limit=connections)
+    results = [None] * len(requests)
+    lateness = []
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        origin = requests[0]["at"]
+        started = time.perf_counter()
+
+        async def fire(i, record):
+            due = (record["at"] - origin) / speed
+            delay = due - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # How far behind schedule the client itself fell
+            lateness.append(max(0.0, (time.perf_counter() - started) - due) * 1000)
+            results[i] = await send(session, target, record, timeout)
+
+        await asyncio.gather(*(fire(i, r) for i, r in enumerate(requests)))
+        wall = time.perf_counter() - started
+
+    return {"results": results, "wall": wall, "lateness": lateness}
+
+
+def report(requests: list, outcome: dict, speed: float) -> dict:
+    by_path = {}
+    for record, result in zip(requests, outcome["results"]):
+        path = re.sub(r"/[0-9a-f]{16,}$|/anon-[0-9a-f]+$", "/{id}", record["path"])
+        entry = by_path.setdefault(f"{record['method']} {path}", {"recorded": [], "replayed": [], "mismatch": 0, "errors": 0})
+        entry["recorded"].append(record["ms"])
+        if isinstance(result["status"], int) and result["status"] < 500:
+            entry["replayed"].append(result["ms"])
+        else:
+            entry["errors"] += 1
+        if result["status"] != record["status"]:
+            entry["mismatch"] += 1
+
+    recorded_span = (requests[-1]["at"] - requests[0]["at"]) or 1e-9
+    summary = {
+        "requests": len(requests),
+        "speed": speed,
+        "recordedRps": round(len(requests) / recorded_span, 3),
+        "targetRps": round(len(requests) / recorded_span * speed, 3),
+        "achievedRps": round(len(requests) / outcome["wall"], 3),
+        "clientLatenessP99Ms": round(percentile(outcome["lateness"], 0.99) or 0.0, 1),
+        "endpoints": {},
+    }
+    for name, entry in sorted(by_path.items()):
+        row = {"count": len(entry["recorded"]), "statusMismatch": entry["mismatch"], "errors": entry["errors"]}
+        for label, values in (("recorded", entry["recorded"]), ("replayed", entry["replayed"])):
+            row[label] = {
+                "p50Ms": round(percentile(values, 0.5), 1) if values else None,
+                "p95Ms": round(percentile(values, 0.95), 1) if values else None,
+                "meanMs": round(statistics.mean(values), 1) if values else None,
+            }
+        if entry["replayed"]:
+            row["p50Delta"] = round(row["replayed"]["p50Ms"] / max(row["recorded"]["p50Ms"], 1e-9) - 1, 3)
+        summary["endpoints"][name] = row
+    return summary
+
+
+def print_report(summary: dict):
+    print(f"{summary['requests']} requests at {summary['speed']:g}x: recorded {summary['recordedRps']} rps, "
+          f"target {summary['targetRps']} rps, achieved {summary['achievedRps']} rps "
+          f"(client lateness p99 {summary['clientLatenessP99Ms']} ms)")
+    print(f"{'endpoint':<40}{'n':>6}{'rec p50':>10}{'new p50':>10}{'rec p95':>10}{'new p95':>10}{'p50 Δ':>8}"
+          f"{'status≠':>9}{'errors':>8}")
+    for name, row in summary["endpoints"].items():
+        delta = f"{row['p50Delta']:+.0%}" if "p50Delta" in row else "-"
+
+        def ms(value):
+            return f"{value:.0f}" if value is not None else "-"
+
+        print(f"{name:<40}{row['count']:>6}{ms(row['recorded']['p50Ms']):>10}{ms(row['replayed']['p50Ms']):>10}"
+              f"{ms(row['recorded']['p95Ms']):>10}{ms(row['replayed']['p95Ms']):>10}{delta:>8}"
+              f"{row['statusMismatch']:>9}{row['errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured AI service traffic")
+    parser.add_argument("capture", help="JSONL file written with TRAFFIC_CAPTURE_PATH")
+    parser.add_argument("--target", default="http://localhost:8000")
+    parser.add_argument("--speed", type=float, default=1.0, help=f"{MIN_SPEED:g}-{MAX_SPEED:g}x the recorded arrival rate")
+    parser.add_argument("--paths", help="regex; only replay matching paths")
+    parser.add_argument("--limit", type=int, help="replay only the first N requests")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--connections", type=int, default=256, help="client connection pool size")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    if not MIN_SPEED <= args.speed <= MAX_SPEED:
+        parser.error(f"--speed must be between {MIN_SPEED:g} and {MAX_SPEED:g}")
+    requests = load_requests(args.capture, args.paths, args.limit)
+    if not requests:
+        print("No captured requests to replay")
+        sys.exit(1)
+
+    outcome = asyncio.run(replay(requests, args.target, args.speed, args.timeout, args.connections))
+    summary = report(requests, outcome, args.speed)
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
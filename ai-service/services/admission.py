@@ -0,0 +1,220 @@
+"""
+Admission Service - Inbound concurrency limits and load shedding per endpoint
+Every /ai/* endpoint gets an adaptive concurrency limit (AIMD on observed
+latency) and a short bounded queue, sized by its class, so a surge of heavy
+generations is shed with a fast 503 + Retry-After instead of dragging chat
+latency up with it
+"""
+
+import os
+import re
+import math
+import time
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+
+# class -> initial limit, min, max, queue cap, target latency (ms)
+CLASS_DEFAULTS = {
+    "light": {"limit": 32, "min": 8, "max": 128, "queue": 64, "target_ms": 5000},
+    "standard": {"limit": 8, "min": 2, "max": 32, "queue": 16, "target_ms": 15000},
+    "heavy": {"limit": 3, "min": 1, "max": 12, "queue": 6, "target_ms": 45000},
+}
+QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 10))
+
+# Multiplicative decrease factor and the minimum gap between decreases, so
+# one burst of slow completions counts as a single congestion signal
+BACKOFF_RATIO = 0.8
+BACKOFF_COOLDOWN = 1.0
+
+
+def class_settings(name: str) -> dict:
+    """
+    Defaults for an endpoint class, overridable with ADMISSION_<CLASS>_<KEY>
+    (e.g. ADMISSION_HEAVY_LIMIT=2, ADMISSION_LIGHT_TARGET_MS=3000)
+    """
+    settings = dict(CLASS_DEFAULTS[name])
+    for key in settings:
+        value = os.getenv(f"ADMISSION_{name.upper()}_{key.upper()}")
+        if value:
+            settings[key] = float(value) if key == "target_ms" else int(value)
+    return settings
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+# --------------------------------------------------
+# Adaptive limiter (one per endpoint)
+# --------------------------------------------------
+class AdaptiveLimiter:
+    def __init__(self, name: str, klass: str, limit: int, min: int, max: int, queue: int, target_ms: float):
+        self.name = name
+        self.klass = klass
+        self.limit = float(limit)
+        self.min_limit = min
+        self.max_limit = max
+        self.max_queue = queue
+        self.target = target_ms / 1000
+        self.inflight = 0
+        self._waiters = deque()
+        self._last_backoff = 0.0
+        self.avg_latency = None
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+
+    def _retry_after(self) -> int:
+        # Time for the current queue to drain at the current limit
+        latency = self.avg_latency if self.avg_latency is not None else self.target / 2
+        backlog = len(self._waiters) + 1
+        return max(1, min(60, math.ceil(latency * backlog / max(self.limit, 1))))
+
+    async def acquire(self):
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            raise Overloaded(self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            # A slot may have been handed over just as the timeout fired
+            if not (waiter.done() and not waiter.cancelled()):
+                self.shed += 1
+                raise Overloaded(self._retry_after())
+        except asyncio.CancelledError:
+            # Cancelled (client gone) after a slot was handed over: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.inflight -= 1
+                self._wake()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        # The releasing request handed its slot over (inflight already counted)
+        self.admitted += 1
+
+    def release(self, latency: float, congested: bool):
+        self.inflight -= 1
+        self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+
+        now = time.monotonic()
+        if congested or latency > self.target:
+            if now - self._last_backoff >= BACKOFF_COOLDOWN:
+                self.limit = max(self.min_limit, self.limit * BACKOFF_RATIO)
+                self._last_backoff = now
+        elif self.inflight + 1 >= int(self.limit):
+            # Additive increase only when the limit was actually the constraint
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "class": self.klass,
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queued": len(self._waiters),
+            "maxQueue": self.max_queue,
+            "avgLatencyMs": round(self.avg_latency * 1000, 1) if self.avg_latency is not None else None,
+            "targetMs": round(self.target * 1000, 1),
+            "admitted": self.admitted,
+            "queuedTotal": self.queued,
+            "shed": self.shed,
+        }
+
+
+# --------------------------------------------------
+# Controller + ASGI middleware
+# --------------------------------------------------
+class AdmissionController:
+    def __init__(self):
+        self._routes = []
+        self._limiters = {}
+
+    def route(self, pattern: str, klass: str, methods=("POST",)):
+        """
+        Put requests matching `pattern` under their own limiter of `klass`
+        """
+        settings = class_settings(klass)
+        self._routes.append((re.compile(pattern), {m.upper() for m in methods}, pattern))
+        self._limiters[pattern] = AdaptiveLimiter(pattern, klass, **settings)
+
+    def limiter_for(self, method: str, path: str):
+        for regex, methods, pattern in self._routes:
+            if method in methods and regex.match(path):
+                return self._limiters[pattern]
+        return None
+
+    def stats(self) -> dict:
+        return {"enabled": ADMISSION_ENABLED, "endpoints": {k: v.stats() for k, v in self._limiters.items()}}
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        limiter = None
+        if ADMISSION_ENABLED and scope["type"] == "http":
+            limiter = self.controller.limiter_for(scope["method"], scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except Overloaded as e:
+            logger.warning(f"Shedding {scope['method']} {scope['path']} ({limiter.klass}), retry after {e.retry_after}s")
+            await _send_overloaded(send, e.retry_after)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 5xx (provider errors, timeouts) count as congestion just like
+            # slow responses; a 429 budget refusal says nothing about load
+            limiter.release(time.monotonic() - started, congested=status["code"] >= 500)
+
+
+async def _send_overloaded(send, retry_after: int):
+    body = b'{"detail":"Service is overloaded, please retry shortly"}'
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
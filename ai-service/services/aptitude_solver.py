@@ -0,0 +1,540 @@
+"""
+Aptitude Solver Service - Local exact solver for common quantitative templates
+Recognizes plain calculations and standard aptitude word problems, computes
+the answer with exact fractions and returns the working. Plain calculations
+skip the LLM entirely; word problems pass the result to it as a hint. Anything
+outside a template's single-formula shape returns None rather than a guess.
+"""
+
+import re
+import ast
+import math
+import operator
+from fractions import Fraction
+
+NUMBER = r"(\d+(?:,\d{3})*(?:\.\d+)?)"
+MAX_EXPONENT = 64
+MAX_FACTORIAL = 1000
+# Limits for the expression evaluator: results above MAX_BITS (numerator or
+# denominator) are refused before they are computed
+MAX_BITS = 4096
+MAX_DEPTH = 64
+
+# Phrases that ask for reasoning rather than a number: let the LLM answer
+EXPLAIN_WORDS = ("explain", "why", "how do", "how to", "shortcut", "trick", "concept", "teach")
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def _num(text: str) -> Fraction:
+    return Fraction(text.replace(",", ""))
+
+
+def format_number(value: Fraction) -> str:
+    """
+    Exact rendering: integers as-is, other fractions as p/q with a decimal
+    """
+    if value.denominator == 1:
+        return str(value.numerator)
+    decimal = float(value)
+    if (value * 100).denominator == 1:
+        return f"{decimal:g}"
+    return f"{value.numerator}/{value.denominator} (≈ {decimal:.4f})"
+
+
+def _fraction(value: Fraction) -> str:
+    return str(value.numerator) if value.denominator == 1 else f"{value.numerator}/{value.denominator}"
+
+
+def _result(kind: str, answer: str, steps: list, plain: bool) -> dict:
+    return {"kind": kind, "answer": answer, "steps": steps, "plain": plain}
+
+
+# --------------------------------------------------
+# Safe arithmetic evaluation
+# --------------------------------------------------
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.FloorDiv: operator.floordiv,
+}
+
+
+def _bits(value: Fraction) -> int:
+    return max(value.numerator.bit_length(), value.denominator.bit_length())
+
+
+def _eval_node(node, depth: int = 0) -> Fraction:
+    if depth > MAX_DEPTH:
+        raise ValueError("Expression too deeply nested")
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body, depth + 1)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        value = Fraction(str(node.value))
+        if _bits(value) > MAX_BITS:
+            raise ValueError("Number too large")
+        return value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        value = _eval_node(node.operand, depth + 1)
+        return value if isinstance(node.op, ast.UAdd) else -value
+    if isinstance(node, ast.BinOp):
+        left = _eval_node(node.left, depth + 1)
+        right = _eval_node(node.right, depth + 1)
+        # Size the result before computing it: the product of two fractions
+        # (and the common denominator of a sum) has at most the sum of their bits
+        if isinstance(node.op, ast.Pow):
+            if right.denominator != 1 or abs(right) > MAX_EXPONENT:
+                raise ValueError("Unsupported exponent")
+            if _bits(left) * abs(int(right)) > MAX_BITS:
+                raise ValueError("Result too large")
+            return left ** int(right)
+        op = _BIN_OPS.get(type(node.op))
+        if op is None:
+            raise ValueError("Unsupported operator")
+        if _bits(left) + _bits(right) > MAX_BITS:
+            raise ValueError("Result too large")
+        return op(left, right)
+    raise ValueError("Unsupported expression")
+
+
+def evaluate_expression(expression: str) -> Fraction:
+    """
+    Evaluate + - * / % ** and parentheses exactly, without eval()
+    """
+    return _eval_node(ast.parse(expression, mode="eval"))
+
+
+_EXPR_PREFIX = re.compile(
+    r"^(?:please\s+)?(?:what\s+is|what's|calculate|compute|evaluate|find|solve|simplify)?\s*(?:the\s+value\s+of\s+)?",
+    re.IGNORECASE
+)
+
+
+def _normalize_expression(text: str) -> str:
+    expr = _EXPR_PREFIX.sub("", text.strip()).strip().rstrip("?=. ")
+    expr = expr.replace("×", "*").replace("÷", "/").replace("^", "**").replace("−", "-")
+    expr = re.sub(r"(?<=\d)\s*[xX]\s*(?=[\d(])", "*", expr)
+    expr = re.sub(r"\s+of\s+", "*", expr, flags=re.IGNORECASE)
+    expr = re.sub(r"(?<=\d),(?=\d{3})", "", expr)
+    return expr
+
+
+# Left over next to a template match, these mean the question has another step
+_EXTRA_STEP = re.compile(
+    r"[\d+*/%^×÷!=]|\b(?:and|then|plus|minus|add|added|subtract|more|less|times|twice|double|half|"
+    r"square|cube|root|each|per|after|if)\b"
+)
+
+
+def _plainness(text: str, match):
+    """
+    True when `match` is the whole question (apart from a "what is" style
+    prefix), False when only neutral words are left over (the answer is then
+    a hint for the LLM), None when numbers, operators or another step are
+    left over and the template answer would be wrong
+    """
+    rest = (text[:match.start()] + " " + text[match.end():]).strip()
+    rest = _EXPR_PREFIX.sub("", rest).strip(" ?.!,:;")
+    if not rest:
+        return True
+    if _EXTRA_STEP.search(rest.lower()):
+        return None
+    return False
+
+
+def solve_arithmetic(message: str):
+    expr = _normalize_expression(message)
+    if not expr or not re.fullmatch(r"[\d\s.+\-*/%()]+", expr) or not re.search(r"\d\s*[-+*/%]", expr):
+        return None
+    # "%" directly after a number means percent, not modulo
+    expr = re.sub(r"(\d+(?:\.\d+)?)\s*%(?!\s*\d)", r"(\1/100)", expr)
+    try:
+        value = evaluate_expression(expr)
+    except (ValueError, SyntaxError, ZeroDivisionError, TypeError):
+        return None
+    answer = format_number(value)
+    return _result("arithmetic", answer, [f"{expr.replace('**', '^')} = {answer}"], True)
+
+
+# --------------------------------------------------
+# Percentages
+# --------------------------------------------------
+def solve_percentage(message: str):
+    text = message.lower()
+
+    match = re.search(rf"{NUMBER}\s*%\s*of\s*(?:rs\.?|₹|\$)?\s*{NUMBER}", text)
+    if match and not re.search(r"interest|profit|loss|increase|decrease", text):
+        plain = _plainness(text, match)
+        if plain is None:
+            # "15% of 40% of 200", "20% of 500 and then add 10"
+            return None
+        rate, base = _num(match.group(1)), _num(match.group(2))
+        value = rate / 100 * base
+        answer = format_number(value)
+        return _result("percentage", answer, [f"{format_number(rate)}% of {format_number(base)} = {format_number(rate)}/100 × {format_number(base)} = {answer}"], plain)
+
+    match = re.search(rf"{NUMBER}\s+is\s+what\s+(?:percent|percentage|%)\s+of\s+{NUMBER}", text) or \
+        re.search(rf"what\s+(?:percent|percentage|%)\s+of\s+{NUMBER}\s+is\s+{NUMBER}", text)
+    if match:
+        plain = _plainness(text, match)
+        if plain is None:
+            return None
+        if text.find("is what") != -1:
+            part, whole = _num(match.group(1)), _num(match.group(2))
+        else:
+            whole, part = _num(match.group(1)), _num(match.group(2))
+        if whole == 0:
+            return None
+        value = part / whole * 100
+        answer = f"{format_number(value)}%"
+        return _result("percentage", answer, [f"{format_number(part)} / {format_number(whole)} × 100 = {answer}"], plain)
+
+    match = re.search(rf"(increase|decrease)\s+(?:rs\.?|₹|\$)?\s*{NUMBER}\s+by\s+{NUMBER}\s*%", text)
+    if match:
+        direction, original, rate = match.group(1), _num(match.group(2)), _num(match.group(3))
+    else:
+        match = re.search(rf"{NUMBER}\s+(?:is\s+)?(increased|decreased)\s+by\s+{NUMBER}\s*%", text)
+        if match:
+            original, direction, rate = _num(match.group(1)), match.group(2), _num(match.group(3))
+    if match:
+        plain = _plainness(text, match)
+        if plain is None:
+            return None
+        sign = 1 if direction.startswith("increase") else -1
+        value = original * (1 + sign * rate / 100)
+        answer = format_number(value)
+        word = "+" if sign > 0 else "-"
+        return _result("percentage", answer, [f"{format_number(original)} × (1 {word} {format_number(rate)}/100) = {answer}"], plain)
+    return None
+
+
+# --------------------------------------------------
+# Interest
+# --------------------------------------------------
+_PRINCIPAL = re.compile(rf"(?:rs\.?|₹|\$|inr|principal(?:\s+of)?|sum(?:\s+of)?|amount(?:\s+of)?)\s*{NUMBER}", re.IGNORECASE)
+_RATE = re.compile(rf"{NUMBER}\s*%(?:\s*(?:per\s+annum|p\.?\s*a\.?|per\s+year|annually))?", re.IGNORECASE)
+_YEARS = re.compile(rf"{NUMBER}\s*(years?|yrs?|months?)", re.IGNORECASE)
+
+
+def _interest_inputs(text: str):
+    principal = _PRINCIPAL.search(text)
+    rate = _RATE.search(text)
+    period = _YEARS.search(text)
+    if not (principal and rate and period):
+        return None
+    years = _num(period.group(1))
+    if period.group(2).lower().startswith("month"):
+        years = years / 12
+    return _num(principal.group(1)), _num(rate.group(1)), years
+
+
+def solve_interest(message: str):
+    text = message.lower()
+    if "interest" not in text:
+        return None
+    inputs = _interest_inputs(text)
+    if inputs is None:
+        return None
+    principal, rate, years = inputs
+    p, r, t = format_number(principal), format_number(rate), format_number(years)
+
+    if "compound" in text:
+        periods_per_year = 1
+        if "half" in text and "year" in text:
+            periods_per_year = 2
+        elif "quarter" in text:
+            periods_per_year = 4
+        elif "month" in text and "compounded" in text:
+            periods_per_year = 12
+        periods = years * periods_per_year
+        if periods.denominator != 1:
+            return None
+        amount = principal * (1 + rate / 100 / periods_per_year) ** int(periods)
+        interest = amount - principal
+        steps = [
+            f"A = P(1 + R/{100 * periods_per_year})^n = {p} × (1 + {r}/{100 * periods_per_year})^{int(periods)} = {format_number(amount)}",
+            f"CI = A − P = {format_number(amount)} − {p} = {format_number(interest)}",
+        ]
+        return _result("compound_interest", f"CI = {format_number(interest)}, Amount = {format_number(amount)}", steps, False)
+
+    interest = principal * rate * years / 100
+    steps = [
+        f"SI = P × R × T / 100 = {p} × {r} × {t} / 100 = {format_number(interest)}",
+        f"Amount = P + SI = {format_number(principal + interest)}",
+    ]
+    return _result("simple_interest", f"SI = {format_number(interest)}, Amount = {format_number(principal + interest)}", steps, False)
+
+
+# --------------------------------------------------
+# Time, speed and distance
+# --------------------------------------------------
+_SPEED = re.compile(rf"{NUMBER}\s*(km\s*/\s*h(?:r|our)?|kmph|km\s+per\s+hour|m\s*/\s*s|mps|m\s+per\s+second)", re.IGNORECASE)
+_DISTANCE = re.compile(rf"{NUMBER}\s*(km|kilometers?|kilometres?|m|meters?|metres?)\b(?!\s*/|\s*per|ph)", re.IGNORECASE)
+_DURATION = re.compile(rf"{NUMBER}\s*(hours?|hrs?|h\b|minutes?|mins?|seconds?|secs?)", re.IGNORECASE)
+
+
+def _to_kmph(value: Fraction, unit: str) -> Fraction:
+    return value * Fraction(18, 5) if unit.lower().startswith(("m/", "m ", "mps")) else value
+
+
+def _to_km(value: Fraction, unit: str) -> Fraction:
+    return value if unit.lower().startswith("k") else value / 1000
+
+
+def _to_hours(value: Fraction, unit: str) -> Fraction:
+    unit = unit.lower()
+    if unit.startswith("min"):
+        return value / 60
+    if unit.startswith("sec"):
+        return value / 3600
+    return value
+
+
+# Relative motion, extra lengths (platforms, bridges), streams, averages and
+# late/early arrivals need more than one formula: leave them to the LLM
+_SPEED_UNSUPPORTED = re.compile(
+    r"platform|bridge|tunnel|another\s+train|other\s+train|each\s+other|opposite|same\s+direction|overtake|"
+    r"relative|stream|current|upstream|downstream|boat|average|\breturn|\blate\b|\bearly\b|round\s+trip|\bmeet|"
+    r"ahead|behind|head\s+start|faster|slower"
+)
+# Objects of negligible length a train passes in (its own length / speed)
+_POINT_OBJECT = re.compile(r"\b(?:pole|post|pillar|tree|man|person|boy|signal|lamp\s*post|telegraph)\b")
+_CROSSING = re.compile(r"\bcross|\bpass")
+
+
+def solve_speed_distance(message: str):
+    text = message.lower()
+    if not re.search(r"speed|distance|km|travel|cover|journey|drive|train", text):
+        return None
+    if _SPEED_UNSUPPORTED.search(text):
+        return None
+    speeds = _SPEED.findall(text)
+    distances = _DISTANCE.findall(_SPEED.sub(" ", text))
+    durations = _DURATION.findall(text)
+    # One unknown from exactly one of each of the other two quantities
+    if len(speeds) > 1 or len(distances) > 1 or len(durations) > 1:
+        return None
+    speed = speeds[0] if speeds else None
+    distance = distances[0] if distances else None
+    duration = durations[0] if durations else None
+
+    if _CROSSING.search(text):
+        # "A 150 m train passes a pole at 36 km/h": only the train's own length counts
+        if "train" not in text or not _POINT_OBJECT.search(text) or not distance:
+            return None
+        if duration and not speed:
+            d, t = _to_km(_num(distance[0]), distance[1]), _to_hours(_num(duration[0]), duration[1])
+            if t == 0:
+                return None
+            answer = f"{format_number(d / t)} km/h"
+            steps = [
+                f"Speed = train length / time = {format_number(d * 1000)} m / {format_number(t * 3600)} s = {format_number(d * 1000 / (t * 3600))} m/s",
+                f"{format_number(d * 1000 / (t * 3600))} m/s × 18/5 = {answer}",
+            ]
+            return _result("speed_distance", answer, steps, False)
+        if not speed or duration:
+            return None
+        d, v = _to_km(_num(distance[0]), distance[1]), _to_kmph(_num(speed[0]), speed[1])
+        if v == 0:
+            return None
+        seconds = d / v * 3600
+        answer = f"{format_number(seconds)} seconds"
+        steps = [
+            f"Speed = {format_number(v)} km/h = {format_number(v)} × 5/18 = {format_number(v * Fraction(5, 18))} m/s",
+            f"Time = train length / speed = {format_number(d * 1000)} m / {format_number(v * Fraction(5, 18))} m/s = {answer}",
+        ]
+        return _result("speed_distance", answer, steps, False)
+
+    if speed and duration and not distance:
+        v, t = _to_kmph(_num(speed[0]), speed[1]), _to_hours(_num(duration[0]), duration[1])
+        answer = f"{format_number(v * t)} km"
+        return _result("speed_distance", answer, [f"Distance = Speed × Time = {format_number(v)} km/h × {format_number(t)} h = {answer}"], False)
+    if distance and duration and not speed:
+        d, t = _to_km(_num(distance[0]), distance[1]), _to_hours(_num(duration[0]), duration[1])
+        if t == 0:
+            return None
+        answer = f"{format_number(d / t)} km/h"
+        return _result("speed_distance", answer, [f"Speed = Distance / Time = {format_number(d)} km / {format_number(t)} h = {answer}"], False)
+    if distance and speed and not duration:
+        d, v = _to_km(_num(distance[0]), distance[1]), _to_kmph(_num(speed[0]), speed[1])
+        if v == 0:
+            return None
+        hours = d / v
+        answer = f"{format_number(hours)} hours"
+        steps = [f"Time = Distance / Speed = {format_number(d)} km / {format_number(v)} km/h = {answer}"]
+        if hours.denominator != 1:
+            steps.append(f"= {format_number(hours * 60)} minutes")
+        return _result("speed_distance", answer, steps, False)
+    return None
+
+
+# --------------------------------------------------
+# Work and time
+# --------------------------------------------------
+_WORK_DURATION = re.compile(rf"in\s+{NUMBER}\s*(days?|hours?|hrs?|minutes?)", re.IGNORECASE)
+
+
+# Emptying pipes/leaks, workers leaving or joining part-way, relative
+# efficiencies and "find one worker's time" questions are not a plain sum of rates
+_WORK_UNSUPPORTED = re.compile(
+    r"empt|leak|drain|outlet|waste|leaves|left|joins|joined|after|then|remaining|rest\s+of|alone|"
+    r"stopp|quit|absent|alternate|efficien|twice|thrice|times\s+as|as\s+fast|%|percent|wages|paid|share"
+)
+_TOGETHER = re.compile(r"together|both|all\s+of\s+them|combined")
+
+
+def solve_work_rate(message: str):
+    text = message.lower()
+    if not _TOGETHER.search(text) or _WORK_UNSUPPORTED.search(text):
+        return None
+    if not re.search(r"work|job|task|complete|finish|fill|pipe|tank", text):
+        return None
+    matches = list(_WORK_DURATION.finditer(text))
+    if len(matches) < 2:
+        return None
+    # "together" must be what is asked, not a given ("A and B together take 12 days")
+    if _TOGETHER.search(text, matches[-1].end()) is None or _TOGETHER.search(text[:matches[0].start()]):
+        return None
+    matches = [(m.group(1), m.group(2)) for m in matches]
+    if len({m[1].rstrip("s")[:3] for m in matches}) > 1:
+        return None
+    unit = matches[0][1].rstrip("s") + "s"
+    times = [_num(m[0]) for m in matches]
+    if any(t == 0 for t in times):
+        return None
+
+    rates = [1 / t for t in times]
+    combined = sum(rates)
+    together = 1 / combined
+    answer = f"{format_number(together)} {unit}"
+    steps = [
+        "One-unit rates: " + ", ".join(f"1/{_fraction(t)}" for t in times),
+        f"Combined rate = {_fraction(combined)} of the work per {unit.rstrip('s')}",
+        f"Time together = 1 / ({_fraction(combined)}) = {answer}",
+    ]
+    return _result("work_rate", answer, steps, False)
+
+
+# --------------------------------------------------
+# Ratios
+# --------------------------------------------------
+def solve_ratio(message: str):
+    text = message.lower()
+    match = re.search(rf"(?:divide|distribute|share|split)\s+(?:rs\.?|₹|\$)?\s*{NUMBER}.*?ratio\s+(?:of\s+)?(\d+(?:\s*:\s*\d+)+)", text)
+    if not match:
+        return None
+    total = _num(match.group(1))
+    parts = [Fraction(p) for p in re.split(r"\s*:\s*", match.group(2))]
+    denominator = sum(parts)
+    if denominator == 0:
+        return None
+    shares = [total * p / denominator for p in parts]
+    answer = " : ".join(format_number(s) for s in shares)
+    steps = [f"Sum of ratio parts = {format_number(denominator)}"] + [
+        f"{format_number(p)}/{format_number(denominator)} × {format_number(total)} = {format_number(s)}"
+        for p, s in zip(parts, shares)
+    ]
+    return _result("ratio", answer, steps, False)
+
+
+# --------------------------------------------------
+# Combinatorics
+# --------------------------------------------------
+def _bounded(*values) -> bool:
+    return all(0 <= v <= MAX_FACTORIAL for v in values)
+
+
+# Restrictions that make an arrangement more than n! ("if 2 must sit together")
+_ARRANGEMENT_CONSTRAINTS = re.compile(
+    r"together|adjacent|next\s+to|beside|between|\bnot\b|never|must|always|only|except|\bif\b|such\s+that|"
+    r"vowel|consonant|first|last|\bends?\b|repeat|identical|alike|same|at\s+least|at\s+most|select|choose|out\s+of"
+)
+
+
+def solve_combinatorics(message: str):
+    text = message.lower()
+    match = re.search(r"(?<![\w.])(\d+)\s*c\s*(\d+)(?![\w.])|\bc\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)|"
+                      r"(?<![\w.])(\d+)\s+choose\s+(\d+)(?![\w.])", text)
+    if match:
+        plain = _plainness(text, match)
+        n, r = [int(g) for g in match.groups() if g is not None]
+        if plain is None or not _bounded(n, r) or r > n:
+            return None
+        value = math.comb(n, r)
+        return _result("combination", str(value), [f"{n}C{r} = {n}! / ({r}! × {n - r}!) = {value}"], plain)
+
+    match = re.search(r"(?<![\w.])(\d+)\s*p\s*(\d+)(?![\w.])|\bp\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)", text)
+    if match:
+        plain = _plainness(text, match)
+        n, r = [int(g) for g in match.groups() if g is not None]
+        if plain is None or not _bounded(n, r) or r > n:
+            return None
+        value = math.perm(n, r)
+        return _result("permutation", str(value), [f"{n}P{r} = {n}! / {n - r}! = {value}"], plain)
+
+    match = re.search(r"(?<![\w.])(\d+)\s*!|factorial\s+of\s+(\d+)\b", text)
+    if match:
+        plain = _plainness(text, match)
+        n = int(match.group(1) or match.group(2))
+        if plain is None or not _bounded(n):
+            return None
+        value = math.factorial(n)
+        return _result("factorial", str(value), [f"{n}! = {value}"], plain)
+
+    # "In how many ways can 5 people be arranged/seated (in a row)"
+    match = re.search(r"how\s+many\s+ways.*?(\d+)\s*(?:people|persons|students|books|letters|boys|girls|objects|items)", text)
+    if match and re.search(r"arrang|seat|order|line|row", text) and "circle" not in text and "round" not in text:
+        # Any other number or a restriction changes the count
+        if len(re.findall(r"\d+", text)) > 1 or _ARRANGEMENT_CONSTRAINTS.search(text):
+            return None
+        n = int(match.group(1))
+        if not _bounded(n):
+            return None
+        value = math.factorial(n)
+        return _result("permutation", str(value), [f"{n} distinct items in a row: {n}! = {value}"], False)
+    return None
+
+
+# --------------------------------------------------
+# Entry point
+# --------------------------------------------------
+SOLVERS = (
+    solve_combinatorics,
+    solve_interest,
+    solve_work_rate,
+    solve_speed_distance,
+    solve_ratio,
+    solve_percentage,
+    solve_arithmetic,
+)
+
+
+def solve_aptitude_question(message: str):
+    """
+    Try each template solver in turn. Returns a dict with kind, answer,
+    steps and `plain` (True when no explanation is needed), or None.
+    """
+    if not message or len(message) > 600:
+        return None
+    text = message.strip()
+    wants_explanation = any(word in text.lower() for word in EXPLAIN_WORDS)
+
+    for solver in SOLVERS:
+        try:
+            solution = solver(text)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            solution = None
+        if solution:
+            if wants_explanation:
+                solution["plain"] = False
+            return solution
+    return None
+
+
+def format_solution(solution: dict) -> str:
+    steps = "\n".join(f"- {step}" for step in solution["steps"])
+    return f"**Answer:** {solution['answer']}\n\n**Working:**\n{steps}"
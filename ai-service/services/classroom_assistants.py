@@ -3,12 +3,17 @@ Classroom Assistants Service - Specialized training assistants
 Using Groq LLM
 """
 
-import os
-from langchain.globals import set_verbose
+import re
+import logging
+
 from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
 
-set_verbose(False)
+from services.llm_clients import get_groq_llm
+from services.session_store import format_history
+from services.aptitude_solver import solve_aptitude_question, format_solution
+from services.code_prepass import analyze_message, build_prompt_message, format_syntax_report
+
+logger = logging.getLogger(__name__)
 
 
 # --------------------------------------------------
@@ -18,33 +23,12 @@ def get_llm():
     """
     Get Groq LLM instance
     """
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
-
-    return ChatGroq(
-        model="llama-3.1-8b-instant",
-        groq_api_key=api_key,
-        temperature=0.7
-    )
-
-
-# --------------------------------------------------
-# Technical Interview Assistant
-# --------------------------------------------------
-def chat_with_technical_assistant(message: str, conversation_history: list = None) -> dict:
-    llm = get_llm()
+    return get_groq_llm(temperature=0.7)
 
-    context = ""
-    if conversation_history:
-        for msg in conversation_history[-6:]:
-            role = msg.get("role", "user").upper()
-            content = msg.get("content", "")
-            context += f"{role}: {content}\n"
 
-    prompt_template = PromptTemplate(
-        input_variables=["context", "message"],
-        template="""
+TECHNICAL_PROMPT = PromptTemplate(
+    input_variables=["context", "message"],
+    template="""
 You are an expert Technical Interview Trainer with 15+ years of experience preparing candidates for top tech companies.
 
 Your expertise covers:
@@ -69,9 +53,20 @@ USER: {message}
 
 TECHNICAL TRAINER:
 """
-    )
+)
+
 
-    formatted_prompt = prompt_template.format(
+# --------------------------------------------------
+# Technical Interview Assistant
+# --------------------------------------------------
+def chat_with_technical_assistant(message: str, conversation_history: list = None, context: str = None) -> dict:
+    llm = get_llm()
+
+    # Build conversation context (last 3 exchanges) unless the session store supplied it
+    if context is None:
+        context = format_history(conversation_history[-6:]) if conversation_history else ""
+
+    formatted_prompt = TECHNICAL_PROMPT.format(
         context=context if context else "This is the start of the training session.",
         message=message
     )
@@ -84,22 +79,9 @@ TECHNICAL TRAINER:
     }
 
 
-# --------------------------------------------------
-# Coding Practice Assistant
-# --------------------------------------------------
-def chat_with_coding_assistant(message: str, conversation_history: list = None) -> dict:
-    llm = get_llm()
-
-    context = ""
-    if conversation_history:
-        for msg in conversation_history[-6:]:
-            role = msg.get("role", "user").upper()
-            content = msg.get("content", "")
-            context += f"{role}: {content}\n"
-
-    prompt_template = PromptTemplate(
-        input_variables=["context", "message"],
-        template="""
+CODING_PROMPT = PromptTemplate(
+    input_variables=["context", "message"],
+    template="""
 You are an expert Coding Interview Trainer specializing in helping candidates clear coding rounds.
 
 Your expertise includes:
@@ -127,9 +109,31 @@ USER: {message}
 
 CODING TRAINER:
 """
-    )
+)
+
 
-    formatted_prompt = prompt_template.format(
+# --------------------------------------------------
+# Coding Practice Assistant
+# --------------------------------------------------
+def chat_with_coding_assistant(message: str, conversation_history: list = None, context: str = None) -> dict:
+    # Local static-analysis pre-pass: syntax errors are reported without an
+    # LLM call, otherwise the prompt gets compacted code plus the findings
+    analysis = analyze_message(message)
+    if analysis and analysis["pureSyntaxError"]:
+        return {
+            "response": format_syntax_report(analysis),
+            "role": "coding_assistant"
+        }
+    if analysis:
+        message = build_prompt_message(analysis)
+
+    llm = get_llm()
+
+    # Build conversation context (last 3 exchanges) unless the session store supplied it
+    if context is None:
+        context = format_history(conversation_history[-6:]) if conversation_history else ""
+
+    formatted_prompt = CODING_PROMPT.format(
         context=context if context else "This is the start of the coding practice session.",
         message=message
     )
@@ -142,22 +146,9 @@ CODING TRAINER:
     }
 
 
-# --------------------------------------------------
-# Aptitude & Reasoning Assistant
-# --------------------------------------------------
-def chat_with_aptitude_assistant(message: str, conversation_history: list = None) -> dict:
-    llm = get_llm()
-
-    context = ""
-    if conversation_history:
-        for msg in conversation_history[-6:]:
-            role = msg.get("role", "user").upper()
-            content = msg.get("content", "")
-            context += f"{role}: {content}\n"
-
-    prompt_template = PromptTemplate(
-        input_variables=["context", "message"],
-        template="""
+APTITUDE_PROMPT = PromptTemplate(
+    input_variables=["context", "message"],
+    template="""
 You are an expert Aptitude & Reasoning Trainer for placement preparation.
 
 Your expertise covers:
@@ -181,9 +172,43 @@ USER: {message}
 
 APTITUDE TRAINER:
 """
-    )
+)
+
 
-    formatted_prompt = prompt_template.format(
+VERIFIED_ANSWER_TEMPLATE = """{message}
+
+[Calculator hint - standard formula gives: {answer}]
+[Working: {steps}]
+Use the hint to check your arithmetic. If the question has a detail the formula above does not cover, solve it fully and say why the answer differs."""
+
+
+# --------------------------------------------------
+# Aptitude & Reasoning Assistant
+# --------------------------------------------------
+def chat_with_aptitude_assistant(message: str, conversation_history: list = None, context: str = None) -> dict:
+    # Local solver first: plain calculations never reach the LLM, and word
+    # problems come with an exact calculator result as a hint
+    solution = solve_aptitude_question(message)
+    if solution and solution["plain"]:
+        return {
+            "response": format_solution(solution),
+            "role": "aptitude_assistant"
+        }
+
+    llm = get_llm()
+
+    # Build conversation context (last 3 exchanges) unless the session store supplied it
+    if context is None:
+        context = format_history(conversation_history[-6:]) if conversation_history else ""
+
+    if solution:
+        message = VERIFIED_ANSWER_TEMPLATE.format(
+            message=message,
+            answer=solution["answer"],
+            steps="\n".join(solution["steps"])
+        )
+
+    formatted_prompt = APTITUDE_PROMPT.format(
         context=context if context else "This is the start of the aptitude training session.",
         message=message
     )
@@ -194,3 +219,88 @@ APTITUDE TRAINER:
         "response": response.content,
         "role": "aptitude_assistant"
     }
+
+
+# --------------------------------------------------
+# Practice sets (several questions per prompt)
+# --------------------------------------------------
+PRACTICE_SET_CONTEXT = """This is a practice set of {count} questions. Answer every question, in order.
+Start each answer with a line containing only its marker, e.g. "### Q1", and
+keep each answer focused (working, final answer and one tip; under 200 words)."""
+
+VERIFIED_ANSWER_NOTE = (
+    "[Calculator hint - standard formula gives: {answer}. Use it to check your arithmetic; if the question "
+    "has a detail the formula does not cover, solve it fully and say why the answer differs.]"
+)
+
+# Only the exact requested marker on a line of its own, so code in an answer
+# ("q1 = deque()") or a "Q2" in the prose never splits it
+ANSWER_MARKER = re.compile(r"^###[ \t]*Q(\d+)[ \t]*$", re.MULTILINE)
+CODE_FENCE = re.compile(r"^[ \t]*(?:```|~~~)", re.MULTILINE)
+
+PRACTICE_ASSISTANTS = {
+    "technical": (TECHNICAL_PROMPT, chat_with_technical_assistant, "technical_assistant"),
+    "aptitude": (APTITUDE_PROMPT, chat_with_aptitude_assistant, "aptitude_assistant"),
+}
+
+
+def prepare_practice_question(assistant: str, question: str) -> dict:
+    """
+    Local answer for questions that need no LLM (aptitude calculations),
+    otherwise the text to put in a batched prompt
+    """
+    if assistant == "aptitude":
+        solution = solve_aptitude_question(question)
+        if solution and solution["plain"]:
+            return {"response": format_solution(solution), "source": "solver"}
+        if solution:
+            return {"prompt": f"{question}\n{VERIFIED_ANSWER_NOTE.format(answer=solution['answer'])}"}
+    return {"prompt": question}
+
+
+def split_batched_answers(text: str, count: int) -> dict:
+    """
+    Number -> answer text for each "### Qn" section of a batched reply
+    (missing or out-of-range sections are left out)
+    """
+    # Markers inside code fences are part of an answer, not a new one
+    fences = [m.start() for m in CODE_FENCE.finditer(text)]
+    fenced = [(fences[i], fences[i + 1] if i + 1 < len(fences) else len(text)) for i in range(0, len(fences), 2)]
+    markers = [
+        marker for marker in ANSWER_MARKER.finditer(text)
+        if not any(start <= marker.start() < end for start, end in fenced)
+    ]
+    answers = {}
+    for i, marker in enumerate(markers):
+        number = int(marker.group(1))
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        answer = text[marker.end():end].strip()
+        if 1 <= number <= count and answer and number not in answers:
+            answers[number] = answer
+    return answers
+
+
+def answer_practice_batch(assistant: str, questions: list, prompts: list) -> dict:
+    """
+    One LLM call for several questions: the persona prompt is sent once and
+    the reply is split back out per question. Returns position -> answer;
+    questions the model skipped get the regular single-question call.
+    """
+    template, chat_fn, _ = PRACTICE_ASSISTANTS[assistant]
+    if len(prompts) == 1:
+        return {0: chat_fn(questions[0])["response"]}
+
+    numbered = "Practice set:\n\n" + "\n\n".join(f"### Q{i + 1}\n{prompt}" for i, prompt in enumerate(prompts))
+    formatted_prompt = template.format(
+        context=PRACTICE_SET_CONTEXT.format(count=len(prompts)),
+        message=numbered
+    )
+    response = get_llm().invoke(formatted_prompt)
+    answers = {number - 1: answer for number, answer in split_batched_answers(response.content, len(prompts)).items()}
+
+    missing = [i for i in range(len(prompts)) if i not in answers]
+    if missing:
+        logger.warning(f"Practice set reply missed {len(missing)} of {len(prompts)} answer(s); asking separately")
+        for i in missing:
+            answers[i] = chat_fn(questions[i])["response"]
+    return answers
@@ -0,0 +1,480 @@
+"""
+Code Pre-pass Service - Local static analysis for the coding assistant
+Finds code in a chat message, detects its language, reports syntax errors
+with line numbers, estimates loop-nesting complexity and produces a compact
+version of the code for the prompt
+"""
+
+import re
+import ast
+import textwrap
+
+FENCE = re.compile(r"```[ \t]*([\w+#.-]*)[ \t]*\n(.*?)```", re.DOTALL)
+
+# A message is answered locally when its code has syntax errors and the
+# prose around it is short and only asks what is wrong (or is absent)
+PURE_CODE_MAX_WORDS = 25
+SYNTAX_INTENT = re.compile(
+    r"error|fix|fail|compile|syntax|bug|wrong|issue|problem|doesn'?t (run|work)|not (running|working)|what'?s wrong",
+    re.IGNORECASE
+)
+
+LANGUAGE_ALIASES = {
+    "py": "python", "python3": "python",
+    "js": "javascript", "jsx": "javascript", "node": "javascript",
+    "ts": "typescript", "tsx": "typescript",
+    "c++": "cpp", "cc": "cpp", "hpp": "cpp", "cxx": "cpp",
+    "h": "c",
+    "java": "java", "cs": "csharp", "c#": "csharp", "golang": "go",
+}
+
+# Checked in order; Python last, since "import x" and "class X" also start
+# Java and JavaScript lines
+LANGUAGE_HINTS = [
+    ("java", re.compile(
+        r"\b(public\s+(static\s+)?(class|void|int)|System\.out\.|String\[\]\s+args)|^\s*import\s+java\.", re.M
+    )),
+    ("cpp", re.compile(r"#include\s*<(iostream|vector|bits/stdc\+\+\.h|string|map|algorithm)>|std::|\bcout\s*<<|\bvector<")),
+    ("c", re.compile(r"#include\s*<(stdio|stdlib|string)\.h>|\bprintf\s*\(|\bscanf\s*\(")),
+    ("javascript", re.compile(r"\bfunction\s+\w+\s*\(|\b(const|let)\s+\w+\s*=|=>|console\.log\(")),
+    ("python", re.compile(
+        r"^\s*(def \w+\s*\(.*\)\s*(->.*)?:\s*$|class \w+.*:\s*$|import [\w.]+(\s+as\s+\w+)?\s*$|"
+        r"from [\w.]+ import [\w*, ]+\s*$|elif .*:\s*$|print\()", re.M
+    )),
+]
+
+CODE_LINE = re.compile(r"[;{}]\s*$|^\s*(def|class|for|while|if|else|elif|return|import|#include|public|private|int|void|function|const|let|var)\b")
+
+BRACKETS = {")": "(", "]": "[", "}": "{"}
+LOOP_START = re.compile(r"\b(for|while)\b")
+
+
+# --------------------------------------------------
+# Extraction and language detection
+# --------------------------------------------------
+def extract_code_blocks(message: str) -> list:
+    """
+    Return [{"language", "guessed", "code", "span"}] for fenced blocks, or a
+    single unfenced block when most of the message looks like code
+    ("guessed" when the language was detected rather than tagged)
+    """
+    blocks = []
+    for match in FENCE.finditer(message):
+        tag = match.group(1).lower()
+        code = match.group(2)
+        blocks.append({
+            "language": LANGUAGE_ALIASES.get(tag, tag) or detect_language(code),
+            "guessed": not tag,
+            "code": code,
+            "span": match.span(),
+        })
+    if blocks:
+        return blocks
+
+    lines = [line for line in message.splitlines() if line.strip()]
+    code_lines = [line for line in lines if CODE_LINE.search(line)]
+    if len(lines) >= 3 and len(code_lines) >= max(2, len(lines) // 2):
+        start = message.find(code_lines[0])
+        language = detect_language(message[start:])
+        if language:
+            return [{"language": language, "guessed": True, "code": message[start:], "span": (start, len(message))}]
+    return []
+
+
+def detect_language(code: str):
+    for language, pattern in LANGUAGE_HINTS:
+        if pattern.search(code):
+            return language
+    return None
+
+
+# --------------------------------------------------
+# Python analysis (ast)
+# --------------------------------------------------
+class _LoopDepthVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self.functions = {}
+        self._current = None
+
+    def _enter_loop(self, node):
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        if self._current:
+            info = self.functions[self._current]
+            info["loopDepth"] = max(info["loopDepth"], self.depth)
+        self.generic_visit(node)
+        self.depth -= 1
+
+    visit_For = _enter_loop
+    visit_While = _enter_loop
+    visit_AsyncFor = _enter_loop
+
+    def _enter_comprehension(self, node):
+        # Each `for` clause in a comprehension is one more loop level
+        levels = len(node.generators)
+        self.depth += levels
+        self.max_depth = max(self.max_depth, self.depth)
+        if self._current:
+            info = self.functions[self._current]
+            info["loopDepth"] = max(info["loopDepth"], self.depth)
+        self.generic_visit(node)
+        self.depth -= levels
+
+    visit_ListComp = _enter_comprehension
+    visit_SetComp = _enter_comprehension
+    visit_DictComp = _enter_comprehension
+    visit_GeneratorExp = _enter_comprehension
+
+    def visit_FunctionDef(self, node):
+        outer, outer_depth = self._current, self.depth
+        self._current = node.name
+        self.depth = 0
+        self.functions[node.name] = {
+            "name": node.name,
+            "startLine": node.lineno,
+            "endLine": getattr(node, "end_lineno", node.lineno),
+            "loopDepth": 0,
+            "recursive": False,
+        }
+        self.generic_visit(node)
+        self._current, self.depth = outer, outer_depth
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, node):
+        if self._current and isinstance(node.func, ast.Name) and node.func.id == self._current:
+            self.functions[self._current]["recursive"] = True
+        self.generic_visit(node)
+
+
+def _strip_docstrings(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Module)):
+            body = node.body
+            if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) \
+                    and isinstance(body[0].value.value, str):
+                node.body = body[1:] or [ast.Pass()]
+    return tree
+
+
+def analyze_python(code: str) -> dict:
+    # Methods pasted out of a class arrive indented; dedent keeps line numbers
+    try:
+        tree = ast.parse(textwrap.dedent(code))
+    except SyntaxError as e:
+        return {
+            # Indentation errors and null bytes are usually paste damage, not the user's bug
+            "syntaxErrors": [{
+                "line": e.lineno or 0,
+                "column": e.offset or 0,
+                "message": e.msg,
+                "certain": not isinstance(e, IndentationError) and "\0" not in code,
+            }],
+            "maxLoopDepth": None,
+            "functions": [],
+            "compact": None,
+        }
+    except ValueError:
+        # Null bytes on Python < 3.12
+        return {"syntaxErrors": [], "maxLoopDepth": None, "functions": [], "compact": None}
+
+    visitor = _LoopDepthVisitor()
+    visitor.visit(tree)
+    try:
+        # ast.unparse drops comments, docstrings and formatting noise
+        compact = ast.unparse(_strip_docstrings(tree))
+    except Exception:
+        compact = None
+    return {
+        "syntaxErrors": [],
+        "maxLoopDepth": visitor.max_depth,
+        "functions": list(visitor.functions.values()),
+        "compact": compact,
+    }
+
+
+# --------------------------------------------------
+# Tokenizer-level analysis (C-family and JavaScript)
+# --------------------------------------------------
+# Previous significant character after which "/" starts a JS regex literal
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = re.compile(r"(?:return|typeof|case|in|of|yield|await|void|delete)$")
+
+
+def _regex_literal_end(code: str, i: int, last: str):
+    """
+    End index of a JS regex literal starting at code[i] == "/", or None when
+    the slash is a division (or the literal does not close on its line)
+    """
+    before = code[:i].rstrip()
+    if not (last is None or last in REGEX_PRECEDERS or REGEX_KEYWORDS.search(before)):
+        return None
+    j, in_class = i + 1, False
+    while j < len(code) and code[j] != "\n":
+        ch = code[j]
+        if ch == "\\":
+            j += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            j += 1
+            while j < len(code) and code[j].isalpha():
+                j += 1
+            return j
+        j += 1
+    return None
+
+
+def _scan_c_family(code: str, language: str = None):
+    """
+    Walk the code once, skipping strings, comments and (JS) regex literals,
+    to check bracket balance and unterminated literals and to track loop
+    nesting by braces
+    """
+    javascript = language in ("javascript", "typescript")
+    errors = []
+    last = None
+    stack = []
+    loop_depth = 0
+    max_loop_depth = 0
+    pending_loop = False
+    line = 1
+    i = 0
+    n = len(code)
+
+    while i < n:
+        ch = code[i]
+        if ch == "\n":
+            line += 1
+            i += 1
+            continue
+        if ch.isspace():
+            i += 1
+            continue
+        if code.startswith("//", i):
+            end = code.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if code.startswith("/*", i):
+            end = code.find("*/", i + 2)
+            if end == -1:
+                errors.append({"line": line, "column": 0, "message": "unterminated block comment"})
+                break
+            line += code.count("\n", i, end)
+            i = end + 2
+            continue
+        if javascript and ch == "/":
+            end = _regex_literal_end(code, i, last)
+            if end is not None:
+                i, last = end, "/"
+                continue
+        if ch == "'" and 0 < i < n - 1 and code[i - 1].isdigit() and code[i + 1].isdigit():
+            # C++14 digit separator (1'000'000)
+            i += 1
+            continue
+        if ch in "\"'`":
+            j = i + 1
+            while j < n and code[j] != ch:
+                if code[j] == "\\":
+                    j += 1
+                elif code[j] == "\n" and ch != "`":
+                    break
+                j += 1
+            if j >= n or code[j] != ch:
+                # In JS/TS a lone quote may be JSX text or a regex the scanner misread
+                errors.append({"line": line, "column": 0, "message": "unterminated string literal",
+                               "certain": not javascript})
+                i = j
+                continue
+            line += code.count("\n", i, j)
+            i, last = j + 1, ch
+            continue
+
+        if ch.isalpha():
+            match = LOOP_START.match(code, i)
+            if match and (i == 0 or not (code[i - 1].isalnum() or code[i - 1] == "_")):
+                pending_loop = True
+                i = match.end()
+                continue
+            while i < n and (code[i].isalnum() or code[i] == "_"):
+                i += 1
+            last = "a"
+            continue
+
+        if ch in "([{":
+            is_loop_block = ch == "{" and pending_loop
+            if ch == "{":
+                pending_loop = False
+            if is_loop_block:
+                loop_depth += 1
+                max_loop_depth = max(max_loop_depth, loop_depth)
+            stack.append((ch, line, is_loop_block))
+        elif ch in ")]}":
+            if not stack or stack[-1][0] != BRACKETS[ch]:
+                errors.append({"line": line, "column": 0, "message": f"unexpected '{ch}'"})
+            else:
+                _, _, was_loop = stack.pop()
+                if was_loop:
+                    loop_depth -= 1
+        elif ch == ";" and pending_loop and not any(b[0] == "(" for b in stack):
+            # Brace-less loop body such as `for (...) x++;`
+            max_loop_depth = max(max_loop_depth, loop_depth + 1)
+            pending_loop = False
+        last = ch
+        i += 1
+
+    for opener, opened_at, _ in stack:
+        errors.append({"line": opened_at, "column": 0, "message": f"'{opener}' is never closed"})
+    return errors, max_loop_depth
+
+
+def _strip_c_comments(code: str) -> str:
+    code = re.sub(r"/\*.*?\*/", "", code, flags=re.DOTALL)
+    code = re.sub(r"(?m)^\s*//.*$", "", code)
+    return "\n".join(line.rstrip() for line in code.splitlines() if line.strip())
+
+
+def analyze_c_family(code: str, language: str = None) -> dict:
+    errors, max_depth = _scan_c_family(code, language)
+    return {
+        "syntaxErrors": errors,
+        "maxLoopDepth": max_depth,
+        "functions": [],
+        "compact": _strip_c_comments(code),
+    }
+
+
+# --------------------------------------------------
+# Report
+# --------------------------------------------------
+def complexity_label(depth) -> str:
+    if depth is None:
+        return "unknown"
+    if depth == 0:
+        return "O(1) per call (no loops)"
+    if depth == 1:
+        return "O(n)"
+    return f"O(n^{depth})"
+
+
+def _relevant_functions(result: dict, message_text: str, code: str) -> str:
+    """
+    For Python, keep only functions the user mentions (falls back to all)
+    """
+    functions = result["functions"]
+    if not functions or result["compact"] is None:
+        return result["compact"]
+    mentioned = [f for f in functions if re.search(rf"\b{re.escape(f['name'])}\b", message_text)]
+    if not mentioned or len(mentioned) == len(functions):
+        return result["compact"]
+
+    lines = code.splitlines()
+    selected = []
+    for func in mentioned:
+        snippet = "\n".join(lines[func["startLine"] - 1:func["endLine"]])
+        try:
+            snippet = ast.unparse(_strip_docstrings(ast.parse(textwrap.dedent(snippet))))
+        except Exception:
+            pass
+        selected.append(snippet)
+    return "\n\n".join(selected)
+
+
+def analyze_message(message: str):
+    """
+    Run the pre-pass over a chat message. Returns None when it has no code.
+    """
+    blocks = extract_code_blocks(message)
+    if not blocks:
+        return None
+
+    prose = message
+    for block in reversed(blocks):
+        start, end = block["span"]
+        prose = prose[:start] + prose[end:]
+    prose = prose.strip()
+
+    reports = []
+    for block in blocks:
+        language = block["language"] or "unknown"
+        if language == "python":
+            result = analyze_python(block["code"])
+        elif language in ("c", "cpp", "java", "javascript", "typescript", "csharp", "go"):
+            result = analyze_c_family(block["code"], language)
+        else:
+            result = {"syntaxErrors": [], "maxLoopDepth": None, "functions": [], "compact": block["code"].strip()}
+        if block["guessed"]:
+            # An error may only mean the guess was wrong
+            for error in result["syntaxErrors"]:
+                error["certain"] = False
+        result["language"] = language
+        result["code"] = block["code"]
+        if language == "python" and not result["syntaxErrors"]:
+            result["compact"] = _relevant_functions(result, prose, block["code"])
+        reports.append(result)
+
+    errors = [e for r in reports for e in r["syntaxErrors"]]
+    has_errors = bool(errors)
+    # Only definite errors are answered locally; doubtful ones go to the LLM
+    certain = has_errors and all(e.get("certain", True) for e in errors)
+    return {
+        "prose": prose,
+        "blocks": reports,
+        "hasSyntaxErrors": has_errors,
+        "pureSyntaxError": certain and (
+            not prose or (len(prose.split()) <= PURE_CODE_MAX_WORDS and bool(SYNTAX_INTENT.search(prose)))
+        ),
+    }
+
+
+def format_syntax_report(analysis: dict) -> str:
+    """
+    Direct answer for messages whose problem is a syntax error
+    """
+    parts = []
+    for block in analysis["blocks"]:
+        if not block["syntaxErrors"]:
+            continue
+        lines = block["code"].splitlines()
+        parts.append(f"I found syntax error(s) in your {block['language']} code:")
+        for error in block["syntaxErrors"]:
+            line_no = error["line"]
+            parts.append(f"\n**Line {line_no}:** {error['message']}")
+            if 0 < line_no <= len(lines):
+                snippet = lines[line_no - 1]
+                caret = ""
+                if error["column"]:
+                    caret = "\n" + " " * (error["column"] - 1) + "^"
+                parts.append(f"```\n{snippet}{caret}\n```")
+    parts.append("\nFix these first, then share the code again and I'll review the logic, complexity and edge cases.")
+    return "\n".join(parts)
+
+
+def build_prompt_message(analysis: dict) -> str:
+    """
+    Compact replacement for the user message: their prose, the compacted
+    code and a one-line analysis summary per block
+    """
+    parts = [analysis["prose"]] if analysis["prose"] else []
+    for block in analysis["blocks"]:
+        summary = [f"language={block['language']}"]
+        if block["syntaxErrors"]:
+            summary.append("syntax errors: " + "; ".join(
+                f"line {e['line']}: {'possibly ' if not e.get('certain', True) else ''}{e['message']}"
+                for e in block["syntaxErrors"]
+            ))
+        else:
+            summary.append("syntax OK")
+        summary.append(f"estimated complexity {complexity_label(block['maxLoopDepth'])}")
+        recursive = [f["name"] for f in block["functions"] if f["recursive"]]
+        if recursive:
+            summary.append("recursive: " + ", ".join(recursive))
+        code = block["compact"] if block["compact"] else block["code"].strip()
+        parts.append(f"```{block['language']}\n{code}\n```")
+        parts.append(f"[Static analysis: {'; '.join(summary)}]")
+    return "\n\n".join(parts)
@@ -0,0 +1,366 @@
+"""
+Cohort Analytics Service - Skill coverage and gaps across a whole cohort
+Students and JDs are rows of binary student x skill and JD x skill
+matrices (SciPy sparse when available, NumPy otherwise). Coverage, gap
+frequencies and per-JD eligibility are a few vectorized reductions and
+one sparse product, so a cohort of thousands is answered in milliseconds
+with no LLM calls. Reports are cached until the cohort changes, and a new
+or updated resume only recomputes its own row.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # pragma: no cover - optional dependency
+    sparse = None
+
+from services.skill_normalizer import normalize_skills, extract_skills
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_SIZE = int(os.getenv("COHORT_REPORT_CACHE_SIZE", 32))
+MISSING_PER_JD = 5
+
+
+def _skill_set(skills: list, text: str = "") -> list:
+    return normalize_skills(list(skills or []) + (extract_skills(text) if text else []))
+
+
+# --------------------------------------------------
+# Cohort
+# --------------------------------------------------
+class Cohort:
+    """
+    One cohort (e.g. a placement batch) and the JDs of its drive.
+    Students are stored as column-index arrays; the sparse matrix and the
+    student x JD match counts are rebuilt lazily, except that a student
+    upsert with unchanged JDs patches its single row.
+    """
+
+    def __init__(self, cohort_id: str):
+        self.cohort_id = cohort_id
+        self._lock = threading.RLock()
+        self._vocab = {}
+        self._skills = []
+        self._coverage = np.zeros(0, dtype=np.int64)
+        self._student_ids = []
+        self._student_rows = {}
+        self._student_cols = []
+        self._jd_ids = []
+        self._jd_rows = {}
+        self._jds = []
+        self._students_matrix = None
+        self._required = None
+        self._preferred = None
+        self._matched = None
+        # _matched is a view of the first rows of this buffer, which grows by
+        # doubling so adding students one at a time stays amortized O(1)
+        self._matched_buffer = None
+        self._reports = OrderedDict()
+        self.version = 0
+
+    # ---------- vocabulary ----------
+    def _columns(self, skills: list) -> np.ndarray:
+        for skill in skills:
+            if skill not in self._vocab:
+                self._vocab[skill] = len(self._skills)
+                self._skills.append(skill)
+        if len(self._skills) > len(self._coverage):
+            coverage = np.zeros(max(len(self._skills), 2 * len(self._coverage)), dtype=np.int64)
+            coverage[:len(self._coverage)] = self._coverage
+            self._coverage = coverage
+        return np.array(sorted(self._vocab[s] for s in skills), dtype=np.int64)
+
+    def _changed(self):
+        self.version += 1
+        self._reports.clear()
+
+    # ---------- students ----------
+    def upsert_students(self, students: list) -> int:
+        """
+        students: [{"id", "skills", "resume_text"?}]
+        """
+        with self._lock:
+            added = []
+            for student in students:
+                student_id = str(student["id"])
+                cols = self._columns(_skill_set(student.get("skills"), student.get("resume_text", "")))
+                row = self._student_rows.get(student_id)
+                if row is None:
+                    row = len(self._student_ids)
+                    self._student_ids.append(student_id)
+                    self._student_rows[student_id] = row
+                    self._student_cols.append(cols)
+                else:
+                    self._coverage[self._student_cols[row]] -= 1
+                    self._student_cols[row] = cols
+                self._coverage[cols] += 1
+                if self._matched is not None:
+                    if row < len(self._matched):
+                        self._matched[row] = self._match_counts(cols)
+                    else:
+                        added.append(self._match_counts(cols))
+            if added:
+                self._append_matched(added)
+            self._students_matrix = None
+            self._changed()
+            return len(self._student_ids)
+
+    def remove_student(self, student_id: str) -> bool:
+        with self._lock:
+            row = self._student_rows.pop(str(student_id), None)
+            if row is None:
+                return False
+            self._coverage[self._student_cols[row]] -= 1
+            last = len(self._student_ids) - 1
+            if row != last:
+                moved = self._student_ids[last]
+                self._student_ids[row] = moved
+                self._student_cols[row] = self._student_cols[last]
+                self._student_rows[moved] = row
+                if self._matched is not None:
+                    self._matched[row] = self._matched[last]
+            self._student_ids.pop()
+            self._student_cols.pop()
+            if self._matched is not None:
+                self._matched = self._matched[:last]
+            self._students_matrix = None
+            self._changed()
+            return True
+
+    def _match_counts(self, cols: np.ndarray) -> np.ndarray:
+        """
+        One student's match counts against every JD (O(JDs x skills))
+        """
+        width = self._required.shape[1]
+        return self._required[:, cols[cols < width]].sum(axis=1)
+
+    def _append_matched(self, rows: list):
+        n = len(self._matched)
+        if n + len(rows) > len(self._matched_buffer):
+            buffer = np.empty((max(n + len(rows), 2 * n), self._matched.shape[1]), dtype=self._matched.dtype)
+            buffer[:n] = self._matched
+            self._matched_buffer = buffer
+        self._matched_buffer[n:n + len(rows)] = rows
+        self._matched = self._matched_buffer[:n + len(rows)]
+
+    # ---------- JDs ----------
+    def upsert_jds(self, jds: list) -> int:
+        """
+        jds: [{"id", "title"?, "required_skills"?, "preferred_skills"?, "jd_text"?}]
+        With no explicit required skills, skills mentioned in jd_text count as required.
+        """
+        with self._lock:
+            for jd in jds:
+                jd_id = str(jd["id"])
+                required = _skill_set(jd.get("required_skills"))
+                if not required and jd.get("jd_text"):
+                    required = _skill_set([], jd["jd_text"])
+                preferred = [s for s in _skill_set(jd.get("preferred_skills")) if s not in required]
+                entry = {
+                    "id": jd_id,
+                    "title": jd.get("title", ""),
+                    "required": self._columns(required),
+                    "preferred": self._columns(preferred),
+                }
+                row = self._jd_rows.get(jd_id)
+                if row is None:
+                    self._jd_rows[jd_id] = len(self._jd_ids)
+                    self._jd_ids.append(jd_id)
+                    self._jds.append(entry)
+                else:
+                    self._jds[row] = entry
+            self._required = self._matched = None
+            self._changed()
+            return len(self._jd_ids)
+
+    def remove_jd(self, jd_id: str) -> bool:
+        with self._lock:
+            row = self._jd_rows.pop(str(jd_id), None)
+            if row is None:
+                return False
+            self._jd_ids.pop(row)
+            self._jds.pop(row)
+            self._jd_rows = {jid: i for i, jid in enumerate(self._jd_ids)}
+            self._required = self._matched = None
+            self._changed()
+            return True
+
+    # ---------- matrices ----------
+    def _build_students(self):
+        n, v = len(self._student_ids), len(self._skills)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in self._student_cols], out=indptr[1:])
+        indices = np.concatenate(self._student_cols) if n else np.zeros(0, dtype=np.int64)
+        if sparse is not None:
+            data = np.ones(len(indices), dtype=np.float32)
+            return sparse.csr_matrix((data, indices, indptr), shape=(n, v))
+        dense = np.zeros((n, v), dtype=np.float32)
+        dense[np.repeat(np.arange(n), np.diff(indptr)), indices] = 1.0
+        return dense
+
+    def _build_jds(self, key: str) -> np.ndarray:
+        matrix = np.zeros((len(self._jds), len(self._skills)), dtype=np.float32)
+        for row, jd in enumerate(self._jds):
+            matrix[row, jd[key]] = 1.0
+        return matrix
+
+    def _ensure_matrices(self):
+        if self._required is None:
+            self._required = self._build_jds("required")
+            self._preferred = self._build_jds("preferred")
+        if self._matched is None:
+            # Only needed for a full recompute; student upserts patch _matched directly
+            if self._students_matrix is None or self._students_matrix.shape[1] != len(self._skills):
+                self._students_matrix = self._build_students()
+            students = self._students_matrix[:, :self._required.shape[1]]
+            matched = students @ self._required.T
+            self._matched = np.asarray(matched.toarray() if sparse is not None and sparse.issparse(matched) else matched)
+            self._matched_buffer = self._matched
+
+    # ---------- report ----------
+    def report(self, jd_ids: list = None, min_match: float = 0.7, gap_threshold: float = 0.0,
+               top_skills: int = 20) -> dict:
+        """
+        Coverage, gap frequencies and per-JD eligibility for the cohort
+        (optionally against a subset of its JDs)
+        """
+        params = (tuple(jd_ids) if jd_ids else None, round(min_match, 4), round(gap_threshold, 4), top_skills)
+        with self._lock:
+            cached = self._reports.get(params)
+            if cached is not None:
+                self._reports.move_to_end(params)
+                return dict(cached, cached=True)
+
+            started = time.perf_counter()
+            self._ensure_matrices()
+            n = len(self._student_ids)
+            selected = np.array(
+                [self._jd_rows[str(j)] for j in jd_ids if str(j) in self._jd_rows] if jd_ids else range(len(self._jds)),
+                dtype=np.int64
+            )
+            width = self._required.shape[1]
+            coverage = self._coverage[:width] / max(n, 1)
+            required = self._required[selected]
+            required_counts = required.sum(axis=1)
+
+            # Student x JD count of required skills met vs each JD's threshold
+            # (JDs without required skills are open to everyone)
+            matched = self._matched if not jd_ids else self._matched[:, selected]
+            threshold = np.where(required_counts > 0, min_match * required_counts - 1e-6, 0.0)
+            eligible = matched >= threshold
+            eligible_per_student = eligible.sum(axis=1)
+            eligible_per_jd = eligible.sum(axis=0)
+            avg_match = np.where(
+                required_counts > 0, matched.mean(axis=0) / np.maximum(required_counts, 1.0), 1.0
+            ) if n else np.zeros(len(selected))
+
+            jd_report = []
+            for k, row in enumerate(selected):
+                cols = self._jds[row]["required"]
+                missing = 1.0 - coverage[cols]
+                order = np.argsort(-missing, kind="stable")[:MISSING_PER_JD]
+                jd_report.append({
+                    "id": self._jd_ids[row],
+                    "title": self._jds[row]["title"],
+                    "requiredSkills": int(required_counts[k]),
+                    "eligibleStudents": int(eligible_per_jd[k]),
+                    "eligibleShare": round(float(eligible_per_jd[k] / max(n, 1)), 4),
+                    "avgRequiredMatch": round(float(avg_match[k]), 4),
+                    "mostMissing": [
+                        {"skill": self._skills[cols[i]], "missingShare": round(float(missing[i]), 4)} for i in order
+                    ],
+                })
+
+            # Skills demanded by the selected JDs, ranked by demand x share of students missing them
+            demand = required.sum(axis=0)
+            preferred_demand = self._preferred[selected].sum(axis=0)
+            wanted = np.flatnonzero((demand + preferred_demand) > 0)
+            missing_share = 1.0 - coverage[wanted]
+            keep = missing_share >= gap_threshold
+            wanted, missing_share = wanted[keep], missing_share[keep]
+            weight = (demand[wanted] + 0.5 * preferred_demand[wanted]) * missing_share
+            order = np.argsort(-weight, kind="stable")[:top_skills]
+            gaps = [
+                {
+                    "skill": self._skills[wanted[i]],
+                    "missingShare": round(float(missing_share[i]), 4),
+                    "requiredByJds": int(demand[wanted[i]]),
+                    "preferredByJds": int(preferred_demand[wanted[i]]),
+                }
+                for i in order
+            ]
+
+            top_coverage = np.argsort(-self._coverage[:len(self._skills)], kind="stable")[:top_skills]
+            report = {
+                "cohortId": self.cohort_id,
+                "version": self.version,
+                "students": n,
+                "jds": len(selected),
+                "minMatch": min_match,
+                "skillGaps": gaps,
+                "topCoveredSkills": [
+                    {"skill": self._skills[i], "share": round(float(self._coverage[i] / max(n, 1)), 4)}
+                    for i in top_coverage if self._coverage[i] > 0
+                ],
+                "perJd": jd_report,
+                "studentEligibility": {
+                    "eligibleForNone": int((eligible_per_student == 0).sum()),
+                    "medianEligibleJds": float(np.median(eligible_per_student)) if n else 0.0,
+                },
+                "backend": "scipy.sparse" if sparse is not None else "numpy",
+                "computeMs": round((time.perf_counter() - started) * 1000, 3),
+                "cached": False,
+            }
+            self._reports[params] = report
+            while len(self._reports) > REPORT_CACHE_SIZE:
+                self._reports.popitem(last=False)
+            return report
+
+    def stats(self) -> dict:
+        return {
+            "cohortId": self.cohort_id,
+            "students": len(self._student_ids),
+            "jds": len(self._jd_ids),
+            "skills": len(self._skills),
+            "version": self.version,
+        }
+
+
+# --------------------------------------------------
+# Registry
+# --------------------------------------------------
+class CohortRegistry:
+    """
+    In-memory cohorts; the backend remains the source of truth and can
+    re-upload a cohort after a restart
+    """
+
+    def __init__(self):
+        self._cohorts = {}
+        self._lock = threading.Lock()
+
+    def get(self, cohort_id: str, create: bool = False):
+        with self._lock:
+            cohort = self._cohorts.get(cohort_id)
+            if cohort is None and create:
+                cohort = self._cohorts[cohort_id] = Cohort(cohort_id)
+            return cohort
+
+    def drop(self, cohort_id: str) -> bool:
+        with self._lock:
+            return self._cohorts.pop(cohort_id, None) is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"cohorts": [c.stats() for c in self._cohorts.values()]}
+
+
+cohorts = CohortRegistry()
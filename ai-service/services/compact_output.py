@@ -0,0 +1,223 @@
+"""
+Compact Output Service - Terse LLM output formats expanded locally
+Completion tokens dominate latency, so prompts in compact mode ask for
+short-key / positional JSON without repeated field names, and this module
+rebuilds the full response shapes. Constant boilerplate (checklists, daily
+tips, dates, numbering) comes from local tables instead of the model.
+"""
+
+import os
+import json
+from datetime import datetime, timedelta
+
+COMPACT_OUTPUT_ENABLED = os.getenv("COMPACT_OUTPUT_ENABLED", "true").lower() == "true"
+
+# Errors that mean "the model did not follow the compact format"
+COMPACT_FORMAT_ERRORS = (ValueError, TypeError, KeyError, IndexError, AttributeError)
+
+PRIORITIES = {"h": "high", "m": "medium", "l": "low"}
+PRIORITY_CODES = {name: code for code, name in PRIORITIES.items()}
+
+FINAL_DAY_CHECKLIST = [
+    "Revise your notes and key formulas/patterns one last time",
+    "Re-read the job description and map your projects to it",
+    "Keep your resume, ID and any documents ready",
+    "Test your internet, camera and microphone for online rounds",
+    "Prepare 2-3 thoughtful questions for the interviewer",
+    "Sleep early and avoid learning new topics the night before",
+]
+
+CONFIDENCE_TIPS = [
+    "Think aloud so the interviewer can follow your reasoning",
+    "Ask clarifying questions before you start solving",
+    "It is fine to pause and structure your answer before speaking",
+    "Use the STAR format (Situation, Task, Action, Result) for behavioral questions",
+    "Treat mistakes calmly: acknowledge, correct and move on",
+]
+
+ROUND_TIPS = {
+    "technical": "Explain concepts with a small example before going deep.",
+    "coding": "State the brute force first, then optimize and give time/space complexity.",
+    "system-design": "Clarify requirements and scale before drawing components.",
+    "hr": "Keep answers honest and concise, and tie them back to the role.",
+    "behavioral": "Prepare STAR stories with measurable outcomes.",
+    "group-discussion": "Listen first, build on others' points and summarize at the end.",
+    "case-study": "Structure the problem aloud and state your assumptions.",
+    "aptitude": "Skip questions that stall you and come back to them with time left.",
+}
+DEFAULT_TIP = "Stay consistent, take short breaks and review what you covered at the end of the day."
+REVISION_ROUND = "Revision & Mock Interviews"
+
+
+def parse_compact(text: str):
+    """
+    JSON from an LLM reply, tolerating markdown code fences
+    """
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return json.loads(text.strip())
+
+
+def _strings(values) -> list:
+    if values is None:
+        return []
+    if isinstance(values, str):
+        return [values]
+    return [str(v) for v in values]
+
+
+# --------------------------------------------------
+# Interview preparation plan
+# --------------------------------------------------
+def numbered_rounds(rounds: list) -> str:
+    """
+    Rounds listed with the 1-based index the compact format refers to
+    """
+    return "\n".join(
+        f"{i}. {r['roundName']} ({r['roundType']}): {r.get('description') or 'No description'}"
+        for i, r in enumerate(rounds, start=1)
+    )
+
+
+def _round_for(index, rounds: list) -> dict:
+    try:
+        index = int(index)
+    except (TypeError, ValueError):
+        index = 0
+    if 1 <= index <= len(rounds):
+        return rounds[index - 1]
+    return {"roundName": REVISION_ROUND, "roundType": "other"}
+
+
+def _hours(value) -> str:
+    if isinstance(value, (int, float)):
+        return f"{value:g} hour" + ("" if value == 1 else "s")
+    return str(value)
+
+
+def expand_prep_plan(compact: dict, rounds: list, interview_date: str, days_until: int, today: datetime = None) -> dict:
+    """
+    {"s": strategy, "d": [[round, focus, topics, tasks, resources, goals], ...],
+     "k": research areas, "q": questions to ask} -> preparationPlan
+    where each task is [description, hours, "h"|"m"|"l"]
+    """
+    today = today or datetime.now()
+    daily_plan = []
+    for i, day in enumerate(compact["d"]):
+        round_info = _round_for(day[0], rounds)
+        if not isinstance(day[3], list):
+            raise TypeError(f"Day {i + 1} tasks must be a list of task arrays")
+        tasks = []
+        for task in day[3]:
+            if isinstance(task, str):
+                task = [task, 1, "m"]
+            elif not isinstance(task, list) or not task:
+                raise TypeError(f"Day {i + 1} has a malformed task: {task!r}")
+            tasks.append({
+                "task": str(task[0]),
+                "timeAllocation": _hours(task[1] if len(task) > 1 else 1),
+                "priority": PRIORITIES.get(str(task[2]).lower()[:1], "medium") if len(task) > 2 else "medium",
+            })
+        daily_plan.append({
+            "day": i + 1,
+            "date": (today + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "focusRound": round_info["roundName"],
+            "focusArea": str(day[1]),
+            "topics": _strings(day[2]),
+            "tasks": tasks,
+            "resources": _strings(day[4]) if len(day) > 4 else [],
+            "goals": _strings(day[5]) if len(day) > 5 else [],
+            "tips": ROUND_TIPS.get(str(round_info["roundType"]).lower(), DEFAULT_TIP),
+        })
+    if not daily_plan:
+        raise ValueError("Compact plan has no days")
+
+    return {
+        "totalDays": max(days_until, len(daily_plan)),
+        "interviewDate": interview_date,
+        "overallStrategy": str(compact.get("s", "")),
+        "dailyPlan": daily_plan,
+        "finalDayChecklist": list(FINAL_DAY_CHECKLIST),
+        "confidenceTips": list(CONFIDENCE_TIPS),
+        "companyResearch": {
+            "keyAreas": _strings(compact.get("k")),
+            "questionsToAsk": _strings(compact.get("q")),
+        },
+    }
+
+
+def compact_prep_plan(plan: dict, rounds: list) -> dict:
+    """
+    Inverse of expand_prep_plan (used to measure the compact format)
+    """
+    names = {r["roundName"]: i for i, r in enumerate(rounds, start=1)}
+    days = []
+    for day in plan["dailyPlan"]:
+        tasks = [
+            [t["task"], float(str(t["timeAllocation"]).split()[0]), PRIORITY_CODES.get(t["priority"], "m")]
+            for t in day["tasks"]
+        ]
+        days.append([names.get(day["focusRound"], 0), day["focusArea"], day["topics"], tasks,
+                     day["resources"], day["goals"]])
+    research = plan.get("companyResearch", {})
+    return {"s": plan["overallStrategy"], "d": days,
+            "k": research.get("keyAreas", []), "q": research.get("questionsToAsk", [])}
+
+
+# --------------------------------------------------
+# Roadmap
+# --------------------------------------------------
+def expand_roadmap(compact: dict) -> dict:
+    """
+    {"w": [[focus, topics, tasks], ...]} -> {"weeks": [...]}
+    """
+    weeks = [
+        {"weekNumber": n, "focus": str(week[0]), "topics": _strings(week[1]), "tasks": _strings(week[2])}
+        for n, week in enumerate(compact["w"], start=1)
+    ]
+    if not weeks:
+        raise ValueError("Compact roadmap has no weeks")
+    return {"weeks": weeks}
+
+
+def compact_roadmap(roadmap: dict) -> dict:
+    return {"w": [[w["focus"], w["topics"], w["tasks"]] for w in roadmap["weeks"]]}
+
+
+# --------------------------------------------------
+# Resume / JD comparison
+# --------------------------------------------------
+COMPARE_KEYS = {
+    "a": "atsScore",
+    "m": "matchScore",
+    "s": "strengths",
+    "w": "weaknesses",
+    "x": "missingSkills",
+    "p": "projectSuggestions",
+    "l": "learningSuggestions",
+}
+
+
+def _score(value) -> int:
+    return max(0, min(100, int(round(float(value)))))
+
+
+def expand_compare(compact: dict) -> dict:
+    """
+    {"a", "m", "s", "w", "x", "p", "l"} -> CompareResponse fields
+    """
+    if "a" not in compact or "m" not in compact:
+        raise KeyError("Compact comparison is missing scores")
+    result = {}
+    for key, field in COMPARE_KEYS.items():
+        result[field] = _score(compact[key]) if key in ("a", "m") else _strings(compact.get(key))
+    return result
+
+
+def compact_compare(result: dict) -> dict:
+    return {key: result[field] for key, field in COMPARE_KEYS.items()}
@@ -0,0 +1,176 @@
+"""
+Diagnostics Service - Event-loop lag monitor, stall detector and sampling profiler
+Tells apart a slow upstream LLM (loop idle, requests waiting) from blocking
+code on the event loop (loop lag, stalls with a stack) and CPU spent in
+serialization (visible in a profile). Cheap enough to leave on: one timer
+on the loop and one watchdog thread waking every few hundred milliseconds.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque, Counter
+
+logger = logging.getLogger(__name__)
+
+DIAG_ENABLED = os.getenv("DIAG_ENABLED", "true").lower() == "true"
+LAG_INTERVAL = float(os.getenv("DIAG_LAG_INTERVAL_MS", 100)) / 1000
+STALL_THRESHOLD = float(os.getenv("DIAG_STALL_THRESHOLD_MS", 300)) / 1000
+PROFILE_MAX_SECONDS = float(os.getenv("DIAG_PROFILE_MAX_SECONDS", 30))
+
+LAG_WINDOW = 600  # samples (one minute at the default interval)
+MAX_STALLS = 20
+STALL_STACK_DEPTH = 20  # innermost frames kept per stall
+
+
+class ProfilerBusyError(Exception):
+    """
+    Raised when a profile is requested while another one is running
+    """
+
+
+# --------------------------------------------------
+# Loop lag + stall watchdog
+# --------------------------------------------------
+class LoopMonitor:
+    def __init__(self, interval: float = LAG_INTERVAL, stall_threshold: float = STALL_THRESHOLD):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._lags = deque(maxlen=LAG_WINDOW)
+        self._stalls = deque(maxlen=MAX_STALLS)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+        self.max_lag = 0.0
+        self.stall_count = 0
+
+    async def _measure(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._heartbeat = time.monotonic()
+
+    def _watch(self):
+        """
+        Runs off-loop: if the loop has not ticked for stall_threshold, grab
+        the loop thread's current stack - that is the blocking callback
+        """
+        reported = None
+        while not self._stop.wait(self.stall_threshold / 2):
+            behind = time.monotonic() - self._heartbeat - self.interval
+            if behind < self.stall_threshold:
+                reported = None
+                continue
+            if reported == self._heartbeat:
+                continue
+            reported = self._heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame, limit=STALL_STACK_DEPTH)) if frame is not None else "<loop thread not found>"
+            self.stall_count += 1
+            self._stalls.append({"at": time.time(), "blockedMs": round(behind * 1000, 1), "stack": stack})
+            logger.warning(f"Event loop blocked for {behind * 1000:.0f}ms+ in:\n{stack}")
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        lags = sorted(self._lags)
+        if not lags:
+            return {"running": self._task is not None, "samples": 0}
+
+        def pct(p):
+            return round(lags[min(len(lags) - 1, int(len(lags) * p))] * 1000, 2)
+
+        return {
+            "running": self._task is not None,
+            "samples": len(lags),
+            "lagMs": {"p50": pct(0.5), "p99": pct(0.99), "max": round(lags[-1] * 1000, 2)},
+            "maxLagSinceStartMs": round(self.max_lag * 1000, 2),
+            "stallThresholdMs": round(self.stall_threshold * 1000, 1),
+            "stalls": self.stall_count,
+            "recentStalls": list(self._stalls),
+        }
+
+
+loop_monitor = LoopMonitor()
+
+
+# --------------------------------------------------
+# Sampling profiler (collapsed stacks for flamegraph.pl / speedscope)
+# --------------------------------------------------
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def sample_profile(seconds: float, interval: float = 0.005, loop_only: bool = False) -> dict:
+    """
+    Sample every thread's stack (or only the event loop's) for `seconds`.
+    Blocking: run it in a worker thread.
+    """
+    seconds = max(0.1, min(seconds, PROFILE_MAX_SECONDS))
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        own = threading.get_ident()
+        loop_thread = loop_monitor._loop_thread_id
+        stacks = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (loop_only and thread_id != loop_thread):
+                    continue
+                name = "event-loop" if thread_id == loop_thread else names.get(thread_id, f"thread-{thread_id}")
+                stacks[_collapse(frame, name)] += 1
+            samples += 1
+            time.sleep(interval)
+        collapsed = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        return {"seconds": seconds, "samples": samples, "collapsed": collapsed}
+    finally:
+        _profile_lock.release()
+
+
+def start():
+    if DIAG_ENABLED:
+        loop_monitor.start()
+
+
+def stop():
+    loop_monitor.stop()
@@ -0,0 +1,86 @@
+"""
+Full Analysis Service - Resume analysis and JD comparison in one request
+The resume is normalized once and both LLM calls run concurrently, so the
+most common user action costs one round trip instead of two sequential ones
+"""
+
+import time
+import asyncio
+import logging
+
+from services.resume_analyzer import normalize_resume_text, run_resume_analysis
+from services.jd_matcher import run_resume_jd_comparison
+
+logger = logging.getLogger(__name__)
+
+PARTS = ("analysis", "comparison")
+
+
+def _start_parts(resume_text: str, jd_text: str, target_role: str) -> dict:
+    """
+    Launch both blocking LLM calls on worker threads; returns part -> task
+    """
+    resume = normalize_resume_text(resume_text)
+    return {
+        "analysis": asyncio.ensure_future(asyncio.to_thread(run_resume_analysis, resume)),
+        "comparison": asyncio.ensure_future(
+            asyncio.to_thread(run_resume_jd_comparison, resume, jd_text, target_role)
+        ),
+    }
+
+
+async def _cancel(tasks: dict):
+    """
+    Stop waiting for the given parts. A worker thread cannot be interrupted:
+    an LLM call already in flight runs to completion (and is billed), its
+    result is simply discarded
+    """
+    for task in tasks.values():
+        task.cancel()
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+async def run_full_analysis(resume_text: str, jd_text: str, target_role: str) -> dict:
+    """
+    Resume analysis fields and comparison fields merged into one dict
+    """
+    started = time.perf_counter()
+    tasks = _start_parts(resume_text, jd_text, target_role)
+    try:
+        analysis, comparison = await asyncio.gather(tasks["analysis"], tasks["comparison"])
+    except Exception as e:
+        logger.error(f"Error in run_full_analysis: {e}")
+        await _cancel(tasks)
+        raise
+    logger.info(f"Full analysis finished in {time.perf_counter() - started:.2f}s")
+    return {**analysis, **comparison}
+
+
+async def stream_full_analysis(resume_text: str, jd_text: str, target_role: str):
+    """
+    Yield {"part", "data"} (or {"part", "error"}) as each half completes,
+    then a final {"part": "done"} event
+    """
+    started = time.perf_counter()
+    tasks = _start_parts(resume_text, jd_text, target_role)
+    names = {task: part for part, task in tasks.items()}
+    pending = set(tasks.values())
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                part = names[task]
+                event = {"part": part, "seconds": round(time.perf_counter() - started, 3)}
+                if task.exception() is not None:
+                    logger.error(f"Full analysis part '{part}' failed: {task.exception()}")
+                    event["error"] = str(task.exception())
+                    event["errorType"] = type(task.exception()).__name__
+                else:
+                    event["data"] = task.result()
+                yield event
+    finally:
+        # Client disconnected mid-stream: stop waiting for the other part
+        # (its thread finishes in the background, see _cancel)
+        if pending:
+            await _cancel({task: task for task in pending})
+    yield {"part": "done", "seconds": round(time.perf_counter() - started, 3)}
@@ -0,0 +1,157 @@
+"""
+HTTP Responses Service - Fast JSON rendering and response compression
+orjson renders large AI payloads (48-week roadmaps, day-by-day prep plans)
+several times faster than the stdlib encoder, and compressing them cuts the
+bytes sent to the backend by roughly an order of magnitude
+"""
+
+import os
+import gzip
+import json
+import logging
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 5))
+
+# Streams must reach the client event by event, never buffered for compression
+UNCOMPRESSED_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+# --------------------------------------------------
+# JSON rendering
+# --------------------------------------------------
+if orjson is not None:
+    class FastJSONResponse(JSONResponse):
+        """
+        JSONResponse rendered with orjson
+        """
+
+        def render(self, content) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+else:
+    FastJSONResponse = JSONResponse
+    logger.warning("orjson not installed; falling back to the standard JSON encoder")
+
+
+def dumps(content) -> str:
+    """
+    Compact JSON text with the same encoder the responses use
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+
+
+def fast_response(content, status_code: int = 200) -> FastJSONResponse:
+    """
+    Return service output as-is. Use only for output the service layer has
+    already shaped; it bypasses FastAPI's response_model validation and
+    jsonable_encoder pass, which dominate the cost of large payloads.
+    """
+    return FastJSONResponse(content=content, status_code=status_code)
+
+
+# --------------------------------------------------
+# Compression
+# --------------------------------------------------
+def choose_encoding(accept_encoding: str):
+    """
+    Preferred content coding from an Accept-Encoding header: br, then gzip
+    """
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            offered[name.strip()] = q
+    wildcard = offered.get("*", 0.0)
+    if brotli is not None and offered.get("br", wildcard) > 0:
+        return "br"
+    if offered.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete (non-streaming) responses above
+    `minimum_size` with brotli when available and accepted, gzip otherwise.
+    Streaming responses pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or content_type.startswith(UNCOMPRESSED_TYPES):
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streamed body: send the held start message and stream as-is
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -3,14 +3,23 @@ Interview Preparation Planner Service - Generate time-bound preparation plans
 Using Groq LLM
 """
 
-import os
 import json
+import asyncio
+import logging
 from datetime import datetime, timedelta
-from langchain.globals import set_verbose
 from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
 
-set_verbose(False)
+from services.llm_clients import get_groq_llm
+from services.compact_output import (
+    COMPACT_OUTPUT_ENABLED,
+    COMPACT_FORMAT_ERRORS,
+    expand_prep_plan,
+    numbered_rounds,
+    parse_compact
+)
+from services.text_compression import compress_text
+
+logger = logging.getLogger(__name__)
 
 
 # --------------------------------------------------
@@ -20,67 +29,23 @@ def get_llm():
     """
     Get Groq LLM instance
     """
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
-
-    return ChatGroq(
-        model="llama-3.1-8b-instant",
-        groq_api_key=api_key,
-        temperature=0.5
-    )
+    return get_groq_llm(temperature=0.5)
 
 
 # --------------------------------------------------
-# Generate Interview Preparation Plan
+# Prompt (literal JSON braces are escaped for PromptTemplate)
 # --------------------------------------------------
-async def generate_interview_prep_plan(
-    company: str,
-    position: str,
-    interview_date: str,
-    rounds: list,
-    user_skills: list = None,
-    additional_notes: str = None
-) -> dict:
-    """
-    Generate a time-bound interview preparation plan
-    """
-    llm = get_llm()
-
-    # Calculate days until interview
-    interview_dt = datetime.fromisoformat(interview_date.replace("Z", "+00:00"))
-    today = datetime.now()
-    days_until_interview = max(
-        (interview_dt.date() - today.date()).days, 0
-    )
-
-    # Format rounds information
-    rounds_info = "\n".join([
-        f"- {round['roundName']} ({round['roundType']}): {round.get('description', 'No description')}"
-        for round in rounds
-    ])
-
-    skills_context = (
-        f"User's current skills: {', '.join(user_skills)}"
-        if user_skills else "User skills not provided"
-    )
-
-    notes_context = (
-        f"Additional context: {additional_notes}"
-        if additional_notes else ""
-    )
-
-    prompt_template = PromptTemplate(
-        input_variables=[
-            "company",
-            "position",
-            "interview_date",
-            "days_until",
-            "rounds_info",
-            "skills_context",
-            "notes_context"
-        ],
-        template="""
+PREP_PLAN_PROMPT = PromptTemplate(
+    input_variables=[
+        "company",
+        "position",
+        "interview_date",
+        "days_until",
+        "rounds_info",
+        "skills_context",
+        "notes_context"
+    ],
+    template="""
 You are an expert interview preparation coach. Generate a comprehensive, day-by-day preparation plan for an upcoming interview.
 
 Interview Details:
@@ -115,42 +80,155 @@ For each day, provide:
 - Goals for the day
 
 Return the response in this exact JSON format:
-{
+{{
   "totalDays": <number>,
   "interviewDate": "{interview_date}",
   "overallStrategy": "<brief strategy overview>",
   "dailyPlan": [
-    {
+    {{
       "day": 1,
       "date": "<date>",
       "focusRound": "<round name>",
       "focusArea": "<main focus>",
       "topics": ["topic1", "topic2"],
       "tasks": [
-        {
+        {{
           "task": "<task description>",
           "timeAllocation": "<time in hours>",
           "priority": "high|medium|low"
-        }
+        }}
       ],
       "resources": ["resource1", "resource2"],
       "goals": ["goal1", "goal2"],
       "tips": "<daily tip>"
-    }
+    }}
   ],
   "finalDayChecklist": ["item1", "item2"],
   "confidenceTips": ["tip1", "tip2"],
-  "companyResearch": {
+  "companyResearch": {{
     "keyAreas": ["area1", "area2"],
     "questionsToAsk": ["question1", "question2"]
-  }
-}
+  }}
+}}
 
 Ensure the JSON is valid and properly formatted.
 """
+)
+
+
+# --------------------------------------------------
+# Compact prompt: positional days, checklists and tips filled locally
+# --------------------------------------------------
+PREP_PLAN_COMPACT_PROMPT = PromptTemplate(
+    input_variables=[
+        "company",
+        "position",
+        "interview_date",
+        "days_until",
+        "rounds_info",
+        "skills_context",
+        "notes_context"
+    ],
+    template="""
+You are an expert interview preparation coach. Generate a day-by-day preparation plan for an upcoming interview.
+
+Interview Details:
+- Company: {company}
+- Position: {position}
+- Interview Date: {interview_date}
+- Days Until Interview: {days_until}
+
+Interview Rounds (numbered):
+{rounds_info}
+
+{skills_context}
+{notes_context}
+
+The plan must be realistic, cover every round, prioritize by round type and difficulty, include mock interviews, leave buffer time for revision, and include company-specific research.
+
+Return ONLY compact JSON (no markdown, no extra keys):
+{{"s":"<brief overall strategy>","d":[[<round number, 0 = revision/mock>,"<focus area>",["topic",...],[["<task>",<hours>,"h|m|l"],...],["resource",...],["goal",...]],...],"k":["<company research area>",...],"q":["<question to ask the interviewer>",...]}}
+
+"d" has one array per day, in order, one day per day until the interview.
+"""
+)
+
+
+# --------------------------------------------------
+# Generate Interview Preparation Plan
+# --------------------------------------------------
+async def generate_interview_prep_plan(
+    company: str,
+    position: str,
+    interview_date: str,
+    rounds: list,
+    user_skills: list = None,
+    additional_notes: str = None
+) -> dict:
+    """
+    Generate a time-bound interview preparation plan
+    """
+    # The LLM calls block; keep them off the event loop
+    return await asyncio.to_thread(
+        build_interview_prep_plan, company, position, interview_date, rounds, user_skills, additional_notes
+    )
+
+
+def build_interview_prep_plan(
+    company: str,
+    position: str,
+    interview_date: str,
+    rounds: list,
+    user_skills: list = None,
+    additional_notes: str = None
+) -> dict:
+    """
+    Blocking body of generate_interview_prep_plan
+    """
+    llm = get_llm()
+
+    # Calculate days until interview
+    interview_dt = datetime.fromisoformat(interview_date.replace("Z", "+00:00"))
+    today = datetime.now()
+    days_until_interview = max(
+        (interview_dt.date() - today.date()).days, 0
     )
 
-    formatted_prompt = prompt_template.format(
+    # Format rounds information
+    rounds_info = "\n".join([
+        f"- {round['roundName']} ({round['roundType']}): {round.get('description', 'No description')}"
+        for round in rounds
+    ])
+
+    skills_context = (
+        f"User's current skills: {', '.join(user_skills)}"
+        if user_skills else "User skills not provided"
+    )
+
+    notes_context = (
+        f"Additional context: {compress_text(additional_notes, 'notes')}"
+        if additional_notes else ""
+    )
+
+    if COMPACT_OUTPUT_ENABLED:
+        compact_prompt = PREP_PLAN_COMPACT_PROMPT.format(
+            company=company,
+            position=position,
+            interview_date=interview_date,
+            days_until=days_until_interview,
+            rounds_info=numbered_rounds(rounds),
+            skills_context=skills_context,
+            notes_context=notes_context
+        )
+        response = llm.invoke(compact_prompt)
+        try:
+            return expand_prep_plan(
+                parse_compact(response.content), rounds, interview_date, days_until_interview, today
+            )
+        except COMPACT_FORMAT_ERRORS as e:
+            logger.warning(f"Compact prep plan unusable, retrying with the full format: {e}")
+
+    formatted_prompt = PREP_PLAN_PROMPT.format(
         company=company,
         position=position,
         interview_date=interview_date,
@@ -1,33 +1,25 @@
-import os
 import json
+import asyncio
 import logging
-from langchain.globals import set_verbose
-from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
 
-set_verbose(False)
+from services.llm_clients import get_groq_llm, GROQ_DEFAULT_MODEL
+from services.prompt_store import get_prompt
+from services.jd_parser import parse_job_description
+from services.text_compression import compress_text
+from services.resume_analyzer import normalize_resume_text
+from services.compact_output import COMPACT_OUTPUT_ENABLED, COMPACT_FORMAT_ERRORS, expand_compare, parse_compact
 
 logger = logging.getLogger(__name__)
 
 
 def get_llm():
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
+    logger.info(f"Using Groq LLM ({GROQ_DEFAULT_MODEL})")
 
-    logger.info("Using Groq LLM (llama-3.1-8b-instant)")
+    return get_groq_llm(temperature=0.5)
 
-    return ChatGroq(
-        model="llama-3.1-8b-instant",
-        groq_api_key=api_key,
-        temperature=0.5
-    )
 
-
-def load_prompt_template(filename):
-    prompt_path = os.path.join("prompts", filename)
-    with open(prompt_path, "r", encoding="utf-8") as f:
-        return f.read()
+def _join(items, separator=", "):
+    return separator.join(items) if items else "None specified"
 
 
 def parse_json_response(response_text):
@@ -55,40 +47,70 @@ def parse_json_response(response_text):
         )
 
 
-async def compare_resume_jd(resume_text: str, jd_text: str, target_role: str):
+def run_resume_jd_comparison(resume_text: str, jd_text: str, target_role: str) -> dict:
     """
-    Compare resume with job description and provide structured analysis
+    Blocking comparison of already-normalized resume text against a JD.
+    The JD is parsed once (cached by content hash) and only its extracted
+    requirements go into the comparison prompt.
     """
+    llm = get_llm()
+
     try:
-        llm = get_llm()
-        prompt_template_str = load_prompt_template("jd_prompt.txt")
+        requirements = parse_job_description(jd_text)
+    except Exception as e:
+        logger.warning(f"JD requirement extraction failed, using full JD prompt: {e}")
+        requirements = None
 
-        prompt = PromptTemplate(
-            input_variables=["resume_text", "jd_text", "target_role"],
-            template=prompt_template_str
+    if requirements:
+        prompt_args = dict(
+            resume_text=resume_text,
+            target_role=target_role,
+            required_skills=_join(requirements["requiredSkills"]),
+            preferred_skills=_join(requirements["preferredSkills"]),
+            experience_level=requirements["experienceLevel"],
+            role_keywords=_join(requirements["roleKeywords"]),
+            responsibilities=_join(requirements["responsibilities"], "; ")
         )
-
-        formatted_prompt = prompt.format(
+        if COMPACT_OUTPUT_ENABLED:
+            response = llm.invoke(get_prompt("jd_compare_compact_prompt.txt").format(**prompt_args))
+            try:
+                return expand_compare(parse_compact(response.content))
+            except COMPACT_FORMAT_ERRORS as e:
+                logger.warning(f"Compact comparison unusable, retrying with the full format: {e}")
+        formatted_prompt = get_prompt("jd_compare_prompt.txt").format(**prompt_args)
+    else:
+        formatted_prompt = get_prompt("jd_prompt.txt").format(
             resume_text=resume_text,
-            jd_text=jd_text,
+            jd_text=compress_text(jd_text, "jd"),
             target_role=target_role
         )
 
-        response = llm.invoke(formatted_prompt)
+    response = llm.invoke(formatted_prompt)
+
+    response_text = response.content
 
-        response_text = response.content
+    result = parse_json_response(response_text)
 
-        result = parse_json_response(response_text)
+    return {
+        "atsScore": result.get("atsScore", 0),
+        "matchScore": result.get("matchScore", 0),
+        "strengths": result.get("strengths", []),
+        "weaknesses": result.get("weaknesses", []),
+        "missingSkills": result.get("missingSkills", []),
+        "projectSuggestions": result.get("projectSuggestions", []),
+        "learningSuggestions": result.get("learningSuggestions", [])
+    }
 
-        return {
-            "atsScore": result.get("atsScore", 0),
-            "matchScore": result.get("matchScore", 0),
-            "strengths": result.get("strengths", []),
-            "weaknesses": result.get("weaknesses", []),
-            "missingSkills": result.get("missingSkills", []),
-            "projectSuggestions": result.get("projectSuggestions", []),
-            "learningSuggestions": result.get("learningSuggestions", [])
-        }
+
+async def compare_resume_jd(resume_text: str, jd_text: str, target_role: str):
+    """
+    Compare resume with job description and provide structured analysis.
+    """
+    try:
+        # The LLM call blocks; keep it off the event loop
+        return await asyncio.to_thread(
+            run_resume_jd_comparison, normalize_resume_text(resume_text), jd_text, target_role
+        )
 
     except Exception as e:
         logger.error(f"Error in compare_resume_jd: {e}")
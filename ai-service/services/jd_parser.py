@@ -0,0 +1,130 @@
+"""
+JD Parser Service - Parse a job description once, reuse it for every applicant
+Boilerplate is stripped, requirements are extracted by the LLM and cached by
+content hash so repeated comparisons against the same drive skip re-reading
+the full JD
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from services.llm_clients import get_groq_llm
+from services.prompt_store import get_prompt
+from services.text_compression import compress_text
+
+logger = logging.getLogger(__name__)
+
+REQUIREMENT_FIELDS = ("requiredSkills", "preferredSkills", "roleKeywords", "responsibilities")
+
+
+# --------------------------------------------------
+# Content hash
+# --------------------------------------------------
+def jd_content_hash(jd_text: str) -> str:
+    normalized = " ".join(jd_text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# --------------------------------------------------
+# LRU cache of parsed requirements
+# --------------------------------------------------
+class ParsedJDCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_parse(self, key: str, parse):
+        """
+        Return the cached value for `key`, computing it with `parse()` on a
+        miss. Concurrent misses for the same JD wait for a single parse.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._inflight[key] = event
+                self.misses += 1
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    return self._entries[key]
+            return self.get_or_parse(key, parse)
+
+        try:
+            value = parse()
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+jd_cache = ParsedJDCache(int(os.getenv("JD_CACHE_SIZE", 256)))
+
+
+# --------------------------------------------------
+# Requirement extraction
+# --------------------------------------------------
+def get_llm():
+    # Low temperature: extraction should be stable across cache rebuilds
+    return get_groq_llm(temperature=0.2)
+
+
+def _parse_json(text: str) -> dict:
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return json.loads(text.strip())
+
+
+def _extract_requirements(clean_jd: str) -> dict:
+    formatted_prompt = get_prompt("jd_parse_prompt.txt").format(jd_text=clean_jd)
+    response = get_llm().invoke(formatted_prompt)
+    result = _parse_json(response.content)
+
+    parsed = {}
+    for field in REQUIREMENT_FIELDS:
+        values = result.get(field) or []
+        if isinstance(values, str):
+            values = values.split(",")
+        parsed[field] = [str(v).strip() for v in values if str(v).strip()]
+    parsed["experienceLevel"] = str(result.get("experienceLevel", "")).strip() or "Not specified"
+    return parsed
+
+
+def parse_job_description(jd_text: str) -> dict:
+    """
+    Requirements for a JD, extracted once per distinct JD content
+    """
+    clean_jd = compress_text(jd_text, "jd")
+    key = jd_content_hash(clean_jd)
+    parsed = jd_cache.get_or_parse(key, lambda: _extract_requirements(clean_jd))
+    return dict(parsed, contentHash=key)
@@ -0,0 +1,323 @@
+"""
+Job Index Service - In-process vector index over job profiles
+Each JD becomes a hashed TF-IDF vector over its text and normalized skills.
+Rows live in one NumPy matrix, so "top N jobs for this resume" is a single
+batched cosine over every job with no LLM call.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import zlib
+import logging
+import threading
+
+import numpy as np
+
+from services.text_compression import strip_jd_boilerplate
+from services.skill_normalizer import extract_skills, normalize_skills
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_DIM = 1024
+
+# Skills and title words count more than body text when ranking
+SKILL_WEIGHT = 3.0
+TITLE_WEIGHT = 2.0
+
+# IDF and row norms are refreshed once this share of rows changed
+IDF_REFRESH_RATIO = 0.02
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to we will with you your "
+    "who what which their they them us can may must should would about into across within etc per".split()
+)
+
+
+# --------------------------------------------------
+# Vectorization
+# --------------------------------------------------
+def _tokens(text: str) -> list:
+    words = [w for w in TOKEN_PATTERN.findall(text.lower()) if w not in STOPWORDS and len(w) > 1]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _hash(feature: str, dim: int):
+    h = zlib.crc32(feature.encode("utf-8"))
+    # Signed hashing keeps colliding features from only ever adding up
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+def vectorize(text: str, skills: list, dim: int, title: str = "") -> np.ndarray:
+    """
+    Sublinear term-frequency vector (IDF is applied at query time)
+    """
+    counts = {}
+    for weight, features in (
+        (1.0, _tokens(text)),
+        (TITLE_WEIGHT, _tokens(title)),
+        (SKILL_WEIGHT, [f"skill:{s}" for s in skills]),
+    ):
+        for feature in features:
+            counts[feature] = counts.get(feature, 0.0) + weight
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, count in counts.items():
+        bucket, sign = _hash(feature, dim)
+        vector[bucket] += sign * (1.0 + math.log(count))
+    return vector
+
+
+# --------------------------------------------------
+# Index
+# --------------------------------------------------
+class JobIndex:
+    """
+    Growable float32 matrix of job vectors plus per-row metadata.
+    Removal swaps the last row into the hole, so add/remove are O(dim).
+    The matrix is column-major: a query only reads the columns its own
+    (sparse) vector touches. Persisted as vectors.npy + df.npy + meta.json
+    and memory-mapped on load.
+    """
+
+    def __init__(self, index_dir: str = None, dim: int = DEFAULT_DIM):
+        self.index_dir = index_dir
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._matrix = np.zeros((0, dim), dtype=np.float32, order="F")
+        self._writable = True
+        self._df = np.zeros(dim, dtype=np.int64)
+        self._items = []
+        self._rows = {}
+        self._owners = np.zeros(0, dtype=np.int32)
+        self._owner_codes = {}
+        self._idf = np.ones(dim, dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._changes_since_refresh = 0
+        self._dirty = False
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._items)
+
+    # ---------- persistence ----------
+    def _paths(self):
+        return (
+            os.path.join(self.index_dir, "vectors.npy"),
+            os.path.join(self.index_dir, "df.npy"),
+            os.path.join(self.index_dir, "meta.json"),
+        )
+
+    def load(self) -> dict:
+        """
+        Memory-map a persisted index; rows are paged in on first query
+        """
+        with self._lock:
+            if self.loaded or not self.index_dir:
+                self.loaded = True
+                return self.stats()
+            vectors_path, df_path, meta_path = self._paths()
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if meta.get("version") != INDEX_VERSION or meta.get("dim") != self.dim:
+                    logger.warning("Job index on disk has a different version/dim; starting empty")
+                else:
+                    self._matrix = np.load(vectors_path, mmap_mode="r")
+                    self._writable = False
+                    self._df = np.load(df_path)
+                    self._items = meta["items"]
+                    self._rows = {item["id"]: row for row, item in enumerate(self._items)}
+                    self._owner_codes = {}
+                    self._owners = np.array(
+                        [self._owner_code(item.get("owner")) for item in self._items], dtype=np.int32
+                    )
+                    self._refresh()
+            self.loaded = True
+            return self.stats()
+
+    def save(self) -> bool:
+        """
+        Atomically write the index if it changed since the last save
+        """
+        with self._lock:
+            if not self.index_dir or not self._dirty:
+                return False
+            os.makedirs(self.index_dir, exist_ok=True)
+            vectors_path, df_path, meta_path = self._paths()
+            n = len(self._items)
+            for path, writer in (
+                (vectors_path, lambda f: np.save(f, np.asfortranarray(self._matrix[:n]))),
+                (df_path, lambda f: np.save(f, self._df)),
+                (meta_path, lambda f: f.write(json.dumps(
+                    {"version": INDEX_VERSION, "dim": self.dim, "items": self._items}
+                ).encode("utf-8"))),
+            ):
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    writer(f)
+                os.replace(tmp_path, path)
+            self._dirty = False
+            logger.info(f"Job index saved ({n} jobs)")
+            return True
+
+    # ---------- mutation ----------
+    def _owner_code(self, owner) -> int:
+        if owner is None:
+            return -1
+        return self._owner_codes.setdefault(str(owner), len(self._owner_codes))
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self._matrix.shape[0]
+        if self._writable and rows <= capacity:
+            return
+        # First write after an mmap load, or out of room: copy into a bigger array
+        new_capacity = max(rows, 64, capacity * 2 if self._writable else capacity + capacity // 2)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32, order="F")
+        n = len(self._items)
+        matrix[:n] = self._matrix[:n]
+        self._matrix = matrix
+        self._writable = True
+        norms = np.zeros(new_capacity, dtype=np.float32)
+        norms[:n] = self._norms[:n]
+        self._norms = norms
+        owners = np.full(new_capacity, -1, dtype=np.int32)
+        owners[:n] = self._owners[:n]
+        self._owners = owners
+
+    def _row_norm(self, vector: np.ndarray) -> float:
+        return float(np.sqrt(np.dot(vector * vector, self._idf * self._idf)))
+
+    def upsert(self, job_id: str, title: str, jd_text: str, company: str = "", owner: str = None) -> dict:
+        """
+        Add or replace one job profile
+        """
+        job_id = str(job_id)
+        skills = extract_skills(f"{title}\n{jd_text}")
+        vector = vectorize(strip_jd_boilerplate(jd_text), skills, self.dim, title=title)
+        item = {"id": job_id, "title": title, "company": company, "owner": owner, "skills": skills}
+
+        with self._lock:
+            if job_id in self._rows:
+                self._remove_locked(job_id)
+            row = len(self._items)
+            self._ensure_capacity(row + 1)
+            self._matrix[row] = vector
+            self._df += vector != 0
+            self._items.append(item)
+            self._rows[job_id] = row
+            self._owners[row] = self._owner_code(owner)
+            self._norms[row] = self._row_norm(vector)
+            self._mark_changed()
+        return item
+
+    def remove(self, job_id: str) -> bool:
+        with self._lock:
+            if str(job_id) not in self._rows:
+                return False
+            self._ensure_capacity(len(self._items))
+            self._remove_locked(str(job_id))
+            self._mark_changed()
+            return True
+
+    def _remove_locked(self, job_id: str):
+        row = self._rows.pop(job_id)
+        last = len(self._items) - 1
+        self._df -= self._matrix[row] != 0
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._norms[row] = self._norms[last]
+            self._owners[row] = self._owners[last]
+            self._items[row] = self._items[last]
+            self._rows[self._items[row]["id"]] = row
+        self._matrix[last] = 0
+        self._items.pop()
+
+    def _mark_changed(self):
+        self._dirty = True
+        self._changes_since_refresh += 1
+        if self._changes_since_refresh >= max(16, IDF_REFRESH_RATIO * len(self._items)):
+            self._refresh()
+
+    def _refresh(self):
+        """
+        Recompute IDF from document frequencies and every row norm under it
+        """
+        n = len(self._items)
+        self._idf = (np.log((1.0 + n) / (1.0 + self._df)) + 1.0).astype(np.float32)
+        idf2 = self._idf * self._idf
+        norms = np.empty(n, dtype=np.float32)
+        for start in range(0, n, 4096):
+            chunk = np.asarray(self._matrix[start:min(start + 4096, n)])
+            norms[start:start + len(chunk)] = np.sqrt((chunk * chunk) @ idf2)
+        if self._writable:
+            self._norms[:n] = norms
+        else:
+            self._norms = norms
+        self._changes_since_refresh = 0
+
+    # ---------- query ----------
+    def query(self, text: str, skills: list = None, top_n: int = 10, owner: str = None, min_score: float = 0.0) -> dict:
+        """
+        Top-N jobs by cosine similarity to a resume (text + known skills)
+        """
+        started = time.perf_counter()
+        query_skills = normalize_skills(list(skills or []) + extract_skills(text))
+        vector = vectorize(text, query_skills, self.dim)
+
+        with self._lock:
+            n = len(self._items)
+            if n == 0:
+                return {"matches": [], "indexSize": 0, "queryMs": 0.0}
+            weighted = vector * self._idf * self._idf
+            query_norm = self._row_norm(vector) or 1.0
+            columns = np.flatnonzero(weighted)
+            if len(columns) < self.dim // 2:
+                scores = self._matrix[:n, columns] @ weighted[columns]
+            else:
+                scores = np.asarray(self._matrix[:n]) @ weighted
+            scores /= np.maximum(self._norms[:n], 1e-6) * query_norm
+            if owner is not None:
+                code = self._owner_codes.get(str(owner))
+                if code is None:
+                    return {"matches": [], "indexSize": n, "queryMs": round((time.perf_counter() - started) * 1000, 3)}
+                scores[self._owners[:n] != code] = -np.inf
+
+            k = min(top_n, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            known = set(query_skills)
+            matches = []
+            for row in top:
+                score = float(scores[row])
+                if not np.isfinite(score) or score <= min_score:
+                    continue
+                item = self._items[row]
+                matches.append({
+                    "id": item["id"],
+                    "title": item["title"],
+                    "company": item["company"],
+                    "score": round(score, 4),
+                    "matchedSkills": [s for s in item["skills"] if s in known],
+                    "missingSkills": [s for s in item["skills"] if s not in known],
+                })
+
+        return {"matches": matches, "indexSize": n, "queryMs": round((time.perf_counter() - started) * 1000, 3)}
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._items),
+            "dim": self.dim,
+            "memoryMapped": not self._writable,
+            "unsavedChanges": self._dirty,
+        }
+
+
+job_index = JobIndex(
+    index_dir=os.getenv("JOB_INDEX_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "job_index")),
+    dim=int(os.getenv("JOB_INDEX_DIM", DEFAULT_DIM))
+)
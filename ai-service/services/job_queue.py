@@ -0,0 +1,356 @@
+"""
+Job Queue Service - Async execution of long-running generations
+Backed by a persistent SQLite queue and an in-process worker pool
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+PENDING_STATES = (JOB_QUEUED, JOB_RUNNING)
+TERMINAL_STATES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_pending ON jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs (dedup_key, status);
+"""
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def make_dedup_key(job_type: str, payload: dict) -> str:
+    """
+    Stable hash of a job type and its payload, used to collapse
+    identical pending submissions into a single job
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{job_type}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def _row_to_job(row) -> dict:
+    return {
+        "jobId": row["id"],
+        "jobType": row["job_type"],
+        "status": row["status"],
+        "priority": row["priority"],
+        "attempts": row["attempts"],
+        "createdAt": row["created_at"],
+        "startedAt": row["started_at"],
+        "finishedAt": row["finished_at"],
+        "expiresAt": row["expires_at"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+    }
+
+
+# --------------------------------------------------
+# Job Queue
+# --------------------------------------------------
+class JobQueue:
+    """
+    Persistent priority queue with a bounded worker pool.
+
+    Higher priority values run first. Each job type may declare its own
+    concurrency cap so a burst of roadmap generations cannot starve
+    interview prep plans. Finished jobs are kept for `result_ttl` seconds.
+    """
+
+    def __init__(self, db_path: str, workers: int = 4, result_ttl: int = 3600):
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.result_ttl = result_ttl
+        self.handlers = {}
+        self.caps = {}
+        self.running = {}
+        self._tasks = {}
+        self._subscribers = {}
+        self._wakeup = None
+        self._dispatcher = None
+        self._conn = None
+
+    # ---------- setup ----------
+    def register(self, job_type: str, handler, max_concurrency: int = None):
+        """
+        Register a handler for a job type. Handlers receive the payload dict
+        and may be sync or async; either way they run off the event loop.
+        """
+        self.handlers[job_type] = handler
+        self.caps[job_type] = max_concurrency or self.workers
+        self.running.setdefault(job_type, 0)
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    async def start(self):
+        conn = self._connect()
+        # Jobs that were running when the process died go back to the queue
+        with conn:
+            recovered = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (JOB_QUEUED, JOB_RUNNING)
+            ).rowcount
+        if recovered:
+            logger.info(f"Re-queued {recovered} interrupted job(s)")
+
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        logger.info(f"Job queue started with {self.workers} worker(s) at {self.db_path}")
+
+    async def stop(self):
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    # ---------- public API ----------
+    def submit(self, job_type: str, payload: dict, priority: int = 5) -> dict:
+        """
+        Enqueue a job. If an identical job is already pending, that job is
+        returned instead with `deduplicated` set.
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        conn = self._connect()
+        dedup_key = make_dedup_key(job_type, payload)
+
+        existing = conn.execute(
+            f"SELECT * FROM jobs WHERE dedup_key = ? AND status IN ({','.join('?' * len(PENDING_STATES))}) "
+            "ORDER BY created_at LIMIT 1",
+            (dedup_key, *PENDING_STATES)
+        ).fetchone()
+        if existing:
+            # Bump priority so the shared job honours the most urgent caller
+            if priority > existing["priority"] and existing["status"] == JOB_QUEUED:
+                with conn:
+                    conn.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, existing["id"]))
+            job = self.get(existing["id"])
+            job["deduplicated"] = True
+            return job
+
+        job_id = uuid.uuid4().hex
+        with conn:
+            conn.execute(
+                "INSERT INTO jobs (id, job_type, payload, dedup_key, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, json.dumps(payload), dedup_key, priority, JOB_QUEUED, time.time())
+            )
+
+        if self._wakeup:
+            self._wakeup.set()
+
+        job = self.get(job_id)
+        job["deduplicated"] = False
+        return job
+
+    def get(self, job_id: str):
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        if row["expires_at"] and row["expires_at"] < time.time():
+            return None
+
+        job = _row_to_job(row)
+        if row["status"] == JOB_QUEUED:
+            job["queuePosition"] = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND (priority > ? OR (priority = ? AND created_at < ?))",
+                (JOB_QUEUED, row["priority"], row["priority"], row["created_at"])
+            ).fetchone()[0]
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued job. Running jobs cannot be interrupted mid-call
+        because the LLM request is already in flight.
+        """
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, expires_at = ? WHERE id = ? AND status = ?",
+                (JOB_CANCELLED, now, now + self.result_ttl, job_id, JOB_QUEUED)
+            ).rowcount
+        if updated:
+            self._notify(job_id)
+        return bool(updated)
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        counts = {
+            row["status"]: row["n"]
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        }
+        return {
+            "workers": self.workers,
+            "running": dict(self.running),
+            "caps": dict(self.caps),
+            "counts": counts,
+        }
+
+    async def subscribe(self, job_id: str, keepalive: float = 15.0):
+        """
+        Async generator yielding job snapshots whenever the job changes,
+        until it reaches a terminal state
+        """
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            job = self.get(job_id)
+            while job is not None:
+                yield job
+                if job["status"] in TERMINAL_STATES:
+                    break
+                try:
+                    await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    pass
+                job = self.get(job_id)
+        finally:
+            watchers = self._subscribers.get(job_id)
+            if watchers:
+                watchers.discard(queue)
+                if not watchers:
+                    self._subscribers.pop(job_id, None)
+
+    # ---------- internals ----------
+    def _notify(self, job_id: str):
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(job_id)
+
+    def _claim_next(self):
+        """
+        Pick the highest-priority queued job whose type still has capacity
+        """
+        conn = self._connect()
+        saturated = [t for t, n in self.running.items() if n >= self.caps.get(t, self.workers)]
+        query = "SELECT * FROM jobs WHERE status = ?"
+        params = [JOB_QUEUED]
+        if saturated:
+            query += f" AND job_type NOT IN ({','.join('?' * len(saturated))})"
+            params.extend(saturated)
+        query += " ORDER BY priority DESC, created_at LIMIT 1"
+
+        row = conn.execute(query, params).fetchone()
+        if row is None:
+            return None
+
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (JOB_RUNNING, time.time(), row["id"])
+            )
+        return row
+
+    def _purge_expired(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+
+    async def _dispatch_loop(self):
+        last_purge = 0.0
+        while True:
+            try:
+                while len(self._tasks) < self.workers:
+                    row = self._claim_next()
+                    if row is None:
+                        break
+                    self.running[row["job_type"]] = self.running.get(row["job_type"], 0) + 1
+                    self._tasks[row["id"]] = asyncio.create_task(self._run_job(row))
+                    self._notify(row["id"])
+
+                if time.time() - last_purge > 60:
+                    self._purge_expired()
+                    last_purge = time.time()
+            except Exception as e:
+                logger.error(f"Job dispatcher error: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, row):
+        job_id = row["id"]
+        job_type = row["job_type"]
+        handler = self.handlers.get(job_type)
+        payload = json.loads(row["payload"])
+
+        status, result, error = JOB_SUCCEEDED, None, None
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job type: {job_type}")
+            # Service functions block on llm.invoke, so run them in a thread
+            # to keep the event loop free for other requests
+            if asyncio.iscoroutinefunction(handler):
+                result = await asyncio.to_thread(lambda: asyncio.run(handler(payload)))
+            else:
+                result = await asyncio.to_thread(handler, payload)
+        except asyncio.CancelledError:
+            # Shutdown: leave the job as running so it is re-queued on start
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} ({job_type}) failed: {e}")
+            status, error = JOB_FAILED, str(e)
+
+        finished = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ? WHERE id = ?",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    finished,
+                    finished + self.result_ttl,
+                    job_id
+                )
+            )
+
+        self.running[job_type] = max(self.running.get(job_type, 1) - 1, 0)
+        self._tasks.pop(job_id, None)
+        self._notify(job_id)
+        self._wakeup.set()
@@ -0,0 +1,192 @@
+"""
+LLM Clients Service - Shared provider clients
+Provider SDKs are imported on first use so a container only pays for the
+provider it is actually configured with
+"""
+
+import os
+import logging
+import threading
+from types import SimpleNamespace
+
+from services.token_usage import MeteredLLM
+from services.traffic_capture import LLM_REPLAY_PATH, replay_llm
+
+logger = logging.getLogger(__name__)
+
+GROQ_DEFAULT_MODEL = "llama-3.1-8b-instant"
+GEMINI_DEFAULT_MODEL = "gemini-2.5-pro"
+OPENAI_DEFAULT_MODEL = "gpt-4o-mini"
+
+# Cheaper models used once a token budget is exhausted (empty = none)
+GEMINI_FALLBACK_MODEL = os.getenv("GEMINI_FALLBACK_MODEL", "gemini-2.5-flash")
+GROQ_FALLBACK_MODEL = os.getenv("GROQ_FALLBACK_MODEL", "")
+OPENAI_FALLBACK_MODEL = os.getenv("OPENAI_FALLBACK_MODEL", "")
+
+_clients = {}
+_lock = threading.Lock()
+_langchain_configured = False
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def _configure_langchain():
+    """
+    Silence LangChain's global verbose flag once, on first client build
+    """
+    global _langchain_configured
+    if _langchain_configured:
+        return
+    try:
+        from langchain.globals import set_verbose  # type: ignore
+        set_verbose(False)
+    except Exception:
+        pass
+    _langchain_configured = True
+
+
+def _cached(key, factory):
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            _configure_langchain()
+            client = factory()
+            _clients[key] = client
+    return client
+
+
+def get_gemini_api_key():
+    return os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+
+
+def configured_providers() -> list:
+    """
+    Providers that have credentials in the environment
+    """
+    providers = []
+    if os.getenv("GROQ_API_KEY"):
+        providers.append("groq")
+    if get_gemini_api_key():
+        providers.append("gemini")
+    if os.getenv("OPENAI_API_KEY"):
+        providers.append("openai")
+    return providers
+
+
+def built_clients() -> list:
+    return [key[0] + ":" + key[1] for key in _clients]
+
+
+def _replay_client(model: str):
+    """
+    LLM_REPLAY_PATH set: answer from recorded traffic instead of the provider
+    """
+    return _cached(("replay", model), lambda: MeteredLLM(replay_llm(model), model))
+
+
+def _fallback_factory(getter, fallback_model: str, model: str, **kwargs):
+    if not fallback_model or fallback_model == model:
+        return None
+    return lambda: getter(fallback_model, **kwargs)
+
+
+# --------------------------------------------------
+# Groq
+# --------------------------------------------------
+def get_groq_llm(model: str = GROQ_DEFAULT_MODEL, temperature: float = 0.5, timeout: int = None):
+    if LLM_REPLAY_PATH:
+        return _replay_client(model)
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment variables")
+
+    def build():
+        from langchain_groq import ChatGroq
+
+        kwargs = {"model": model, "groq_api_key": api_key, "temperature": temperature}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        fallback = _fallback_factory(get_groq_llm, GROQ_FALLBACK_MODEL, model, temperature=temperature, timeout=timeout)
+        return MeteredLLM(ChatGroq(**kwargs), model, fallback)
+
+    return _cached(("groq", model, temperature, timeout), build)
+
+
+# --------------------------------------------------
+# Gemini
+# --------------------------------------------------
+def get_gemini_llm(model: str = GEMINI_DEFAULT_MODEL, temperature: float = 0.5):
+    if LLM_REPLAY_PATH:
+        return _replay_client(model)
+    api_key = get_gemini_api_key()
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY or GEMINI_API_KEY not found in environment variables")
+
+    def build():
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        llm = ChatGoogleGenerativeAI(
+            model=model,
+            google_api_key=api_key,
+            temperature=temperature,
+            convert_system_message_to_human=True
+        )
+        fallback = _fallback_factory(get_gemini_llm, GEMINI_FALLBACK_MODEL, model, temperature=temperature)
+        return MeteredLLM(llm, model, fallback)
+
+    return _cached(("gemini", model, temperature), build)
+
+
+# --------------------------------------------------
+# OpenAI
+# --------------------------------------------------
+class OpenAILLMAdapter:
+    """
+    Minimal adapter exposing the same `invoke(prompt).content` shape as
+    the LangChain chat models
+    """
+
+    def __init__(self, client, model: str, temperature: float):
+        self.client = client
+        self.model = model
+        self.temperature = temperature
+
+    def invoke(self, prompt: str):
+        try:
+            resp = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.temperature,
+            )
+            content = resp.choices[0].message.content if resp.choices else ""
+            return SimpleNamespace(content=content, usage=getattr(resp, "usage", None))
+        except Exception as err:
+            logger.error(f"OpenAI invoke failed: {err}")
+            raise
+
+
+def get_openai_llm(model: str = None, temperature: float = 0.4):
+    api_key = os.getenv("OPENAI_API_KEY")
+    model = model or os.getenv("OPENAI_MODEL", OPENAI_DEFAULT_MODEL)
+    if LLM_REPLAY_PATH:
+        return _replay_client(model)
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+    def build():
+        try:
+            import openai  # type: ignore
+            from openai import OpenAI  # type: ignore
+        except Exception:
+            raise ValueError("openai package not installed. Install with: pip install openai")
+
+        version = getattr(openai, "__version__", "unknown")
+        logger.info(f"Using OpenAI provider with sdk version={version}, model={model}")
+        fallback = _fallback_factory(get_openai_llm, OPENAI_FALLBACK_MODEL, model, temperature=temperature)
+        return MeteredLLM(OpenAILLMAdapter(OpenAI(api_key=api_key), model, temperature), model, fallback)
+
+    return _cached(("openai", model, temperature), build)
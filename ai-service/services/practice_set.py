@@ -0,0 +1,140 @@
+"""
+Practice Set Service - Many classroom questions in a few LLM calls
+Questions the local solver can answer never reach the LLM; the rest are
+packed several to a prompt (the persona prompt is paid once per batch
+instead of once per question), batches run concurrently under a
+process-wide limit sized to the provider's rate limits, and answers are
+streamed back per question as their batch completes
+"""
+
+import os
+import time
+import asyncio
+import logging
+
+from services.classroom_assistants import PRACTICE_ASSISTANTS, prepare_practice_question, answer_practice_batch
+
+logger = logging.getLogger(__name__)
+
+PRACTICE_SET_BATCH_SIZE = int(os.getenv("PRACTICE_SET_BATCH_SIZE", 5))
+PRACTICE_SET_MAX_QUESTIONS = int(os.getenv("PRACTICE_SET_MAX_QUESTIONS", 25))
+# Batched LLM calls in flight across all practice sets
+PRACTICE_SET_CONCURRENCY = int(os.getenv("PRACTICE_SET_CONCURRENCY", 2))
+
+_llm_slots = asyncio.Semaphore(PRACTICE_SET_CONCURRENCY)
+
+
+def plan_batches(questions: list, assistant: str, batch_size: int = None) -> tuple:
+    """
+    Split a practice set into local answers (index -> response) and
+    batches of [(index, question, prompt)] for the LLM
+    """
+    batch_size = max(1, batch_size or PRACTICE_SET_BATCH_SIZE)
+    local, pending = {}, []
+    for index, question in enumerate(questions):
+        prepared = prepare_practice_question(assistant, question)
+        if "response" in prepared:
+            local[index] = prepared["response"]
+        else:
+            pending.append((index, question, prepared["prompt"]))
+    # Even, contiguous batches (7 questions at size 5 -> 4 + 3, not 5 + 2), so
+    # the first answers streamed are the first questions of the set
+    count = -(-len(pending) // batch_size)
+    batches, start = [], 0
+    for i in range(count):
+        size = len(pending) // count + (1 if i < len(pending) % count else 0)
+        batches.append(pending[start:start + size])
+        start += size
+    return local, batches
+
+
+async def _run_batch(assistant: str, batch: list) -> dict:
+    async with _llm_slots:
+        answers = await asyncio.to_thread(
+            answer_practice_batch,
+            assistant,
+            [question for _, question, _ in batch],
+            [prompt for _, _, prompt in batch]
+        )
+    return {batch[position][0]: answer for position, answer in answers.items()}
+
+
+def _check(questions: list, assistant: str):
+    if assistant not in PRACTICE_ASSISTANTS:
+        raise ValueError(f"Practice sets are not available for the {assistant} assistant")
+    if not questions or len(questions) > PRACTICE_SET_MAX_QUESTIONS:
+        raise ValueError(f"A practice set needs 1-{PRACTICE_SET_MAX_QUESTIONS} questions")
+
+
+async def _cancel(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def stream_practice_set(questions: list, assistant: str, batch_size: int = None):
+    """
+    Yield {"part": "answer", "index", "question", "response", "source"} per
+    question (or {"part": "answer", "index", "error"} for a failed batch)
+    as soon as it is ready, then a final {"part": "done"} event
+    """
+    _check(questions, assistant)
+    started = time.perf_counter()
+    local, batches = plan_batches(questions, assistant, batch_size)
+    for index, response in sorted(local.items()):
+        yield {"part": "answer", "index": index, "question": questions[index], "response": response,
+               "source": "solver", "seconds": round(time.perf_counter() - started, 3)}
+
+    tasks = {asyncio.ensure_future(_run_batch(assistant, batch)): batch for batch in batches}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                seconds = round(time.perf_counter() - started, 3)
+                if task.exception() is not None:
+                    logger.error(f"Practice set batch failed: {task.exception()}")
+                    for index, question, _ in tasks[task]:
+                        yield {"part": "answer", "index": index, "question": question, "seconds": seconds,
+                               "error": str(task.exception()), "errorType": type(task.exception()).__name__}
+                    continue
+                for index, response in sorted(task.result().items()):
+                    yield {"part": "answer", "index": index, "question": questions[index], "response": response,
+                           "source": "llm", "seconds": seconds}
+    finally:
+        # Client disconnected mid-stream: do not start the batches still waiting for a slot
+        if pending:
+            await _cancel(pending)
+    yield {"part": "done", "questions": len(questions), "batches": len(batches),
+           "solvedLocally": len(local), "seconds": round(time.perf_counter() - started, 3)}
+
+
+async def run_practice_set(questions: list, assistant: str, batch_size: int = None) -> dict:
+    """
+    All answers in question order; a failed batch fails the whole set
+    """
+    _check(questions, assistant)
+    started = time.perf_counter()
+    local, batches = plan_batches(questions, assistant, batch_size)
+    tasks = [asyncio.ensure_future(_run_batch(assistant, batch)) for batch in batches]
+    try:
+        results = await asyncio.gather(*tasks)
+    except Exception as e:
+        logger.error(f"Error in run_practice_set: {e}")
+        await _cancel(tasks)
+        raise
+
+    responses = {index: (response, "solver") for index, response in local.items()}
+    for result in results:
+        responses.update({index: (response, "llm") for index, response in result.items()})
+    logger.info(f"Practice set of {len(questions)} answered in {len(batches)} batch(es) "
+                f"in {time.perf_counter() - started:.2f}s")
+    return {
+        "answers": [
+            {"index": index, "question": question, "response": responses[index][0], "source": responses[index][1]}
+            for index, question in enumerate(questions)
+        ],
+        "role": PRACTICE_ASSISTANTS[assistant][2],
+        "batches": len(batches),
+        "solvedLocally": len(local),
+    }
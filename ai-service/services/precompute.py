@@ -0,0 +1,318 @@
+"""
+Precompute Service - Speculative follow-up generations after resume analysis
+Once a resume is analyzed, the likely next requests (a roadmap for the
+student's target role, comparisons against the drive's current JDs) are
+queued as low-priority jobs. The matching follow-up request is then served
+from the finished job instead of a fresh LLM call. Bounded by a per-user
+budget and dropped as soon as the user's resume changes.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from collections import deque, Counter, OrderedDict
+
+from services.job_queue import make_dedup_key, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, TERMINAL_STATES
+from services.text_compression import clean_text
+from services.skill_normalizer import normalize_skills, extract_skills
+from services.roadmap_library import roadmap_from_library, personalize
+from services.roadmap_generator import generate_learning_roadmap
+from services.jd_matcher import compare_resume_jd
+from services.token_usage import ledger, usage_scope
+
+logger = logging.getLogger(__name__)
+
+PRECOMPUTE_ENABLED = os.getenv("PRECOMPUTE_ENABLED", "true").lower() == "true"
+
+JOB_TYPE = "precompute"
+# Below the default priority (5) of user-submitted jobs
+PRIORITY = 0
+KINDS = ("roadmap", "compare")
+
+
+# --------------------------------------------------
+# Request keys (a follow-up hits when its key matches)
+# --------------------------------------------------
+def request_key(kind: str, request: dict) -> str:
+    """
+    Key of a roadmap/compare request, insensitive to role casing. Roadmaps
+    are keyed on (role, timeframe) only: the speculative one is built from
+    the resume's extracted skills, while the follow-up carries the skills
+    the student typed, so it is personalized at lookup instead
+    """
+    if kind == "roadmap":
+        request = {
+            "target_role": " ".join(request["target_role"].lower().split()),
+            "timeframe_months": int(request["timeframe_months"]),
+        }
+    return make_dedup_key(kind, request)
+
+
+def personalize_roadmap(roadmap: dict, timeframe_months: int, generated_for: list, skills: list):
+    """
+    Re-fit a speculative roadmap to the requested skills: weeks teaching
+    only skills the student has are dropped and the rest re-packed. None
+    when the plan assumed a skill the request does not list (it may skip
+    fundamentals the student needs) or what is left no longer fits.
+    """
+    generated_for, requested = set(normalize_skills(generated_for)), set(normalize_skills(skills))
+    if generated_for - requested:
+        return None
+    if requested == generated_for:
+        return roadmap
+    units = [
+        [week["focus"], week["topics"], week["tasks"], extract_skills(" ".join([week["focus"]] + week["topics"]))]
+        for week in roadmap["weeks"]
+    ]
+    weeks = personalize(units, skills, int(timeframe_months) * 4)
+    return None if weeks is None else {"weeks": weeks}
+
+
+def resume_fingerprint(resume_text: str) -> str:
+    return hashlib.sha256(clean_text(resume_text).encode("utf-8")).hexdigest()
+
+
+async def run_precompute_job(payload: dict):
+    """
+    Job queue handler; usage is attributed to precompute:<kind> and the user
+    so speculative spend shows up separately in /admin/usage
+    """
+    request = payload["request"]
+    with usage_scope(endpoint=f"precompute:{payload['kind']}", user=payload.get("user")):
+        if payload["kind"] == "roadmap":
+            return await generate_learning_roadmap(
+                request["target_role"], request["timeframe_months"], request["current_skills"]
+            )
+        return await compare_resume_jd(request["resume_text"], request["jd_text"], request["target_role"])
+
+
+# --------------------------------------------------
+# Precomputer
+# --------------------------------------------------
+class Precomputer:
+    """
+    Maps request keys to speculative jobs in the job queue (which holds the
+    results for its result_ttl) and keeps per-user budgets and hit stats
+    """
+
+    def __init__(self, queue, user_budget: int = 6, window_seconds: int = 3600,
+                 max_jobs: int = 3, wait_seconds: float = 20.0, max_users: int = 10000):
+        self.queue = queue
+        self.user_budget = user_budget
+        self.window_seconds = window_seconds
+        self.max_jobs = max_jobs
+        self.wait_seconds = wait_seconds
+        self.max_users = max_users
+        # Entries are keyed on (user, request key): a speculative result is
+        # built from one student's resume and only ever served to them
+        self._entries = {}
+        self._users = OrderedDict()
+        self._stats = {kind: Counter() for kind in KINDS}
+
+    # ---------- scheduling ----------
+    def _user(self, user: str) -> dict:
+        state = self._users.get(user)
+        if state is None:
+            state = self._users[user] = {"fingerprint": None, "keys": set(), "spent": deque()}
+            # Least recently active users go first
+            while len(self._users) > self.max_users:
+                oldest = next(iter(self._users))
+                self.invalidate(oldest)
+                del self._users[oldest]
+        self._users.move_to_end(user)
+        return state
+
+    def _within_budget(self, state: dict) -> bool:
+        cutoff = time.time() - self.window_seconds
+        while state["spent"] and state["spent"][0] < cutoff:
+            state["spent"].popleft()
+        return len(state["spent"]) < self.user_budget
+
+    def schedule(self, user: str, resume_text: str, skills: list, target_role: str = None,
+                 timeframe_months: int = 6, jobs: list = None) -> dict:
+        """
+        Queue follow-ups for a freshly analyzed resume. `jobs` is a list of
+        {"jd_text", "target_role"} for the JDs the student is likely to
+        compare against, most relevant first.
+        """
+        if not PRECOMPUTE_ENABLED or not user:
+            return {"scheduled": 0}
+        self._prune()
+        state = self._user(user)
+        fingerprint = resume_fingerprint(resume_text)
+        if state["fingerprint"] != fingerprint:
+            self.invalidate(user)
+            state["fingerprint"] = fingerprint
+
+        with usage_scope(user=user):
+            if ledger.over_budget():
+                return {"scheduled": 0, "skipped": "token budget"}
+
+        candidates = []
+        # Roles the library serves cost no LLM call; nothing to speculate on
+        if target_role and roadmap_from_library(target_role, timeframe_months, skills) is not None:
+            self._stats["roadmap"]["librarySkipped"] += 1
+        elif target_role:
+            candidates.append(("roadmap", {
+                "target_role": target_role, "timeframe_months": timeframe_months, "current_skills": list(skills),
+            }))
+        for job in (jobs or [])[:self.max_jobs]:
+            candidates.append(("compare", {
+                "resume_text": resume_text, "jd_text": job["jd_text"], "target_role": job["target_role"],
+            }))
+
+        scheduled = 0
+        for kind, request in candidates:
+            key = (user, request_key(kind, request))
+            if key in self._entries:
+                continue
+            if not self._within_budget(state):
+                self._stats[kind]["budgetSkipped"] += 1
+                continue
+            job = self.queue.submit(JOB_TYPE, {"kind": kind, "request": request, "user": user}, PRIORITY)
+            self._entries[key] = {
+                "jobId": job["jobId"],
+                "kind": kind,
+                "user": user,
+                "createdAt": time.time(),
+                "used": False,
+                "skills": request.get("current_skills"),
+            }
+            state["keys"].add(key)
+            state["spent"].append(time.time())
+            self._stats[kind]["scheduled"] += 1
+            scheduled += 1
+
+        if scheduled:
+            logger.info(f"Precomputing {scheduled} follow-up(s) for user {user}")
+        return {"scheduled": scheduled}
+
+    def invalidate(self, user: str) -> int:
+        """
+        Drop a user's speculative results (their resume changed); queued
+        jobs are cancelled and refunded to the budget
+        """
+        state = self._users.get(user)
+        if not state:
+            return 0
+        dropped = 0
+        for key in state["keys"]:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                continue
+            dropped += 1
+            if self.queue.cancel(entry["jobId"]):
+                self._stats[entry["kind"]]["cancelled"] += 1
+                if state["spent"]:
+                    state["spent"].pop()
+            elif not entry["used"]:
+                self._stats[entry["kind"]]["wasted"] += 1
+        state["keys"].clear()
+        state["fingerprint"] = None
+        return dropped
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        state = self._users.get(entry["user"])
+        if state:
+            state["keys"].discard(key)
+
+    def _prune(self):
+        cutoff = time.time() - self.queue.result_ttl
+        for key in [k for k, e in self._entries.items() if e["createdAt"] < cutoff]:
+            if not self._entries[key]["used"]:
+                self._stats[self._entries[key]["kind"]]["wasted"] += 1
+            self._drop(key)
+        # Users with nothing pending and no spend left in the budget window
+        idle = []
+        for user, state in self._users.items():
+            self._within_budget(state)
+            if not state["keys"] and not state["spent"]:
+                idle.append(user)
+        for user in idle:
+            del self._users[user]
+
+    # ---------- lookup ----------
+    async def _wait(self, job_id: str):
+        async def finished():
+            async for job in self.queue.subscribe(job_id):
+                if job["status"] in TERMINAL_STATES:
+                    return job
+            return None
+
+        try:
+            return await asyncio.wait_for(finished(), self.wait_seconds)
+        except asyncio.TimeoutError:
+            return None
+
+    async def lookup(self, kind: str, request: dict, user: str = None):
+        """
+        Result of a matching speculative job for `user`, or None. A job that
+        is already running is awaited (up to wait_seconds) rather than
+        duplicated; one still queued is cancelled so the caller's own
+        request does the work at normal priority.
+        """
+        stats = self._stats[kind]
+        stats["lookups"] += 1
+        key = (user, request_key(kind, request))
+        entry = self._entries.get(key) if user else None
+        job = self.queue.get(entry["jobId"]) if entry else None
+        if job is None:
+            stats["misses"] += 1
+            return None
+
+        if job["status"] == JOB_RUNNING:
+            job = await self._wait(entry["jobId"]) or job
+            if job["status"] == JOB_SUCCEEDED:
+                stats["waitedHits"] += 1
+        elif job["status"] == JOB_QUEUED and self.queue.cancel(entry["jobId"]):
+            stats["cancelled"] += 1
+            state = self._users.get(entry["user"])
+            if state and state["spent"]:
+                state["spent"].pop()
+
+        if job["status"] != JOB_SUCCEEDED:
+            stats["misses"] += 1
+            if job["status"] != JOB_RUNNING:
+                self._drop(key)
+            return None
+        result = job["result"]
+        if kind == "roadmap":
+            result = personalize_roadmap(
+                result, request["timeframe_months"], entry["skills"], request["current_skills"]
+            )
+            if result is None:
+                stats["misses"] += 1
+                return None
+        stats["hits"] += 1
+        if not entry["used"]:
+            entry["used"] = True
+            stats["used"] += 1
+        return result
+
+    def stats(self) -> dict:
+        by_kind = {}
+        for kind, counts in self._stats.items():
+            lookups = counts["lookups"]
+            scheduled = counts["scheduled"]
+            by_kind[kind] = {
+                **{k: counts[k] for k in ("scheduled", "budgetSkipped", "librarySkipped", "cancelled",
+                                          "wasted", "lookups", "hits", "waitedHits", "misses", "used")},
+                "hitRate": round(counts["hits"] / lookups, 3) if lookups else None,
+                # Share of speculative generations a real request ended up using
+                "usedRate": round(counts["used"] / scheduled, 3) if scheduled else None,
+            }
+        usage = ledger.snapshot()["byEndpoint"]
+        return {
+            "enabled": PRECOMPUTE_ENABLED,
+            "userBudget": self.user_budget,
+            "windowSeconds": self.window_seconds,
+            "users": len(self._users),
+            "entries": len(self._entries),
+            "byKind": by_kind,
+            "tokens": {kind: usage.get(f"precompute:{kind}", {}).get("totalTokens", 0) for kind in KINDS},
+        }
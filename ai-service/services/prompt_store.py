@@ -0,0 +1,39 @@
+"""
+Prompt Store - Cached loading of file-based prompt templates
+"""
+
+import os
+from functools import lru_cache
+from langchain_core.prompts import PromptTemplate
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+
+
+@lru_cache(maxsize=None)
+def load_prompt_template(filename: str) -> str:
+    """
+    Read a prompt file once; later calls are served from memory
+    """
+    prompt_path = os.path.join(PROMPTS_DIR, filename)
+    with open(prompt_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def get_prompt(filename: str) -> PromptTemplate:
+    """
+    Parsed PromptTemplate for a prompt file
+    """
+    return PromptTemplate.from_template(load_prompt_template(filename))
+
+
+def compile_all() -> list:
+    """
+    Load and parse every prompt in the prompts directory
+    """
+    compiled = []
+    for filename in sorted(os.listdir(PROMPTS_DIR)):
+        if filename.endswith(".txt"):
+            get_prompt(filename)
+            compiled.append(filename)
+    return compiled
@@ -1,12 +1,11 @@
-import os
 import json
 import logging
 import time
-from langchain.globals import set_verbose
-from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
+import asyncio
 
-set_verbose(False)
+from services.llm_clients import get_groq_llm, GROQ_DEFAULT_MODEL
+from services.prompt_store import get_prompt
+from services.text_compression import compress_text
 
 logger = logging.getLogger(__name__)
 
@@ -14,18 +13,9 @@ logger = logging.getLogger(__name__)
 # Initialize Groq LLM
 # --------------------------------------------------
 def get_llm():
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
+    logger.info(f"Using Groq LLM ({GROQ_DEFAULT_MODEL})")
 
-    logger.info("Using Groq LLM (llama-3.1-8b-instant)")
-
-    return ChatGroq(
-        model="llama-3.1-8b-instant",
-        groq_api_key=api_key,
-        temperature=0.3,
-        timeout=30
-    )
+    return get_groq_llm(temperature=0.3, timeout=30)
 
 
 # --------------------------------------------------
@@ -54,15 +44,6 @@ def invoke_with_retry(llm, prompt, retries=3):
     raise RuntimeError("Groq API failed after multiple retries")
 
 
-# --------------------------------------------------
-# Load prompt template
-# --------------------------------------------------
-def load_prompt_template(filename):
-    prompt_path = os.path.join("prompts", filename)
-    with open(prompt_path, "r", encoding="utf-8") as f:
-        return f.read()
-
-
 # --------------------------------------------------
 # Parse JSON response
 # --------------------------------------------------
@@ -86,35 +67,49 @@ def parse_json_response(response_text):
         raise ValueError(f"JSON parse failed: {e}\n{text}")
 
 
+# --------------------------------------------------
+# Resume text normalization (shared with the JD comparison)
+# --------------------------------------------------
+def normalize_resume_text(resume_text: str) -> str:
+    """
+    Clean PDF-extraction junk (and trim an oversized resume by salience) so
+    every prompt built from the resume sees the same compact text
+    """
+    return compress_text(resume_text, "resume")
+
+
 # --------------------------------------------------
 # Analyze Resume Text
 # --------------------------------------------------
-async def analyze_resume_text(resume_text: str):
+def run_resume_analysis(resume_text: str) -> dict:
     """
-    Analyze resume and extract skills, projects, and summary
+    Blocking analysis of already-normalized resume text
     """
-    try:
-        llm = get_llm()
-        prompt_template_str = load_prompt_template("resume_prompt.txt")
+    llm = get_llm()
+    prompt = get_prompt("resume_prompt.txt")
+
+    formatted_prompt = prompt.format(resume_text=resume_text)
 
-        prompt = PromptTemplate(
-            input_variables=["resume_text"],
-            template=prompt_template_str
-        )
+    # 🔥 SAFE invocation (429 handled here)
+    response = invoke_with_retry(llm, formatted_prompt)
 
-        formatted_prompt = prompt.format(resume_text=resume_text)
+    result = parse_json_response(response.content)
 
-        # 🔥 SAFE invocation (429 handled here)
-        response = invoke_with_retry(llm, formatted_prompt)
+    return {
+        "skills": result.get("skills", []),
+        "softSkills": result.get("softSkills", []),
+        "projects": result.get("projects", []),
+        "summary": result.get("summary", "")
+    }
 
-        result = parse_json_response(response.content)
 
-        return {
-            "skills": result.get("skills", []),
-            "softSkills": result.get("softSkills", []),
-            "projects": result.get("projects", []),
-            "summary": result.get("summary", "")
-        }
+async def analyze_resume_text(resume_text: str):
+    """
+    Analyze resume and extract skills, projects, and summary
+    """
+    try:
+        # The LLM call blocks; keep it off the event loop
+        return await asyncio.to_thread(run_resume_analysis, normalize_resume_text(resume_text))
 
     except Exception as e:
         logger.error(f"Error in analyze_resume_text: {e}")
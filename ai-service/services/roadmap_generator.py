@@ -1,77 +1,22 @@
 import os
 import json
+import asyncio
 import logging
-try:
-    from langchain.globals import set_verbose  # type: ignore
-    set_verbose(False)
-except Exception:
-    pass
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.messages import HumanMessage
-from types import SimpleNamespace
-try:
-    from openai import OpenAI  # type: ignore
-    import openai  # type: ignore
-except Exception:
-    OpenAI = None  # type: ignore
-    openai = None  # type: ignore
+
+from services.llm_clients import get_gemini_llm, get_openai_llm
+from services.prompt_store import get_prompt
+from services.roadmap_library import roadmap_from_library
+from services.compact_output import COMPACT_OUTPUT_ENABLED, COMPACT_FORMAT_ERRORS, expand_roadmap, parse_compact
 
 logger = logging.getLogger(__name__)
 
 
-# Initialize Gemini model
+# Initialize Gemini model (or OpenAI when LLM_PROVIDER=openai)
 def get_llm():
     provider = (os.getenv("LLM_PROVIDER", "gemini")).lower()
     if provider == "openai":
-        if OpenAI is None:
-            raise ValueError("openai package not installed. Install with: pip install openai")
-        api_key = os.getenv("OPENAI_API_KEY")
-        model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-
-        try:
-            version = getattr(openai, "__version__", "unknown") if openai else "unknown"
-            logger.info(f"Using OpenAI provider with sdk version={version}, model={model}")
-        except Exception:
-            pass
-
-        class OpenAILLMAdapter:
-            def __init__(self, api_key: str, model: str):
-                self.client = OpenAI(api_key=api_key)
-                self.model = model
-
-            def invoke(self, prompt: str):
-                try:
-                    resp = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.4,
-                    )
-                    content = resp.choices[0].message.content if resp.choices else ""
-                    return SimpleNamespace(content=content)
-                except Exception as err:
-                    logger.error(f"OpenAI invoke failed: {err}")
-                    raise
-
-        return OpenAILLMAdapter(api_key, model)
-    else:
-        api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY or GEMINI_API_KEY not found in environment variables")
-        return ChatGoogleGenerativeAI(
-            model="gemini-2.5-pro",
-            google_api_key=api_key,
-            temperature=0.5,
-            convert_system_message_to_human=True
-        )
-
-# Load prompt template
-def load_prompt_template(filename):
-    prompt_path = os.path.join("prompts", filename)
-    with open(prompt_path, "r", encoding="utf-8") as f:
-        return f.read()
+        return get_openai_llm(temperature=0.4)
+    return get_gemini_llm(temperature=0.5)
 
 # Parse JSON response from LLM
 def parse_json_response(response_text):
@@ -94,11 +39,45 @@ def parse_json_response(response_text):
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse JSON response: {e}\nResponse: {text}")
 
+def normalize_weeks(weeks) -> list:
+    """Coerce LLM weeks into the RoadmapResponse shape so the endpoint can
+    return them without a second validation pass"""
+    if not isinstance(weeks, list):
+        raise ValueError(f"Expected a list of weeks, got {type(weeks).__name__}")
+    normalized = []
+    for n, week in enumerate(weeks, start=1):
+        if not isinstance(week, dict):
+            continue
+        try:
+            week_number = int(week.get("weekNumber", n))
+        except (TypeError, ValueError):
+            week_number = n
+        normalized.append({
+            "weekNumber": week_number,
+            "focus": str(week.get("focus", "")),
+            "topics": [str(t) for t in week.get("topics") or []],
+            "tasks": [str(t) for t in week.get("tasks") or []]
+        })
+    return normalized
+
 async def generate_learning_roadmap(target_role: str, timeframe_months: int, current_skills: list):
     """Generate a personalized learning roadmap for career development"""
+    # The LLM calls block; keep them off the event loop
+    return await asyncio.to_thread(build_learning_roadmap, target_role, timeframe_months, current_skills)
+
+
+def build_learning_roadmap(target_role: str, timeframe_months: int, current_skills: list):
+    """Blocking body of generate_learning_roadmap"""
     try:
+        # Common roles come from the pre-built library; only unknown roles
+        # pay for a full LLM generation
+        result = roadmap_from_library(target_role, timeframe_months, current_skills)
+        if result is not None:
+            logger.info(f"Roadmap for '{target_role}' served from library")
+            return result
+
         llm = get_llm()
-        prompt_template_str = load_prompt_template("roadmap_prompt.txt")
+        prompt = get_prompt("roadmap_prompt.txt")
         
         # Calculate approximate number of weeks
         num_weeks = timeframe_months * 4
@@ -106,10 +85,19 @@ async def generate_learning_roadmap(target_role: str, timeframe_months: int, cur
         # Format current skills
         skills_str = ", ".join(current_skills) if current_skills else "No specific skills mentioned"
         
-        prompt = PromptTemplate(
-            input_variables=["target_role", "timeframe_months", "current_skills", "num_weeks"],
-            template=prompt_template_str
-        )
+        # Compact mode: positional weeks, numbered locally
+        if COMPACT_OUTPUT_ENABLED:
+            compact_prompt = get_prompt("roadmap_compact_prompt.txt").format(
+                target_role=target_role,
+                timeframe_months=timeframe_months,
+                current_skills=skills_str,
+                num_weeks=num_weeks
+            )
+            response = llm.invoke(compact_prompt)
+            try:
+                return expand_roadmap(parse_compact(response.content))
+            except COMPACT_FORMAT_ERRORS as e:
+                logger.warning(f"Compact roadmap unusable, retrying with the full format: {e}")
         
         formatted_prompt = prompt.format(
             target_role=target_role,
@@ -126,7 +114,7 @@ async def generate_learning_roadmap(target_role: str, timeframe_months: int, cur
         result = parse_json_response(response_text)
         
         return {
-            "weeks": result.get("weeks", [])
+            "weeks": normalize_weeks(result.get("weeks", []))
         }
     except Exception as e:
         print(f"Error in generate_learning_roadmap: {e}")
@@ -0,0 +1,290 @@
+"""
+Roadmap Library Service - Pre-built curricula for the most requested roles
+Common (role, timeframe) requests are answered from data/roadmap_library.json
+and personalized locally: weeks the candidate already covers are dropped or
+compressed, and the rest is re-packed into the requested number of weeks.
+Timeframes far from a curriculum's length (and without a pre-built plan
+from scripts/build_roadmap_library.py) go to the LLM instead
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+
+from services.skill_normalizer import normalize_skills
+
+logger = logging.getLogger(__name__)
+
+LIBRARY_PATH = os.getenv(
+    "ROADMAP_LIBRARY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "roadmap_library.json")
+)
+LIBRARY_ENABLED = os.getenv("ROADMAP_LIBRARY_ENABLED", "true").lower() == "true"
+MIN_MONTHS = 1
+MAX_MONTHS = 12
+
+# Merged weeks keep at most this many topics / tasks so they stay readable
+MAX_TOPICS_PER_WEEK = 6
+MAX_TASKS_PER_WEEK = 4
+
+# Relative effort of a week the candidate partially covers already
+PARTIAL_WEIGHT = 0.5
+
+# A curriculum is only re-packed when the requested length is close to its
+# own: beyond these factors merged weeks get crowded or practice sprints
+# repeat, and a pre-built plan or the LLM does better
+MAX_SQUEEZE = 1.5
+MAX_STRETCH = 1.5
+
+_library = None
+_aliases = []
+_lock = threading.Lock()
+
+# Seniority and umbrella words: "Frontend Software Engineer" is a frontend
+# role, so "software engineer" must not outrank "frontend engineer"
+GENERIC_ROLE_WORDS = frozenset(
+    "software engineer engineering developer development dev programmer senior junior jr sr associate "
+    "lead staff principal intern trainee fresher entry level i ii iii 1 2 3".split()
+)
+
+
+# --------------------------------------------------
+# Loading
+# --------------------------------------------------
+def _normalize_role(role: str) -> str:
+    role = role.lower().replace("_", " ").replace("-", " ")
+    role = re.sub(r"[^\w+#/. ]", " ", role)
+    return re.sub(r"\s+", " ", role).strip()
+
+
+def load_library(path: str = None) -> dict:
+    """
+    Load (once) and return the library; an empty library when the file is
+    missing so callers simply fall back to the LLM
+    """
+    global _library, _aliases
+    if _library is not None and path is None:
+        return _library
+    with _lock:
+        if _library is not None and path is None:
+            return _library
+        path = path or LIBRARY_PATH
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                library = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Roadmap library not found at {path}; all roadmaps will use the LLM")
+            library = {"version": 0, "roles": {}}
+
+        aliases = []
+        for role_id, role in library.get("roles", {}).items():
+            for alias in [role_id, role.get("title", "")] + role.get("aliases", []):
+                alias = _normalize_role(alias)
+                if alias:
+                    aliases.append((alias, role_id))
+
+        _library, _aliases = library, aliases
+        return _library
+
+
+def library_stats() -> dict:
+    library = load_library()
+    roles = library.get("roles", {})
+    return {
+        "version": library.get("version"),
+        "roles": {
+            role_id: {
+                "weeks": len(role.get("weeks", [])),
+                "plans": sorted(role.get("plans", {}), key=int),
+                "months": covered_months(role),
+            }
+            for role_id, role in roles.items()
+        },
+    }
+
+
+def covered_months(role: dict) -> list:
+    """
+    Timeframes served from the library for a candidate with no known skills
+    """
+    return [
+        months for months in range(MIN_MONTHS, MAX_MONTHS + 1)
+        if fits(len(role.get("plans", {}).get(str(months)) or role.get("weeks", [])), months * 4)
+    ]
+
+
+def match_role(target_role: str):
+    """
+    Library role id for a free-form target role, or None. An alias matches
+    when all its words appear in the role; the role whose best alias has the
+    most specific (non-generic) words wins, and a tie is left to the LLM.
+    """
+    load_library()
+    role = _normalize_role(target_role or "")
+    if not role:
+        return None
+    words = set(role.split())
+    best = {}
+    for alias, role_id in _aliases:
+        if role == alias:
+            return role_id
+        alias_words = set(alias.split())
+        if alias_words <= words:
+            score = (len(alias_words - GENERIC_ROLE_WORDS), len(alias_words))
+            best[role_id] = max(score, best.get(role_id, score))
+    if not best:
+        return None
+    ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+    if len(ranked) > 1 and ranked[0][1] == ranked[1][1]:
+        logger.info(f"Ambiguous target role '{target_role}' ({ranked[0][0]} / {ranked[1][0]}); using the LLM")
+        return None
+    return ranked[0][0]
+
+
+# --------------------------------------------------
+# Personalization
+# --------------------------------------------------
+def _is_covered(tag: str, known: set) -> bool:
+    # "a|b|c" is covered by any one of the alternatives
+    return any(option in known for option in normalize_skills(tag.split("|")))
+
+
+def _weigh(units: list, known: set) -> list:
+    """
+    Drop fully covered weeks and halve the weight of partially covered ones.
+    Weeks without skill tags (projects, interview prep) are always kept.
+    """
+    weighed = []
+    for focus, topics, tasks, skills in units:
+        week = {"focus": focus, "parts": [focus], "topics": list(topics), "tasks": list(tasks), "weight": 1.0}
+        if skills:
+            covered = sum(1 for tag in skills if _is_covered(tag, known))
+            if covered == len(skills):
+                continue
+            if covered:
+                week["focus"] = f"{focus} (Refresher)"
+                week["parts"] = [week["focus"]]
+                week["topics"] = week["topics"][:2]
+                week["tasks"] = week["tasks"][:2]
+                week["weight"] = PARTIAL_WEIGHT
+        weighed.append(week)
+    return weighed
+
+
+def _interleave(lists: list, limit: int) -> list:
+    merged = []
+    for i in range(max((len(items) for items in lists), default=0)):
+        for items in lists:
+            if i < len(items) and items[i] not in merged:
+                merged.append(items[i])
+    return merged[:limit]
+
+
+def _merge(first: dict, second: dict) -> dict:
+    parts = first["parts"] + second["parts"]
+    return {
+        "focus": " & ".join(parts) if len(parts) <= 2 else f"{parts[0]} through {parts[-1]}",
+        "parts": parts,
+        "topics": _interleave([first["topics"], second["topics"]], MAX_TOPICS_PER_WEEK),
+        "tasks": _interleave([first["tasks"], second["tasks"]], MAX_TASKS_PER_WEEK),
+        "weight": first["weight"] + second["weight"],
+    }
+
+
+def _practice_week(previous: dict, round_number: int) -> dict:
+    focus = previous["focus"].replace(" (Refresher)", "")
+    label = "Practice Sprint" if round_number == 1 else f"Practice Sprint {round_number}"
+    return {
+        "focus": f"{label}: {focus}",
+        "parts": [f"{label}: {focus}"],
+        "topics": [f"Revisit {topic}" for topic in previous["topics"][:3]],
+        "tasks": [
+            f"Build a mini-project applying {focus}" if round_number == 1
+            else f"Extend your {focus} mini-project with one harder feature",
+            "Solve timed practice problems on this week's topics",
+            "Write a short summary of what you learned and what is still unclear",
+        ],
+        "weight": 1.0,
+    }
+
+
+def _is_closing(week: dict) -> bool:
+    return week["focus"].startswith(("Capstone", "Interview", "Mock", "Resume"))
+
+
+def _repack(weeks: list, num_weeks: int) -> list:
+    """
+    Fit weeks into exactly `num_weeks`: merge the lightest adjacent pair
+    while there are too many, add practice sprints while there are too few
+    """
+    weeks = list(weeks)
+    while len(weeks) > num_weeks:
+        i = min(range(len(weeks) - 1), key=lambda j: weeks[j]["weight"] + weeks[j + 1]["weight"])
+        weeks[i:i + 2] = [_merge(weeks[i], weeks[i + 1])]
+
+    extra = num_weeks - len(weeks)
+    if extra <= 0 or not weeks:
+        return weeks
+
+    # Sprints follow content weeks, spread evenly, before the closing
+    # project / interview weeks
+    content_end = len(weeks)
+    while content_end > 1 and _is_closing(weeks[content_end - 1]):
+        content_end -= 1
+    per_week, remainder = divmod(extra, content_end)
+    # Spread the remainder evenly instead of front-loading it
+    bonus = {int(k * content_end / remainder) for k in range(remainder)} if remainder else set()
+
+    packed = []
+    for i, week in enumerate(weeks):
+        packed.append(week)
+        if i < content_end:
+            for round_number in range(1, per_week + (i in bonus) + 1):
+                packed.append(_practice_week(week, round_number))
+    return packed
+
+
+def fits(length: int, num_weeks: int) -> bool:
+    """
+    Whether `length` weeks can be re-packed into `num_weeks` without
+    crowding or padding them
+    """
+    return length > 0 and length / MAX_SQUEEZE <= num_weeks <= length * MAX_STRETCH
+
+
+def personalize(units: list, current_skills: list, num_weeks: int):
+    """
+    Personalized weeks, or None when what is left of the curriculum after
+    dropping known skills does not fit `num_weeks`
+    """
+    known = set(normalize_skills(current_skills))
+    weighed = _weigh(units, known)
+    if not fits(len(weighed), num_weeks):
+        return None
+    weeks = _repack(weighed, num_weeks)
+    return [
+        {"weekNumber": n, "focus": week["focus"], "topics": week["topics"], "tasks": week["tasks"]}
+        for n, week in enumerate(weeks, start=1)
+    ]
+
+
+def roadmap_from_library(target_role: str, timeframe_months: int, current_skills: list):
+    """
+    Personalized roadmap for a known role and timeframe, or None when the
+    request should go to the LLM
+    """
+    if not LIBRARY_ENABLED or not (MIN_MONTHS <= timeframe_months <= MAX_MONTHS):
+        return None
+    role_id = match_role(target_role)
+    if role_id is None:
+        return None
+    role = load_library()["roles"][role_id]
+    # A plan built for this timeframe beats re-packing the generic curriculum
+    units = role.get("plans", {}).get(str(timeframe_months)) or role.get("weeks", [])
+    weeks = personalize(units, current_skills, timeframe_months * 4)
+    if weeks is None:
+        logger.info(f"Library curriculum for '{role_id}' does not fit {timeframe_months} months; using the LLM")
+        return None
+    return {"weeks": weeks}
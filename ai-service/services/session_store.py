@@ -0,0 +1,201 @@
+"""
+Session Store - Server-side conversation state for chat and classroom assistants
+Keeps a bounded, LRU-evicted set of conversations in memory (optionally
+spilling idle ones to disk) so callers only send the new message per turn
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+RECENT_WINDOW = 6
+SUMMARY_LINE_CHARS = 160
+SUMMARY_MAX_CHARS = 1200
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def format_history(messages: list) -> str:
+    """
+    Render messages the same way the assistants always have: `ROLE: content`
+    """
+    context = ""
+    for msg in messages:
+        role = msg.get("role", "user").upper()
+        content = msg.get("content", "")
+        context += f"{role}: {content}\n"
+    return context
+
+
+def _summarize_message(msg: dict) -> str:
+    """
+    Cheap extractive summary of one message: its first sentence, clipped
+    """
+    content = " ".join(msg.get("content", "").split())
+    for stop in (". ", "? ", "! ", "\n"):
+        idx = content.find(stop)
+        if 0 < idx < SUMMARY_LINE_CHARS:
+            content = content[:idx + 1]
+            break
+    if len(content) > SUMMARY_LINE_CHARS:
+        content = content[:SUMMARY_LINE_CHARS - 3] + "..."
+    return f"{msg.get('role', 'user').upper()}: {content}"
+
+
+# --------------------------------------------------
+# Session
+# --------------------------------------------------
+class ConversationSession:
+    def __init__(self, key: str, recent: list = None, summary: list = None, turns: int = 0):
+        self.key = key
+        self.recent = recent or []
+        self.summary = summary or []
+        self.turns = turns
+        self.last_used = time.time()
+        self._context = None
+
+    def append(self, role: str, content: str):
+        self.recent.append({"role": role, "content": content})
+        # Messages leaving the recent window are folded into the rolling summary
+        while len(self.recent) > RECENT_WINDOW:
+            self.summary.append(_summarize_message(self.recent.pop(0)))
+        while self.summary and sum(len(line) + 1 for line in self.summary) > SUMMARY_MAX_CHARS:
+            self.summary.pop(0)
+        self.turns += 1
+        self._context = None
+
+    def context(self) -> str:
+        """
+        Prompt-ready context, cached until the next append
+        """
+        if self._context is None:
+            context = ""
+            if self.summary:
+                context += "Earlier in this conversation (summary):\n" + "\n".join(self.summary) + "\n\n"
+            context += format_history(self.recent)
+            self._context = context
+        return self._context
+
+    def to_dict(self) -> dict:
+        return {"key": self.key, "recent": self.recent, "summary": self.summary, "turns": self.turns}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["key"], data.get("recent"), data.get("summary"), data.get("turns", 0))
+
+
+# --------------------------------------------------
+# Store
+# --------------------------------------------------
+class SessionStore:
+    def __init__(self, max_sessions: int = 1000, idle_ttl: int = 1800, spill_dir: str = None):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.spill_dir = spill_dir
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(scope: str, conversation_id: str) -> str:
+        return f"{scope}:{conversation_id}"
+
+    def get(self, key: str):
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._load_spilled(key)
+                if session is not None:
+                    self._insert(session)
+            if session is None:
+                self.misses += 1
+                return None
+            self._sessions.move_to_end(key)
+            session.last_used = time.time()
+            self.hits += 1
+            return session
+
+    def seed(self, key: str, history: list):
+        """
+        Create (or reset) a session from a full history sent by the caller
+        """
+        session = ConversationSession(key)
+        for msg in history:
+            session.append(msg.get("role", "user"), msg.get("content", ""))
+        with self._lock:
+            self._sessions.pop(key, None)
+            self._insert(session)
+        return session
+
+    def drop(self, key: str):
+        with self._lock:
+            self._sessions.pop(key, None)
+            path = self._spill_path(key)
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "maxSessions": self.max_sessions,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # ---------- internals ----------
+    def _insert(self, session):
+        self._sessions[session.key] = session
+        self._sessions.move_to_end(session.key)
+        while len(self._sessions) > self.max_sessions:
+            _, evicted = self._sessions.popitem(last=False)
+            self._spill(evicted)
+
+    def _evict_idle(self):
+        cutoff = time.time() - self.idle_ttl
+        # The dict is kept in last-used order, so idle sessions are at the front
+        while self._sessions:
+            key, oldest = next(iter(self._sessions.items()))
+            if oldest.last_used >= cutoff:
+                break
+            self._sessions.pop(key)
+            self._spill(oldest)
+
+    def _spill_path(self, key: str):
+        if not self.spill_dir:
+            return None
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.json")
+
+    def _spill(self, session):
+        path = self._spill_path(session.key)
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(session.to_dict(), f)
+        except OSError as e:
+            logger.warning(f"Failed to spill session {session.key}: {e}")
+
+    def _load_spilled(self, key: str):
+        path = self._spill_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                session = ConversationSession.from_dict(json.load(f))
+            os.remove(path)
+            return session
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to load spilled session {key}: {e}")
+            return None
@@ -0,0 +1,186 @@
+"""
+Skill Normalizer - Canonical skill names shared by the local (non-LLM) paths
+Maps free-form skill strings ("ReactJS", "node", "ML") to one canonical
+name and finds known skills in arbitrary text
+"""
+
+import re
+from functools import lru_cache
+
+# canonical name -> aliases (lowercase). The canonical name is also an alias.
+SKILL_ALIASES = {
+    # Languages
+    "python": ["python3", "py"],
+    "java": ["core java", "java se"],
+    "c": ["c language", "c programming"],
+    "c++": ["cpp", "cplusplus", "c plus plus"],
+    "c#": ["csharp", "c sharp"],
+    "javascript": ["js", "ecmascript", "es6", "vanilla js"],
+    "typescript": ["ts"],
+    "go": ["golang"],
+    "rust": [],
+    "kotlin": [],
+    "swift": [],
+    "r": ["r programming", "r language"],
+    "sql": ["structured query language", "t-sql", "pl/sql", "plsql"],
+    "bash": ["shell scripting", "shell", "unix shell"],
+    # Web frontend
+    "html": ["html5"],
+    "css": ["css3"],
+    "react": ["reactjs", "react.js", "react js"],
+    "angular": ["angularjs", "angular.js"],
+    "vue": ["vuejs", "vue.js"],
+    "next.js": ["nextjs", "next js"],
+    "redux": ["redux toolkit"],
+    "tailwind css": ["tailwind", "tailwindcss"],
+    "bootstrap": [],
+    "webpack": [],
+    "vite": [],
+    "jest": [],
+    "web accessibility": ["accessibility", "a11y", "wcag"],
+    "web performance": ["core web vitals", "lighthouse"],
+    # Backend
+    "node.js": ["node", "nodejs", "node js"],
+    "express": ["express.js", "expressjs"],
+    "django": [],
+    "flask": [],
+    "fastapi": [],
+    "spring boot": ["spring", "springboot"],
+    ".net": ["dotnet", "asp.net", ".net core"],
+    "rest api": ["rest", "restful", "rest apis", "restful apis", "api design"],
+    "graphql": [],
+    "microservices": ["microservice architecture"],
+    "system design": ["hld", "lld", "low level design", "high level design"],
+    "oop": ["object oriented programming", "object-oriented programming", "oops"],
+    "design patterns": [],
+    # Data stores
+    "mysql": [],
+    "postgresql": ["postgres"],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "dbms": ["database management systems", "databases"],
+    # CS fundamentals
+    "data structures": ["dsa", "data structures and algorithms"],
+    "algorithms": ["algorithm design"],
+    "operating systems": ["os"],
+    "computer networks": ["networking", "cn"],
+    "dynamic programming": ["dp"],
+    # DevOps / cloud
+    "git": ["github", "version control"],
+    "docker": ["containers", "containerization"],
+    "kubernetes": ["k8s"],
+    "aws": ["amazon web services"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "ci/cd": ["cicd", "continuous integration", "github actions", "jenkins"],
+    "linux": ["unix"],
+    "testing": ["unit testing", "integration testing", "tdd"],
+    # Data / analytics
+    "excel": ["ms excel", "microsoft excel", "spreadsheets"],
+    "power bi": ["powerbi"],
+    "tableau": [],
+    "pandas": [],
+    "numpy": [],
+    "matplotlib": ["seaborn"],
+    "statistics": ["statistical analysis", "probability and statistics", "probability"],
+    "data visualization": ["dashboards", "data viz"],
+    "data cleaning": ["data wrangling", "data preprocessing"],
+    "a/b testing": ["ab testing", "experimentation", "hypothesis testing"],
+    "etl": ["data pipelines", "elt"],
+    "spark": ["apache spark", "pyspark"],
+    # ML
+    "machine learning": ["ml"],
+    "deep learning": ["dl", "neural networks"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "tensorflow": ["tf", "keras"],
+    "pytorch": ["torch"],
+    "nlp": ["natural language processing"],
+    "computer vision": ["cv", "opencv", "image processing"],
+    "feature engineering": [],
+    "model deployment": ["mlops", "model serving"],
+    "linear algebra": [],
+    "llms": ["llm", "large language models", "generative ai", "genai", "langchain"],
+    # Soft / interview
+    "communication": ["communication skills"],
+    "problem solving": ["problem-solving"],
+    "teamwork": ["collaboration"],
+    "leadership": [],
+}
+
+_ALIAS_TO_CANONICAL = {}
+for _canonical, _aliases in SKILL_ALIASES.items():
+    _ALIAS_TO_CANONICAL[_canonical] = _canonical
+    for _alias in _aliases:
+        _ALIAS_TO_CANONICAL[_alias] = _canonical
+
+# Aliases too ambiguous to detect inside free text (still fine as explicit skills)
+_TEXT_UNSAFE = {"c", "r", "go", "os", "cn", "cv", "dp", "ts", "tf", "py", "ml", "dl", "js", "rest", "node",
+                "shell", "spring", "unix", "mongo", "torch", "probability", "databases", "networking",
+                "containers", "llm", "dashboards", "collaboration", "leadership", "communication"}
+
+
+def _clean(skill: str) -> str:
+    skill = skill.lower().strip()
+    skill = re.sub(r"\s+", " ", skill)
+    return skill.strip(" .,;:-")
+
+
+@lru_cache(maxsize=4096)
+def normalize_skill(skill: str) -> str:
+    """
+    Canonical name for a skill, or the cleaned input when it is unknown
+    """
+    cleaned = _clean(skill)
+    if cleaned in _ALIAS_TO_CANONICAL:
+        return _ALIAS_TO_CANONICAL[cleaned]
+    # "React.js (Hooks)" -> "react.js"
+    base = re.sub(r"\s*\(.*?\)\s*", " ", cleaned).strip()
+    return _ALIAS_TO_CANONICAL.get(base, cleaned)
+
+
+def normalize_skills(skills) -> list:
+    """
+    Canonical, de-duplicated skills preserving first-seen order
+    """
+    seen = []
+    for skill in skills or []:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        canonical = normalize_skill(skill)
+        if canonical not in seen:
+            seen.append(canonical)
+    return seen
+
+
+def _build_text_pattern():
+    aliases = sorted(
+        (a for a in _ALIAS_TO_CANONICAL if a not in _TEXT_UNSAFE),
+        key=len,
+        reverse=True
+    )
+    body = "|".join(re.escape(a) for a in aliases)
+    return re.compile(rf"(?<![\w+#.])({body})(?![\w+#])", re.IGNORECASE)
+
+
+_TEXT_PATTERN = _build_text_pattern()
+
+
+def text_aliases() -> dict:
+    """
+    alias -> canonical skill for every alias that is safe to match in free text
+    """
+    return {a: c for a, c in _ALIAS_TO_CANONICAL.items() if a not in _TEXT_UNSAFE}
+
+
+def extract_skills(text: str) -> list:
+    """
+    Known skills mentioned in free text (resume, JD), canonicalized
+    """
+    if not text:
+        return []
+    found = []
+    for match in _TEXT_PATTERN.finditer(text):
+        canonical = _ALIAS_TO_CANONICAL[match.group(1).lower()]
+        if canonical not in found:
+            found.append(canonical)
+    return found
@@ -0,0 +1,390 @@
+"""
+Text Compression Service - Local cleanup and trimming of prompt inputs
+Resume, JD and free-text inputs arrive straight from PDF extraction:
+hyphenated line breaks, running headers/footers, page numbers, duplicated
+lines and boilerplate. Everything here is regex/line work (no LLM), so it
+runs on every request. Over-budget inputs are trimmed by line salience
+(skills, projects and experience first) instead of cutting off the tail.
+"""
+
+import os
+import re
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from services.token_usage import count_tokens
+from services.skill_normalizer import text_aliases
+
+logger = logging.getLogger(__name__)
+
+INPUT_COMPRESSION_ENABLED = os.getenv("INPUT_COMPRESSION_ENABLED", "true").lower() == "true"
+
+# Token budgets per input kind (0 = clean only, never trim)
+TOKEN_BUDGETS = {
+    "resume": int(os.getenv("INPUT_TOKEN_BUDGET_RESUME", 2500)),
+    "jd": int(os.getenv("INPUT_TOKEN_BUDGET_JD", 1500)),
+    "notes": int(os.getenv("INPUT_TOKEN_BUDGET_NOTES", 300)),
+    "chat": 0,
+}
+
+# Per-request accumulator: {"original": n, "compressed": n}
+current_savings = ContextVar("current_savings", default=None)
+
+
+# --------------------------------------------------
+# JD boilerplate rules
+# --------------------------------------------------
+# Section headings / paragraphs that never help matching a candidate
+BOILERPLATE_HEADINGS = re.compile(
+    r"^\s*(about\s+(?!(the\s+)?(role|job|position|opportunity|you)\b)[\w&.\- ]{1,40}|who\s+we\s+are|our\s+(mission|story|values|culture)|"
+    r"why\s+join\s+us|why\s+work\s+with\s+us|benefits|perks(\s+and\s+benefits)?|what\s+we\s+offer|we\s+offer|"
+    r"compensation(\s+and\s+benefits)?|equal\s+(employment\s+)?opportunity|eeo(\s+statement)?|diversity(\s+and\s+inclusion)?|"
+    r"how\s+to\s+apply|application\s+process|disclaimer)\s*:?\s*$",
+    re.IGNORECASE
+)
+KEEP_HEADINGS = re.compile(
+    r"^\s*(requirements?|qualifications?|responsibilities|what\s+you('ll|\s+will)\s+do|skills|must\s+have|"
+    r"nice\s+to\s+have|preferred|good\s+to\s+have|eligibility|role|job\s+description|key\s+skills|about\s+(the\s+)?(role|job|position))\b",
+    re.IGNORECASE
+)
+BOILERPLATE_SENTENCES = re.compile(
+    r"(equal\s+opportunity\s+employer|without\s+regard\s+to\s+(race|color|religion|gender|sex)|"
+    r"(race|color),\s*religion|reasonable\s+accommodation|e-?verify|"
+    r"(health|medical|dental|vision)\s+insurance|paid\s+time\s+off|\b401\s*\(?k\)?|"
+    r"follow\s+us\s+on|visit\s+our\s+website|all\s+qualified\s+applicants)",
+    re.IGNORECASE
+)
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip().strip("#*").strip()
+    return 0 < len(stripped) <= 60 and (stripped.endswith(":") or stripped.isupper() or len(stripped.split()) <= 5) \
+        and not stripped.endswith(".")
+
+
+def strip_jd_boilerplate(jd_text: str) -> str:
+    """
+    Drop EEO statements, benefits and company blurbs; keep requirement
+    sections and everything not recognizably boilerplate
+    """
+    kept = []
+    skipping = False
+    for line in jd_text.splitlines():
+        if _is_heading(line):
+            heading = line.strip().strip("#*").strip()
+            if KEEP_HEADINGS.match(heading):
+                skipping = False
+            elif BOILERPLATE_HEADINGS.match(heading):
+                skipping = True
+                continue
+        if skipping:
+            continue
+        if BOILERPLATE_SENTENCES.search(line):
+            continue
+        kept.append(line.rstrip())
+
+    text = "\n".join(kept)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    # Never strip a JD down to nothing because of an over-eager heading match
+    return text if len(text) >= min(200, len(jd_text) // 4) else jd_text.strip()
+
+
+# --------------------------------------------------
+# Cleanup (PDF extraction junk)
+# --------------------------------------------------
+# Ligatures, soft hyphens and bullet glyphs that cost extra tokens
+CHAR_MAP = str.maketrans({
+    "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi", "\ufb04": "ffl",
+    "\u00ad": None, "\u200b": None, "\ufeff": None,
+    "\u2022": "-", "\u25cf": "-", "\u25aa": "-", "\u25e6": "-", "\u27a2": "-", "\uf0b7": "-", "\uf0a7": "-",
+    "\u2013": "-", "\u2014": "-", "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"', "\u00a0": " ",
+})
+CHAR_PATTERN = re.compile("[" + "".join(chr(c) for c in CHAR_MAP) + "]")
+# Single spaces are left alone so the common case makes no substitution
+RAGGED_SPACE = re.compile(r"[ \t\f\v]{2,}|[\t\f\v]")
+LINE_EDGE_SPACE = re.compile(r" \n ?|\n ")
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+HYPHENATED_BREAK = re.compile(r"([a-z])-\n([a-z])")
+PAGE_NUMBER = re.compile(r"^\s*(?:page\s*)?-?\s*\d{1,3}\s*(?:(?:/|of)\s*\d{1,3})?\s*-?\s*$", re.IGNORECASE)
+DEDUP_MIN_CHARS = 20
+# Short lines seen this often are running headers/footers
+REPEATED_LINE_MIN = 3
+# Code in chat history: ``` / ~~~ fences, or (chat only) 4-space/tab indented lines
+CODE_FENCE = re.compile(r"^\s*(`{3,}|~{3,})")
+INDENTED_CODE = re.compile(r"^(?: {4}|\t)[ \t]*\S", re.MULTILINE)
+
+
+def _line_key(line: str) -> str:
+    return NON_ALNUM.sub("", line.lower())
+
+
+def clean_text(text: str, keep_indented: bool = False) -> str:
+    """
+    De-hyphenate, drop page numbers, running headers/footers and duplicate
+    lines, and collapse whitespace. Fenced code blocks (and, with
+    keep_indented, indented ones) pass through verbatim: their indentation
+    and repeated lines are meaningful.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if "```" not in text and "~~~" not in text and not (keep_indented and INDENTED_CODE.search(text)):
+        return _clean_prose(text)
+    parts = []
+    for is_code, block in _split_code(text, keep_indented):
+        cleaned = block.strip("\n") if is_code else _clean_prose(block)
+        if cleaned:
+            parts.append(cleaned)
+    return "\n\n".join(parts)
+
+
+def _split_code(text: str, keep_indented: bool):
+    """
+    Split into (is_code, block) runs of lines; blank lines stay with the run they
+    interrupt. An unclosed fence runs to the end of the text.
+    """
+    blocks = []
+    fence = None
+    for line in text.split("\n"):
+        opener = CODE_FENCE.match(line)
+        if fence is not None:
+            is_code = True
+            if opener and opener.group(1)[0] == fence and not line.strip()[len(opener.group(1)):].strip():
+                fence = None
+        elif opener:
+            is_code = True
+            fence = opener.group(1)[0]
+        elif not line.strip() and blocks:
+            is_code = blocks[-1][0]
+        else:
+            is_code = keep_indented and bool(INDENTED_CODE.match(line))
+        if blocks and blocks[-1][0] == is_code:
+            blocks[-1][1].append(line)
+        else:
+            blocks.append((is_code, [line]))
+    return [(is_code, "\n".join(lines)) for is_code, lines in blocks]
+
+
+def _clean_prose(text: str) -> str:
+    # str.translate walks every character in Python; only pay for it when needed
+    if CHAR_PATTERN.search(text):
+        text = CHAR_PATTERN.sub(lambda m: m.group().translate(CHAR_MAP), text)
+    text = RAGGED_SPACE.sub(" ", text)
+    text = LINE_EDGE_SPACE.sub("\n", text)
+    text = HYPHENATED_BREAK.sub(r"\1\2", text)
+
+    lines = text.split("\n")
+    keys = [_line_key(line) for line in lines]
+    counts = {}
+    for key in keys:
+        if key:
+            counts[key] = counts.get(key, 0) + 1
+
+    kept = []
+    seen = set()
+    for line, key in zip(lines, keys):
+        if not key:
+            kept.append("")
+            continue
+        if PAGE_NUMBER.match(line):
+            continue
+        if key in seen and (len(key) >= DEDUP_MIN_CHARS or counts[key] >= REPEATED_LINE_MIN):
+            continue
+        seen.add(key)
+        kept.append(line)
+
+    text = "\n".join(kept)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+# --------------------------------------------------
+# Salience trimming
+# --------------------------------------------------
+SECTION_WEIGHTS = {
+    "resume": [
+        (re.compile(r"skills|technolog|tools|tech stack", re.I), 3.0),
+        (re.compile(r"project", re.I), 3.0),
+        (re.compile(r"experience|internship|employment|work history", re.I), 2.5),
+        (re.compile(r"certif|achievement|award|publication|hackathon", re.I), 1.5),
+        (re.compile(r"education|academic", re.I), 1.2),
+        (re.compile(r"summary|profile|about", re.I), 1.0),
+        (re.compile(r"objective", re.I), 0.5),
+        (re.compile(r"hobbies|interests|personal|languages known|extra.?curricular", re.I), 0.2),
+        (re.compile(r"declaration|references", re.I), 0.0),
+    ],
+    "jd": [
+        (KEEP_HEADINGS, 3.0),
+        (re.compile(r"experience|tech stack|technolog", re.I), 2.5),
+    ],
+}
+METRIC = re.compile(r"\d+\s*(%|x\b|k\b|\+|users|ms\b|requests)", re.I)
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+")
+LONG_LINE_CHARS = 300
+
+
+def _section_weight(line: str, rules: list):
+    """
+    Weight of the section a heading line opens, or None for body lines
+    """
+    stripped = line.strip().strip("#*:").strip()
+    if not stripped or stripped[0] in "-+(" or "," in stripped or len(stripped.split()) > 4:
+        return None
+    if not (line.rstrip().endswith(":") or stripped.isupper() or stripped.istitle()):
+        return None
+    return next((w for pattern, w in rules if pattern.search(stripped)), 1.0)
+
+
+# Skill lookup by word n-gram: a dict probe per n-gram is far cheaper than
+# running the skill alternation regex over every line
+WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_skill_ngrams = None
+
+
+def _skill_table():
+    global _skill_ngrams
+    if _skill_ngrams is None:
+        table = {}
+        for alias, canonical in text_aliases().items():
+            words = WORD.findall(alias)
+            if words:
+                table[" ".join(words)] = canonical
+        _skill_ngrams = (table, max(len(key.split()) for key in table))
+    return _skill_ngrams
+
+
+def count_skills(line: str) -> int:
+    table, longest = _skill_table()
+    words = WORD.findall(line.lower())
+    found = set()
+    for n in range(1, longest + 1):
+        for i in range(len(words) - n + 1):
+            skill = table.get(" ".join(words[i:i + n]))
+            if skill is not None:
+                found.add(skill)
+    return len(found)
+
+
+def _salience(line: str, weight: float) -> float:
+    return weight * (1.0 + 0.5 * count_skills(line) + (0.3 if METRIC.search(line) else 0.0))
+
+
+def trim_to_budget(text: str, kind: str, max_tokens: int) -> str:
+    """
+    Keep the most salient lines (in original order) within max_tokens.
+    A section heading is kept whenever any line under it is; long
+    paragraphs are scored sentence by sentence.
+    """
+    rules = SECTION_WEIGHTS.get(kind, [])
+    lines = []
+    for line in text.split("\n"):
+        lines.extend(SENTENCE_BREAK.split(line) if len(line) > LONG_LINE_CHARS else [line])
+
+    weight = 1.0
+    heading = None
+    heading_of = {}
+    scored = []
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        section = _section_weight(line, rules) if rules else None
+        if section is not None:
+            weight, heading = section, i
+            continue
+        heading_of[i] = heading
+        # Earlier lines break ties (contact line, first bullets of a section)
+        scored.append((_salience(line, weight), -i, i))
+
+    keep = set()
+    used = 0
+    for score, _, i in sorted(scored, reverse=True):
+        if score <= 0:
+            break
+        head = heading_of[i]
+        extra = count_tokens(lines[i]) + 1
+        if head is not None and head not in keep:
+            extra += count_tokens(lines[head]) + 1
+        if used + extra > max_tokens:
+            continue
+        keep.add(i)
+        if head is not None:
+            keep.add(head)
+        used += extra
+
+    if not keep:
+        # Nothing fits line by line (one huge unbroken paragraph)
+        return text[:max_tokens * 4]
+    return "\n".join(lines[i] for i in sorted(keep))
+
+
+# --------------------------------------------------
+# Entry point + reporting
+# --------------------------------------------------
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def compress_text(text: str, kind: str, max_tokens: int = None) -> str:
+    """
+    Clean (and, over budget, trim) one prompt input. kind is "resume",
+    "jd", "notes" or "chat"; JDs also lose their boilerplate sections.
+    """
+    if not text or not INPUT_COMPRESSION_ENABLED:
+        return text
+    compressed = clean_text(text, keep_indented=kind == "chat")
+    if kind == "jd":
+        compressed = strip_jd_boilerplate(compressed)
+    budget = TOKEN_BUDGETS.get(kind, 0) if max_tokens is None else max_tokens
+
+    original_tokens = count_tokens(text)
+    tokens = count_tokens(compressed)
+    trimmed = False
+    if budget and tokens > budget:
+        compressed = trim_to_budget(compressed, kind, budget)
+        tokens = count_tokens(compressed)
+        trimmed = True
+
+    _record(kind, original_tokens, tokens, trimmed)
+    return compressed
+
+
+def _record(kind: str, original: int, compressed: int, trimmed: bool):
+    with _stats_lock:
+        bucket = _stats.setdefault(kind, {"calls": 0, "trimmed": 0, "originalTokens": 0, "compressedTokens": 0})
+        bucket["calls"] += 1
+        bucket["trimmed"] += int(trimmed)
+        bucket["originalTokens"] += original
+        bucket["compressedTokens"] += compressed
+    savings = current_savings.get()
+    if savings is not None:
+        savings["original"] += original
+        savings["compressed"] += compressed
+    if original - compressed > 0:
+        logger.debug(f"Compressed {kind} input: {original} -> {compressed} tokens")
+
+
+@contextmanager
+def savings_scope():
+    """
+    Collect the tokens saved by every compress_text call in the block
+    (threads started from it with to_thread share the accumulator)
+    """
+    savings = {"original": 0, "compressed": 0}
+    token = current_savings.set(savings)
+    try:
+        yield savings
+    finally:
+        current_savings.reset(token)
+
+
+def stats() -> dict:
+    with _stats_lock:
+        result = {}
+        for kind, bucket in _stats.items():
+            saved = bucket["originalTokens"] - bucket["compressedTokens"]
+            result[kind] = {
+                **bucket,
+                "tokensSaved": saved,
+                "savedRatio": round(saved / bucket["originalTokens"], 3) if bucket["originalTokens"] else 0.0,
+            }
+        return {"enabled": INPUT_COMPRESSION_ENABLED, "budgets": dict(TOKEN_BUDGETS), "byKind": result}
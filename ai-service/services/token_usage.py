@@ -0,0 +1,307 @@
+"""
+Token Usage Service - Token accounting and budget enforcement at the LLM-call layer
+Usage is taken from provider metadata when available, otherwise estimated
+with a local tokenizer, and aggregated per endpoint, model and user
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+current_endpoint = contextvars.ContextVar("current_endpoint", default=None)
+current_user = contextvars.ContextVar("current_user", default=None)
+
+
+class BudgetExceededError(Exception):
+    """
+    Raised when a call would exceed a token budget and no cheaper model
+    or cached result can serve it
+    """
+
+
+@contextmanager
+def usage_scope(endpoint: str = None, user: str = None):
+    """
+    Attribute LLM calls made inside the block to an endpoint and/or user
+    """
+    tokens = []
+    if endpoint is not None:
+        tokens.append((current_endpoint, current_endpoint.set(endpoint)))
+    if user is not None:
+        tokens.append((current_user, current_user.set(user)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+# --------------------------------------------------
+# Token counting
+# --------------------------------------------------
+_encoding = None
+_encoding_loaded = False
+
+
+def count_tokens(text: str) -> int:
+    """
+    Local token estimate: tiktoken's cl100k_base when installed,
+    otherwise the usual ~4 characters per token heuristic
+    """
+    global _encoding, _encoding_loaded
+    if not text:
+        return 0
+    if not _encoding_loaded:
+        try:
+            import tiktoken  # type: ignore
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return max(1, (len(text) + 3) // 4)
+
+
+def extract_usage(response):
+    """
+    Pull (prompt_tokens, completion_tokens) from the shapes returned by
+    LangChain chat models and the OpenAI adapter, or None if absent
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if isinstance(usage, dict) and "input_tokens" in usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or metadata.get("usage")
+    if isinstance(token_usage, dict) and "prompt_tokens" in token_usage:
+        return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+    gemini_usage = metadata.get("usage_metadata")
+    if isinstance(gemini_usage, dict) and "prompt_token_count" in gemini_usage:
+        return gemini_usage.get("prompt_token_count", 0), gemini_usage.get("candidates_token_count", 0)
+
+    usage = getattr(response, "usage", None)
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        return usage.prompt_tokens, getattr(usage, "completion_tokens", 0) or 0
+    return None
+
+
+# --------------------------------------------------
+# Ledger
+# --------------------------------------------------
+def _empty_bucket() -> dict:
+    return {
+        "calls": 0,
+        "promptTokens": 0,
+        "completionTokens": 0,
+        "totalTokens": 0,
+        "estimatedCalls": 0,
+        "latencySeconds": 0.0,
+        "degradedCalls": 0,
+    }
+
+
+class UsageLedger:
+    """
+    In-memory aggregation of token usage. Budgets apply to a rolling
+    window (default one day) that resets as a whole.
+    """
+
+    def __init__(self, global_budget: int = 0, user_budget: int = 0, window_seconds: int = 86400):
+        self.global_budget = global_budget
+        self.user_budget = user_budget
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.window_started = time.time()
+        self.totals = _empty_bucket()
+        self.by_endpoint = {}
+        self.by_model = {}
+        self.by_user = {}
+
+    def _roll_window(self):
+        if time.time() - self.window_started >= self.window_seconds:
+            self._reset()
+
+    def record(self, model: str, prompt_tokens: int, completion_tokens: int,
+               latency: float, estimated: bool = False, degraded: bool = False):
+        endpoint = current_endpoint.get() or "unattributed"
+        user = current_user.get()
+        with self._lock:
+            self._roll_window()
+            buckets = [
+                self.totals,
+                self.by_endpoint.setdefault(endpoint, _empty_bucket()),
+                self.by_model.setdefault(model, _empty_bucket()),
+            ]
+            if user:
+                buckets.append(self.by_user.setdefault(user, _empty_bucket()))
+            for bucket in buckets:
+                bucket["calls"] += 1
+                bucket["promptTokens"] += prompt_tokens
+                bucket["completionTokens"] += completion_tokens
+                bucket["totalTokens"] += prompt_tokens + completion_tokens
+                bucket["latencySeconds"] += latency
+                if estimated:
+                    bucket["estimatedCalls"] += 1
+                if degraded:
+                    bucket["degradedCalls"] += 1
+
+    def over_budget(self, headroom: float = 0.0):
+        """
+        Return "global", "user" or None for the current request context.
+        `headroom` stretches both budgets (0.2 = 20% over) for degraded calls.
+        """
+        scale = 1.0 + headroom
+        with self._lock:
+            self._roll_window()
+            if self.global_budget and self.totals["totalTokens"] >= self.global_budget * scale:
+                return "global"
+            user = current_user.get()
+            if self.user_budget and user:
+                used = self.by_user.get(user, {}).get("totalTokens", 0)
+                if used >= self.user_budget * scale:
+                    return "user"
+        return None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._roll_window()
+            return {
+                "windowStartedAt": self.window_started,
+                "windowSeconds": self.window_seconds,
+                "budgets": {"global": self.global_budget, "perUser": self.user_budget},
+                "totals": dict(self.totals),
+                "byEndpoint": {k: dict(v) for k, v in self.by_endpoint.items()},
+                "byModel": {k: dict(v) for k, v in self.by_model.items()},
+                "byUser": {k: dict(v) for k, v in self.by_user.items()},
+            }
+
+
+ledger = UsageLedger(
+    global_budget=int(os.getenv("TOKEN_BUDGET_GLOBAL", 0)),
+    user_budget=int(os.getenv("TOKEN_BUDGET_PER_USER", 0)),
+    window_seconds=int(os.getenv("TOKEN_BUDGET_WINDOW_SECONDS", 86400))
+)
+
+
+# --------------------------------------------------
+# Metered LLM wrapper
+# --------------------------------------------------
+class ResponseCache:
+    """
+    Small LRU of recent responses keyed by model + prompt, used to keep
+    serving repeated requests once a budget is exhausted
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+response_cache = ResponseCache(int(os.getenv("TOKEN_BUDGET_CACHE_ENTRIES", 256)))
+
+# Extra share of a budget that degraded (fallback-model) calls may spend
+# before requests are refused; fallback spend counts against the budget too
+FALLBACK_HEADROOM = float(os.getenv("TOKEN_BUDGET_FALLBACK_HEADROOM", 0.2))
+
+
+_call_hooks = []
+
+
+def register_llm_hook(func):
+    """
+    Call func(model, prompt_text, response, latency, usage) after every
+    metered LLM call (used by traffic capture)
+    """
+    _call_hooks.append(func)
+
+
+class MeteredLLM:
+    """
+    Wraps a chat model so every invoke() is accounted for. When a budget is
+    exceeded the call is served from a cached response for the same prompt
+    if there is one, then degrades to the cheaper model built by
+    `fallback_factory` (if configured) until usage passes the budget plus
+    FALLBACK_HEADROOM, and only then fails with BudgetExceededError.
+    """
+
+    def __init__(self, llm, model: str, fallback_factory=None):
+        self.llm = llm
+        self.model = model
+        self.fallback_factory = fallback_factory
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def invoke(self, prompt, *args, **kwargs):
+        prompt_text = prompt if isinstance(prompt, str) else str(prompt)
+        cache_key = ResponseCache.key(self.model, prompt_text)
+
+        exceeded = ledger.over_budget()
+        if exceeded:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.warning(f"{exceeded} token budget exceeded; serving cached {self.model} response")
+                return cached
+            if self.fallback_factory is not None:
+                exhausted = ledger.over_budget(FALLBACK_HEADROOM)
+                if exhausted:
+                    raise BudgetExceededError(f"{exhausted.capitalize()} token budget exceeded")
+                fallback = self.fallback_factory()
+                logger.warning(f"{exceeded} token budget exceeded; degrading {self.model} -> {fallback.model}")
+                response = fallback._call(prompt, prompt_text, args, kwargs, degraded=True)
+                response_cache.put(cache_key, response)
+                return response
+            raise BudgetExceededError(f"{exceeded.capitalize()} token budget exceeded")
+
+        response = self._call(prompt, prompt_text, args, kwargs)
+        response_cache.put(cache_key, response)
+        return response
+
+    def _call(self, prompt, prompt_text, args, kwargs, degraded: bool = False):
+        started = time.perf_counter()
+        response = self.llm.invoke(prompt, *args, **kwargs)
+        latency = time.perf_counter() - started
+
+        usage = extract_usage(response)
+        estimated = usage is None
+        if estimated:
+            content = getattr(response, "content", None)
+            usage = (count_tokens(prompt_text), count_tokens(content if isinstance(content, str) else str(response)))
+
+        ledger.record(self.model, usage[0], usage[1], latency, estimated=estimated, degraded=degraded)
+        for hook in _call_hooks:
+            try:
+                hook(self.model, prompt_text, response, latency, usage)
+            except Exception as e:
+                logger.error(f"LLM call hook failed: {e}")
+        return response
@@ -0,0 +1,441 @@
+"""
+Traffic Capture Service - Record production traffic, replay it offline
+With TRAFFIC_CAPTURE_PATH set, every /ai/* request (anonymized body, arrival
+offset, status, latency) and every upstream LLM call made while serving it
+(latency, anonymized response, token usage) is appended to a JSONL file.
+Anonymization is best-effort (contact details, ids and the candidate name
+from the resume's first line); treat capture files as containing PII. With
+LLM_REPLAY_PATH set, the LLM clients answer from such a file instead of the
+providers, so scripts/replay_traffic.py can re-drive real traffic shapes
+against a new build with no API keys and no provider variance.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import queue
+import hashlib
+import logging
+import threading
+import contextvars
+from types import SimpleNamespace
+from collections import OrderedDict
+
+from services.token_usage import register_llm_hook, current_endpoint
+
+logger = logging.getLogger(__name__)
+
+TRAFFIC_CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH", "")
+TRAFFIC_CAPTURE_PREFIX = "/ai/"
+# Pseudonyms are stable within a capture; set a salt to keep them stable across restarts
+CAPTURE_SALT = os.getenv("TRAFFIC_CAPTURE_SALT") or uuid.uuid4().hex
+LLM_REPLAY_PATH = os.getenv("LLM_REPLAY_PATH", "")
+LLM_REPLAY_LATENCY_SCALE = float(os.getenv("LLM_REPLAY_LATENCY_SCALE", 1.0))
+
+CAPTURE_VERSION = 1
+REPLAY_HEADER = b"x-replay-id"
+
+current_request_id = contextvars.ContextVar("current_request_id", default=None)
+# Candidate names seen in the current request; a shared list, filled once
+# the body has been read, so LLM calls made afterwards can scrub them too
+current_names = contextvars.ContextVar("current_names", default=None)
+
+
+# --------------------------------------------------
+# Anonymization
+# --------------------------------------------------
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+URL = re.compile(r"\b(?:https?://|www\.)\S+|\b(?:linkedin|github|leetcode)\.com/\S+", re.IGNORECASE)
+PHONE = re.compile(r"(?<![\w+])\+?\d[\d\s().-]{8,}\d(?!\w)")
+# Fields holding user/conversation identifiers
+ID_FIELDS = {"owner", "user_id", "conversation_id", "id"}
+# First lines that are headings rather than a name
+RESUME_HEADINGS = {"resume", "curriculum vitae", "cv", "bio-data", "biodata", "profile"}
+# Names remembered per (pseudonymized) user for requests without a resume
+MAX_REMEMBERED_USERS = 10000
+MAX_NAMES_PER_USER = 20
+
+
+def pseudonym(value: str) -> str:
+    return "anon-" + hashlib.sha256(f"{CAPTURE_SALT}:{value}".encode("utf-8")).hexdigest()[:12]
+
+
+def _phone(match) -> str:
+    # Year ranges ("2019 - 2023") look like phone numbers; real ones have 10+ digits
+    return "+00 00000 00000" if sum(c.isdigit() for c in match.group()) >= 10 else match.group()
+
+
+def resume_name(text: str):
+    """
+    The candidate's name from the first line of a resume ("Priya Sharma |
+    SDE" -> "Priya Sharma"), or None when the first line is not a name
+    """
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if len(line.split()) > 5 or any(c.isdigit() or c == "@" for c in line):
+            return None
+        name = re.split(r"\s[|\u2013\u2014-]\s|[|,]", line)[0].strip()
+        if name.lower() in RESUME_HEADINGS or not re.search(r"[^\W\d_]{2,}", name):
+            return None
+        return name
+    return None
+
+
+def find_names(value) -> list:
+    """
+    Names from every resume_text in a request body (cohort uploads carry many)
+    """
+    if isinstance(value, dict):
+        return [name for k, v in value.items() for name in (
+            [resume_name(v)] if k == "resume_text" and isinstance(v, str) else find_names(v)
+        ) if name]
+    if isinstance(value, list):
+        return [name for v in value for name in find_names(v)]
+    return []
+
+
+def _scrub_names(text: str, names) -> str:
+    # Full names first, then their parts ("Priya", "Sharma") on their own
+    replacements = {}
+    for name in names:
+        parts = re.findall(r"[^\W\d_]{3,}", name)
+        replacements.update({part.lower(): "Candidate" for part in parts})
+        if len(parts) > 1:
+            replacements[" ".join(parts).lower()] = "Candidate Name"
+    if not replacements:
+        return text
+    pattern = "|".join(
+        r"\s+".join(map(re.escape, key.split())) for key in sorted(replacements, key=len, reverse=True)
+    )
+    return re.sub(
+        rf"(?<!\w)(?:{pattern})(?!\w)",
+        lambda m: replacements[" ".join(m.group().lower().split())],
+        text,
+        flags=re.IGNORECASE,
+    )
+
+
+def anonymize_text(text: str, names=()) -> str:
+    text = EMAIL.sub("candidate@example.com", text)
+    text = URL.sub("https://example.com/profile", text)
+    return _scrub_names(PHONE.sub(_phone, text), names)
+
+
+def anonymize(value, key: str = None, names=()):
+    if isinstance(value, dict):
+        return {k: anonymize(v, k, names) for k, v in value.items()}
+    if isinstance(value, list):
+        return [anonymize(v, key, names) for v in value]
+    if isinstance(value, str):
+        if key in ID_FIELDS:
+            return pseudonym(value)
+        if key == "resume_text":
+            name = resume_name(value)
+            value = _scrub_names(value, [name]) if name else value
+        return anonymize_text(value, names)
+    return value
+
+
+def prompt_hash(prompt_text: str) -> str:
+    return hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()[:16]
+
+
+# --------------------------------------------------
+# Recorder (append-only JSONL, written off the event loop)
+# --------------------------------------------------
+class TrafficRecorder:
+    def __init__(self, path: str):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._origin = time.monotonic()
+        self._names = OrderedDict()
+        self.records = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def offset(self) -> float:
+        """
+        Seconds since this capture session started (arrival timestamps)
+        """
+        return time.monotonic() - self._origin
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._queue.put({"type": "capture", "version": CAPTURE_VERSION, "startedAt": time.time()})
+                self._thread = threading.Thread(target=self._write_loop, name="traffic-capture", daemon=True)
+                self._thread.start()
+                logger.info(f"Capturing /ai/* traffic to {self.path}")
+
+    def _write_loop(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                while record is not None:
+                    f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                f.flush()
+                if record is None:
+                    return
+
+    def names_for(self, user: str) -> list:
+        """
+        Names seen in earlier requests of a (pseudonymized) user, so their
+        chat messages are scrubbed even without a resume in the body
+        """
+        with self._lock:
+            return list(self._names.get(user, ()))
+
+    def remember_names(self, user: str, names: list):
+        with self._lock:
+            known = self._names.pop(user, [])
+            self._names[user] = (known + [name for name in names if name not in known])[-MAX_NAMES_PER_USER:]
+            while len(self._names) > MAX_REMEMBERED_USERS:
+                self._names.popitem(last=False)
+
+    def record(self, record: dict):
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self._start()
+        self.records += 1
+        self._queue.put(record)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {"capturing": self.enabled, "path": self.path or None, "records": self.records}
+
+
+recorder = TrafficRecorder(TRAFFIC_CAPTURE_PATH)
+
+
+def _record_llm_call(model, prompt_text, response, latency, usage):
+    content = getattr(response, "content", response)
+    recorder.record({
+        "type": "llm",
+        "request": current_request_id.get(),
+        "endpoint": current_endpoint.get(),
+        "model": model,
+        "promptHash": prompt_hash(prompt_text),
+        "ms": round(latency * 1000, 1),
+        "usage": list(usage),
+        "response": anonymize_text(
+            content if isinstance(content, str) else str(content), current_names.get() or ()
+        ),
+    })
+
+
+if recorder.enabled:
+    register_llm_hook(_record_llm_call)
+
+
+class TrafficCaptureMiddleware:
+    """
+    Pure ASGI middleware (outermost, so shed requests are captured too).
+    Also binds X-Replay-Id to the request so replayed LLM calls find the
+    responses recorded for the original request.
+    """
+
+    def __init__(self, app, recorder: TrafficRecorder):
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        replay_id = headers.get(REPLAY_HEADER)
+        capture = self.recorder.enabled and scope["path"].startswith(TRAFFIC_CAPTURE_PREFIX)
+        if not capture and replay_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = replay_id.decode() if replay_id is not None else uuid.uuid4().hex[:16]
+        token = current_request_id.set(request_id)
+        if not capture:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                current_request_id.reset(token)
+            return
+
+        arrived = self.recorder.offset()
+        started = time.perf_counter()
+        body = bytearray()
+        status = {"code": 500}
+        user = headers.get(b"x-user-id")
+        user = pseudonym(user.decode()) if user else None
+        names = self.recorder.names_for(user) if user else []
+        names_token = current_names.set(names)
+        parsed = {}
+
+        def parse_body():
+            try:
+                parsed["payload"] = json.loads(body) if body else None
+            except ValueError:
+                parsed["payload"] = None
+            for name in find_names(parsed["payload"]):
+                if name not in names:
+                    names.append(name)
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                body.extend(message.get("body", b""))
+                # Complete body: collect names before any LLM call is made
+                if not message.get("more_body") and "payload" not in parsed:
+                    parse_body()
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            current_request_id.reset(token)
+            current_names.reset(names_token)
+            if "payload" not in parsed:
+                parse_body()
+            if user and names:
+                self.recorder.remember_names(user, names)
+            payload = anonymize(parsed["payload"], names=names) if parsed["payload"] is not None else None
+            self.recorder.record({
+                "type": "request",
+                "id": request_id,
+                "at": round(arrived, 4),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "user": user,
+                "status": status["code"],
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "body": payload,
+            })
+
+
+# --------------------------------------------------
+# Replay (LLM answers from a capture file)
+# --------------------------------------------------
+class ReplayStore:
+    """
+    Recorded LLM calls indexed by originating request (+ model), prompt
+    hash and model. Lookups cycle through the matches, so one capture can
+    be replayed many times against the same process.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._by_request = {}
+        self._by_prompt = {}
+        self._by_model = {}
+        self._all = []
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self.matched = {"request": 0, "prompt": 0, "model": 0}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("type") != "llm":
+                    continue
+                self._all.append(record)
+                if record.get("request"):
+                    self._by_request.setdefault((record["request"], record["model"]), []).append(record)
+                    self._by_request.setdefault((record["request"], None), []).append(record)
+                self._by_prompt.setdefault(record["promptHash"], []).append(record)
+                self._by_model.setdefault(record["model"], []).append(record)
+        logger.info(f"Replaying {len(self._all)} recorded LLM call(s) from {path}")
+
+    def _next(self, key, records: list) -> dict:
+        index = self._cursors.get(key, 0)
+        self._cursors[key] = index + 1
+        return records[index % len(records)]
+
+    def pick(self, model: str, prompt_text: str) -> dict:
+        if not self._all:
+            raise ValueError(f"No recorded LLM calls in {self.path}")
+        request_id = current_request_id.get()
+        with self._lock:
+            for key in ((request_id, model), (request_id, None)):
+                records = self._by_request.get(key) if request_id else None
+                if records:
+                    self.matched["request"] += 1
+                    return self._next(key, records)
+            records = self._by_prompt.get(prompt_hash(prompt_text))
+            if records:
+                self.matched["prompt"] += 1
+                return self._next(("prompt", records[0]["promptHash"]), records)
+            self.matched["model"] += 1
+            records = self._by_model.get(model) or self._all
+            return self._next(("model", model), records)
+
+    def stats(self) -> dict:
+        return {"path": self.path, "recordedCalls": len(self._all), "matchedBy": dict(self.matched)}
+
+
+class ReplayLLM:
+    """
+    Stands in for a provider client: blocks for the recorded latency
+    (scaled by LLM_REPLAY_LATENCY_SCALE) and returns the recorded response
+    """
+
+    def __init__(self, store: ReplayStore, model: str):
+        self.store = store
+        self.model = model
+
+    def invoke(self, prompt, *args, **kwargs):
+        prompt_text = prompt if isinstance(prompt, str) else str(prompt)
+        record = self.store.pick(self.model, prompt_text)
+        time.sleep(record["ms"] / 1000 * LLM_REPLAY_LATENCY_SCALE)
+        usage = record.get("usage") or [0, 0]
+        return SimpleNamespace(
+            content=record["response"],
+            usage_metadata={"input_tokens": usage[0], "output_tokens": usage[1]},
+        )
+
+
+_replay_store = None
+_replay_lock = threading.Lock()
+
+
+def replay_llm(model: str) -> ReplayLLM:
+    global _replay_store
+    with _replay_lock:
+        if _replay_store is None:
+            _replay_store = ReplayStore(LLM_REPLAY_PATH)
+    return ReplayLLM(_replay_store, model)
+
+
+def stats() -> dict:
+    return {
+        "capture": recorder.stats(),
+        "replay": _replay_store.stats() if _replay_store is not None else {"enabled": bool(LLM_REPLAY_PATH)},
+    }
+
+
+def close():
+    recorder.close()
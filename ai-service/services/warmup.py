@@ -0,0 +1,131 @@
+"""
+Warm-up Service - Startup pre-building of clients, prompts and indexes
+Readiness is tracked separately from liveness so orchestrators can hold
+traffic until the first request will not pay cold-start costs
+"""
+
+import os
+import time
+import asyncio
+import logging
+
+from services import llm_clients
+from services.prompt_store import compile_all
+from services.roadmap_library import library_stats
+from services.job_index import job_index
+
+logger = logging.getLogger(__name__)
+
+_steps = []
+_state = {
+    "ready": False,
+    "startedAt": None,
+    "finishedAt": None,
+    "durationSeconds": None,
+    "steps": {},
+    "failed": [],
+}
+
+
+def register_warmup_step(name: str, func):
+    """
+    Register a blocking callable to run during warm-up (e.g. loading an index)
+    """
+    _steps.append((name, func))
+
+
+def readiness() -> dict:
+    return dict(_state, steps=dict(_state["steps"]), failed=list(_state["failed"]))
+
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+
+# --------------------------------------------------
+# Built-in steps
+# --------------------------------------------------
+def _build_clients():
+    """
+    Import provider SDKs and build clients for every configured provider
+    """
+    # Imported here so the service modules' own get_llm() settings are used
+    from services import resume_analyzer, jd_matcher, jd_parser, chat_mentor, roadmap_generator
+
+    providers = llm_clients.configured_providers()
+    if "groq" in providers:
+        resume_analyzer.get_llm()
+        jd_matcher.get_llm()
+        jd_parser.get_llm()
+        chat_mentor.get_llm()
+    if "gemini" in providers or "openai" in providers:
+        try:
+            roadmap_generator.get_llm()
+        except ValueError as e:
+            logger.warning(f"Roadmap LLM not warmed: {e}")
+    return llm_clients.built_clients()
+
+
+def _ping_providers():
+    """
+    Send a one-word prompt through each built client so DNS, TLS and the
+    SDK connection pools are open before real traffic arrives
+    """
+    pinged = []
+    for key, client in list(llm_clients._clients.items()):
+        try:
+            client.invoke("Reply with OK")
+            pinged.append(f"{key[0]}:{key[1]}")
+        except Exception as e:
+            logger.warning(f"Warm-up ping failed for {key[0]}:{key[1]}: {e}")
+    return pinged
+
+
+register_warmup_step("clients", _build_clients)
+register_warmup_step("prompts", compile_all)
+register_warmup_step("roadmap_library", lambda: library_stats()["roles"])
+register_warmup_step("job_index", job_index.load)
+
+
+# --------------------------------------------------
+# Runner
+# --------------------------------------------------
+def run_warmup():
+    _state["startedAt"] = time.time()
+    _state["failed"] = []
+    steps = list(_steps)
+    if os.getenv("WARMUP_PING_PROVIDERS", "false").lower() == "true":
+        steps.append(("connections", _ping_providers))
+
+    for name, func in steps:
+        started = time.perf_counter()
+        try:
+            detail = func()
+            _state["steps"][name] = {
+                "ok": True,
+                "seconds": round(time.perf_counter() - started, 4),
+                "detail": detail,
+            }
+        except Exception as e:
+            logger.error(f"Warm-up step '{name}' failed: {e}")
+            _state["failed"].append(name)
+            _state["steps"][name] = {
+                "ok": False,
+                "seconds": round(time.perf_counter() - started, 4),
+                "error": str(e),
+            }
+
+    _state["finishedAt"] = time.time()
+    _state["durationSeconds"] = round(_state["finishedAt"] - _state["startedAt"], 4)
+    # A failed step is reported (logged, listed under "failed") but does not
+    # block readiness: the affected path falls back to building lazily on first use
+    _state["ready"] = True
+    if _state["failed"]:
+        logger.warning(f"Warm-up finished in {_state['durationSeconds']}s with failed steps: {', '.join(_state['failed'])}")
+    else:
+        logger.info(f"Warm-up finished in {_state['durationSeconds']}s")
+    return readiness()
+
+
+async def warm_up():
+    await asyncio.to_thread(run_warmup)
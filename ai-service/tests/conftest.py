@@ -0,0 +1,10 @@
+import os
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+# Never touch real providers, the shared job database or a capture file from tests
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+os.environ.pop("TRAFFIC_CAPTURE_PATH", None)
+os.environ.pop("LLM_REPLAY_PATH", None)
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from services import admission
+from services.admission import AdaptiveLimiter, AdmissionController, Overloaded
+
+
+def limiter(limit=1, queue=2, max=4):
+    return AdaptiveLimiter("test", "standard", limit=limit, min=1, max=max, queue=queue, target_ms=1000)
+
+
+def test_routes_match_method_and_path():
+    controller = AdmissionController()
+    controller.route(r"^/ai/chat$", "light")
+    assert controller.limiter_for("POST", "/ai/chat").klass == "light"
+    assert controller.limiter_for("GET", "/ai/chat") is None
+    assert controller.limiter_for("POST", "/ai/other") is None
+
+
+def test_full_queue_is_shed():
+    async def scenario():
+        lim = limiter(limit=1, queue=1)
+        await lim.acquire()
+        waiting = asyncio.ensure_future(lim.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as e:
+            await lim.acquire()
+        assert e.value.retry_after >= 1
+        lim.release(0.01, congested=False)
+        await waiting
+        return lim
+
+    lim = asyncio.run(scenario())
+    assert lim.inflight == 1 and lim.shed == 1 and lim.admitted == 2
+
+
+def test_queue_timeout_sheds(monkeypatch):
+    monkeypatch.setattr(admission, "QUEUE_TIMEOUT", 0.01)
+
+    async def scenario():
+        lim = limiter()
+        await lim.acquire()
+        with pytest.raises(Overloaded):
+            await lim.acquire()
+        return lim
+
+    lim = asyncio.run(scenario())
+    assert lim.inflight == 1 and lim.stats()["queued"] == 0
+
+
+def test_cancelled_waiter_hands_its_slot_on():
+    async def scenario():
+        lim = limiter(limit=1, queue=4, max=1)
+        await lim.acquire()
+        first = asyncio.ensure_future(lim.acquire())
+        second = asyncio.ensure_future(lim.acquire())
+        await asyncio.sleep(0)
+        # The slot goes to `first`, which is cancelled before it resumes
+        lim.release(0.01, congested=False)
+        first.cancel()
+        (outcome,) = await asyncio.gather(first, return_exceptions=True)
+        if outcome is None:
+            # Python < 3.12 wait_for may swallow the late cancel; the request
+            # then runs and releases its slot as usual
+            lim.release(0.01, congested=False)
+        await asyncio.wait_for(second, 1)
+        return lim
+
+    lim = asyncio.run(scenario())
+    assert lim.inflight == 1
+
+
+def test_slow_or_failed_responses_lower_the_limit():
+    lim = limiter(limit=4)
+    lim.inflight = 1
+    lim.release(5.0, congested=False)
+    assert lim.limit == pytest.approx(3.2)
+    lim.inflight = 1
+    # A second congestion signal inside the cooldown is ignored
+    lim.release(0.01, congested=True)
+    assert lim.limit == pytest.approx(3.2)
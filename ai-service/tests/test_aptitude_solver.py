@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from services.aptitude_solver import solve_aptitude_question, evaluate_expression, format_number
+
+
+def answer(question):
+    solution = solve_aptitude_question(question)
+    return solution and solution["answer"]
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("What is 12*(3+4)?", "84"),
+    ("25% of 480", "120"),
+    ("Simplify 3^4 - 17", "64"),
+    ("5C2", "10"),
+    ("A car travels 120 km in 2 hours. What is its speed?", "60 km/h"),
+    ("Calculate the distance covered at 60 km/h in 90 minutes", "90 km"),
+    ("A 150 m long train running at 36 km/h passes a pole. Find the time taken.", "15 seconds"),
+    ("A train 150 m long passes a pole in 15 seconds. Find its speed.", "36 km/h"),
+    ("A can finish a job in 10 days and B can finish it in 15 days. How long will they take working together?",
+     "6 days"),
+    ("Divide 1200 in the ratio 1:2", "400 : 800"),
+])
+def test_supported_templates(question, expected):
+    assert answer(question) == expected
+
+
+@pytest.mark.parametrize("question", [
+    # Extra lengths: the platform has to be added to the train
+    "A 150 m long train crosses a 250 m platform at 36 km/h. How long does it take?",
+    # Relative motion
+    "Two trains 100 m and 150 m long run at 36 km/h and 54 km/h in opposite directions. "
+    "In how long do they cross each other?",
+    # Emptying pipe
+    "Pipe A fills a tank in 6 hours and pipe B empties it in 8 hours. If both are opened together, how long to fill?",
+    # Leave/join structure
+    "A can do a work in 10 days and B in 15 days. They work together for 2 days, then A leaves. "
+    "In how many days is the work finished?",
+    # The combined time is given, not asked
+    "A and B together can do a job in 12 days. A can do it in 20 days. How long does B take?",
+    # Mixed units
+    "A can fill a tank in 2 hours and B in 90 minutes. How long together?",
+])
+def test_multi_step_problems_are_left_to_the_llm(question):
+    assert solve_aptitude_question(question) is None
+
+
+def test_explanations_are_never_plain():
+    assert solve_aptitude_question("Explain 25% of 480")["plain"] is False
+
+
+@pytest.mark.parametrize("expression", [
+    "((((((9**64)**64)**64)**64)**64)**64)",
+    "*".join(["(9**64)"] * 25),
+    "-" * 200 + "1",
+])
+def test_evaluator_refuses_huge_or_deep_expressions_quickly(expression):
+    started = time.perf_counter()
+    with pytest.raises((ValueError, RecursionError, SyntaxError, MemoryError)):
+        evaluate_expression(expression)
+    assert time.perf_counter() - started < 0.5
+    assert solve_aptitude_question(expression) is None
+
+
+def test_evaluator_is_exact():
+    assert evaluate_expression("1/3 + 1/6") * 2 == 1
+    assert format_number(evaluate_expression("1/3")) == "1/3 (≈ 0.3333)"
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("what is 15% of 40% of 200", "12"),
+    ("What is 15% of 240?", "36"),
+    ("Find the value of 8C2?", "28"),
+    ("factorial of 6", "720"),
+])
+def test_plain_templates_only_answer_the_whole_question(question, expected):
+    solution = solve_aptitude_question(question)
+    assert solution["answer"] == expected and solution["plain"] is True
+
+
+@pytest.mark.parametrize("question", [
+    "what is 20C3 + 5",
+    "Find 20% of 500 and then add 10",
+    "What is 5! + 1",
+    "In how many ways can 5 people be arranged in a row if 2 must sit together?",
+    "In how many ways can 6 people be seated in a row so that A is not at either end?",
+])
+def test_leftover_steps_and_constraints_are_left_to_the_llm(question):
+    assert solve_aptitude_question(question) is None
+
+
+def test_template_inside_a_word_problem_is_only_a_hint():
+    solution = solve_aptitude_question("A shop sells 20% of 500 apples; how many are sold?")
+    assert solution["answer"] == "100" and solution["plain"] is False
+    assert solve_aptitude_question("In how many ways can 5 people be arranged in a row?")["plain"] is False
@@ -0,0 +1,72 @@
+from services.code_prepass import analyze_message, analyze_python, analyze_c_family
+
+
+def fenced(language, code, prose="what's wrong?"):
+    return f"{prose}\n```{language}\n{code}\n```"
+
+
+def test_indented_method_paste_parses():
+    code = "    def area(self):\n        return self.w * self.h\n"
+    result = analyze_python(code)
+    assert result["syntaxErrors"] == []
+    assert [f["name"] for f in result["functions"]] == ["area"]
+
+
+def test_indentation_errors_are_not_answered_locally():
+    analysis = analyze_message(fenced("python", "def f():\n    x = 1\n      y = 2"))
+    assert analysis["hasSyntaxErrors"] and not analysis["pureSyntaxError"]
+
+
+def test_definite_python_error_is_answered_locally():
+    analysis = analyze_message(fenced("python", "def f(:\n    return 1"))
+    assert analysis["pureSyntaxError"]
+
+
+def test_null_bytes_do_not_raise():
+    analysis = analyze_message(fenced("python", "x = 1\x00"))
+    assert not analysis["pureSyntaxError"]
+
+
+def test_js_regex_literal_is_not_a_string():
+    result = analyze_c_family("const s = text.replace(/'/g, \"\");\nconst t = a / b / c;", "javascript")
+    assert result["syntaxErrors"] == []
+    assert analyze_c_family("if (/[(]/.test(s)) { run(); }", "javascript")["syntaxErrors"] == []
+
+
+def test_js_stray_quote_is_uncertain():
+    analysis = analyze_message(fenced("javascript", "const el = <p>Don't stop</p>;"))
+    assert analysis["hasSyntaxErrors"] and not analysis["pureSyntaxError"]
+
+
+def test_c_family_errors_are_reported():
+    result = analyze_c_family("int main() {\n  for (int i = 0; i < n; i++) {\n    x++;\n  }\n", "cpp")
+    assert result["syntaxErrors"]
+    assert analyze_c_family("long n = 1'000'000;", "cpp")["syntaxErrors"] == []
+
+
+def test_comprehension_generators_count_as_nested_loops():
+    assert analyze_python("[y for y in x for z in x]")["maxLoopDepth"] == 2
+    assert analyze_python("[y for y in x]\n[z for z in x]")["maxLoopDepth"] == 1
+    assert analyze_python("for a in x:\n    s = {b: c for b in a for c in b}")["maxLoopDepth"] == 3
+
+
+JAVA = """import java.util.*;
+
+public class Main {
+    public static void main(String[] args) {
+        List<Integer> xs = new ArrayList<>();
+        System.out.println(xs.size());
+    }
+}"""
+
+
+def test_untagged_java_is_not_parsed_as_python():
+    analysis = analyze_message(f"what is wrong with this?\n```\n{JAVA}\n```")
+    assert analysis["blocks"][0]["language"] == "java"
+    assert not analysis["pureSyntaxError"]
+
+
+def test_errors_in_guessed_languages_are_uncertain():
+    analysis = analyze_message("what is wrong with this?\n```\nimport os\ndef f(:\n    return 1\n```")
+    assert analysis["blocks"][0]["language"] == "python"
+    assert analysis["hasSyntaxErrors"] and not analysis["pureSyntaxError"]
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+
+from services.cohort_analytics import Cohort
+
+SKILLS = ["python", "java", "sql", "docker", "react", "aws", "git", "linux", "kubernetes", "excel"]
+METADATA = ("cohortId", "version", "computeMs", "cached")
+
+
+def rebuilt(cohort: Cohort) -> Cohort:
+    fresh = Cohort(cohort.cohort_id)
+    fresh.upsert_jds([
+        {"id": jd["id"], "title": jd["title"], "required_skills": [cohort._skills[k] for k in jd["required"]],
+         "preferred_skills": [cohort._skills[k] for k in jd["preferred"]]}
+        for jd in cohort._jds
+    ])
+    fresh.upsert_students([
+        {"id": sid, "skills": [cohort._skills[k] for k in cols]}
+        for sid, cols in zip(cohort._student_ids, cohort._student_cols)
+    ])
+    return fresh
+
+
+def content(report: dict) -> dict:
+    return {k: v for k, v in report.items() if k not in METADATA}
+
+
+def test_incremental_updates_match_a_full_rebuild():
+    rng = random.Random(7)
+    cohort = Cohort("batch")
+    cohort.upsert_jds([{"id": f"jd{j}", "required_skills": rng.sample(SKILLS, 4)} for j in range(6)])
+    cohort.upsert_students([{"id": f"s{i}", "skills": rng.sample(SKILLS, 5)} for i in range(20)])
+    cohort.report()
+
+    for i in range(40):
+        cohort.upsert_students([{"id": f"n{i}", "skills": rng.sample(SKILLS, 4)}])
+    cohort.upsert_students([{"id": "s3", "skills": ["python"]}, {"id": "late", "skills": ["sql", "excel"]}])
+    assert cohort.remove_student("s0") and cohort.remove_student("n39")
+    assert not cohort.remove_student("missing")
+
+    report = cohort.report()
+    assert report["students"] == 59
+    assert content(report) == content(rebuilt(cohort).report())
+
+
+def test_new_students_grow_match_counts_in_amortized_steps():
+    cohort = Cohort("batch")
+    cohort.upsert_jds([{"id": "jd", "required_skills": ["python", "sql"]}])
+    cohort.upsert_students([{"id": "first", "skills": ["python"]}])
+    cohort.report()
+    buffers = set()
+    for i in range(100):
+        cohort.upsert_students([{"id": str(i), "skills": ["python", "sql"]}])
+        buffers.add(id(cohort._matched_buffer))
+    # Doubling from 1 to 101 rows reallocates 7 times, not 100
+    assert len(buffers) <= 8
+    assert np.array_equal(cohort._matched[:, 0], [1] + [2] * 100)
+
+
+def test_jd_changes_invalidate_and_reports_are_cached():
+    cohort = Cohort("batch")
+    cohort.upsert_students([{"id": "a", "skills": ["python", "sql"]}, {"id": "b", "skills": ["java"]}])
+    cohort.upsert_jds([{"id": "jd", "required_skills": ["python", "sql"]}])
+    first = cohort.report()
+    assert first["perJd"][0]["eligibleStudents"] == 1
+    assert cohort.report().get("cached")
+
+    cohort.upsert_jds([{"id": "jd", "required_skills": ["java"]}])
+    assert cohort.report()["perJd"][0]["eligibleStudents"] == 1
+    assert cohort.remove_jd("jd") and cohort.report()["perJd"] == []
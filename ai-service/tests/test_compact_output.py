@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+from services.compact_output import (
+    COMPACT_FORMAT_ERRORS,
+    REVISION_ROUND,
+    parse_compact,
+    expand_prep_plan,
+    compact_prep_plan,
+    expand_roadmap,
+    compact_roadmap,
+    expand_compare,
+    compact_compare,
+)
+
+ROUNDS = [
+    {"roundName": "DSA", "roundType": "coding", "description": "Two problems"},
+    {"roundName": "HR", "roundType": "hr"},
+]
+
+
+def test_parse_compact_strips_fences():
+    assert parse_compact('```json\n{"w": []}\n```') == {"w": []}
+    assert parse_compact('```\n{"a": 1}```') == {"a": 1}
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        parse_compact("Sure! Here is your plan")
+
+
+def test_expand_prep_plan_fills_local_boilerplate():
+    compact = {
+        "s": "Arrays first",
+        "d": [
+            [1, "Arrays", ["two pointers"], [["Solve 5 problems", 2, "h"], "Review notes"], ["LeetCode"], ["5 solved"]],
+            [9, "Mocks", "behavioral", []],
+        ],
+        "k": "products",
+    }
+    plan = expand_prep_plan(compact, ROUNDS, "2026-11-01", 14, today=datetime(2026, 10, 19))
+    first, second = plan["dailyPlan"]
+    assert plan["totalDays"] == 14 and plan["companyResearch"] == {"keyAreas": ["products"], "questionsToAsk": []}
+    assert first["date"] == "2026-10-19" and first["focusRound"] == "DSA"
+    assert first["tasks"] == [
+        {"task": "Solve 5 problems", "timeAllocation": "2 hours", "priority": "high"},
+        {"task": "Review notes", "timeAllocation": "1 hour", "priority": "medium"},
+    ]
+    assert first["tips"].startswith("State the brute force")
+    # Unknown round index -> revision day; missing trailing fields -> empty
+    assert second["focusRound"] == REVISION_ROUND and second["topics"] == ["behavioral"]
+    assert second["resources"] == [] and second["goals"] == []
+
+
+def test_prep_plan_round_trips():
+    compact = {"s": "x", "d": [[2, "Story", ["STAR"], [["Write stories", 1.5, "l"]], [], ["3 stories"]]],
+               "k": [], "q": ["Team size?"]}
+    plan = expand_prep_plan(compact, ROUNDS, "2026-11-01", 1, today=datetime(2026, 10, 19))
+    assert compact_prep_plan(plan, ROUNDS) == compact
+
+
+def test_empty_or_malformed_prep_plan_is_a_format_error():
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_prep_plan({"d": []}, ROUNDS, "2026-11-01", 3)
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_prep_plan({"days": []}, ROUNDS, "2026-11-01", 3)
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_prep_plan({"d": [5]}, ROUNDS, "2026-11-01", 3)
+
+
+def test_tasks_must_be_a_list_of_task_arrays():
+    # A bare string would otherwise expand into one task per character
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_prep_plan({"d": [[1, "Arrays", [], "Solve 5 problems"]]}, ROUNDS, "2026-11-01", 1)
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_prep_plan({"d": [[1, "Arrays", [], [{"task": "Solve"}]]]}, ROUNDS, "2026-11-01", 1)
+
+
+def test_roadmap_round_trips_and_numbers_weeks():
+    roadmap = expand_roadmap({"w": [["Basics", ["syntax"], "one task"], ["DSA", [], []]]})
+    assert [w["weekNumber"] for w in roadmap["weeks"]] == [1, 2]
+    assert roadmap["weeks"][0]["tasks"] == ["one task"]
+    assert expand_roadmap(compact_roadmap(roadmap)) == roadmap
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_roadmap({"w": []})
+
+
+def test_compare_clamps_scores_and_requires_them():
+    result = expand_compare({"a": 104.6, "m": "71.4", "s": "Clear impact", "x": ["docker"]})
+    assert result["atsScore"] == 100 and result["matchScore"] == 71
+    assert result["strengths"] == ["Clear impact"] and result["weaknesses"] == []
+    assert expand_compare(compact_compare(result)) == result
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_compare({"m": 50})
+    with pytest.raises(COMPACT_FORMAT_ERRORS):
+        expand_compare({"a": "high", "m": 50})
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services import diagnostics
+from services.diagnostics import LoopMonitor, ProfilerBusyError, sample_profile
+
+
+def block_the_loop(seconds):
+    # Stands in for sync work (an LLM SDK call, a big json.dumps) run on the loop
+    time.sleep(seconds)
+
+
+def test_blocked_loop_is_detected_and_reported(monkeypatch):
+    monitor = LoopMonitor(interval=0.02, stall_threshold=0.1)
+    monkeypatch.setattr(diagnostics, "loop_monitor", monitor)
+    profile = {}
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.1)
+        assert monitor.stall_count == 0
+
+        profiler = threading.Thread(target=lambda: profile.update(sample_profile(0.3, loop_only=True)))
+        profiler.start()
+        block_the_loop(0.4)
+        # Let the lag timer fire once more to record the late tick
+        await asyncio.sleep(0.05)
+        profiler.join()
+        stats = monitor.stats()
+        monitor.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["stalls"] >= 1
+    assert stats["maxLagSinceStartMs"] >= 300
+    assert stats["lagMs"]["max"] >= 300
+    stall = stats["recentStalls"][0]
+    assert stall["blockedMs"] >= 100
+    assert "block_the_loop" in stall["stack"]
+
+    hottest = profile["collapsed"].split("\n")[0]
+    assert hottest.startswith("event-loop;") and "block_the_loop" in hottest
+
+
+def test_idle_loop_reports_no_stalls():
+    monitor = LoopMonitor(interval=0.02, stall_threshold=0.1)
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.3)
+        stats = monitor.stats()
+        monitor.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["samples"] >= 5
+    assert stats["stalls"] == 0 and stats["recentStalls"] == []
+
+
+def test_only_one_profile_runs_at_a_time():
+    started = threading.Event()
+
+    def first():
+        started.set()
+        sample_profile(0.3)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    started.wait()
+    time.sleep(0.05)
+    with pytest.raises(ProfilerBusyError):
+        sample_profile(0.1)
+    thread.join()
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services import full_analysis
+from services.full_analysis import run_full_analysis, stream_full_analysis
+
+
+@pytest.fixture
+def parts(monkeypatch):
+    """
+    Stub both LLM halves; `gates[part]` holds a part until it is set
+    """
+    gates = {"analysis": threading.Event(), "comparison": threading.Event()}
+    failures = {}
+
+    def make(part, result):
+        def run(*args):
+            gates[part].wait(5)
+            if part in failures:
+                raise failures[part]
+            return result
+        return run
+
+    monkeypatch.setattr(full_analysis, "normalize_resume_text", lambda text: text)
+    monkeypatch.setattr(full_analysis, "run_resume_analysis", make("analysis", {"overallScore": 80}))
+    monkeypatch.setattr(full_analysis, "run_resume_jd_comparison", make("comparison", {"matchScore": 65}))
+    return gates, failures
+
+
+def test_run_full_analysis_merges_both_parts(parts):
+    gates, _ = parts
+    for gate in gates.values():
+        gate.set()
+    assert asyncio.run(run_full_analysis("resume", "jd", "SDE")) == {"overallScore": 80, "matchScore": 65}
+
+
+def test_run_full_analysis_fails_fast_when_one_part_fails(parts):
+    gates, failures = parts
+    failures["comparison"] = ValueError("bad JSON from model")
+    gates["comparison"].set()
+
+    async def scenario():
+        started = time.perf_counter()
+        with pytest.raises(ValueError):
+            await run_full_analysis("resume", "jd", "SDE")
+        elapsed = time.perf_counter() - started
+        gates["analysis"].set()
+        return elapsed
+
+    # The slow analysis half is not waited for
+    assert asyncio.run(scenario()) < 1
+
+
+def test_stream_yields_parts_in_completion_order_then_done(parts):
+    gates, _ = parts
+
+    async def scenario():
+        events = []
+        gates["comparison"].set()
+        async for event in stream_full_analysis("resume", "jd", "SDE"):
+            events.append(event)
+            if event["part"] == "comparison":
+                gates["analysis"].set()
+        return events
+
+    events = asyncio.run(scenario())
+    assert [e["part"] for e in events] == ["comparison", "analysis", "done"]
+    assert events[0]["data"] == {"matchScore": 65}
+    assert events[1]["data"] == {"overallScore": 80}
+
+
+def test_stream_reports_a_failed_part_and_keeps_the_other(parts):
+    gates, failures = parts
+    failures["analysis"] = RuntimeError("rate limited")
+    gates["analysis"].set()
+
+    async def scenario():
+        events = []
+        async for event in stream_full_analysis("resume", "jd", "SDE"):
+            events.append(event)
+            gates["comparison"].set()
+        return events
+
+    events = asyncio.run(scenario())
+    assert [e["part"] for e in events] == ["analysis", "comparison", "done"]
+    assert events[0]["error"] == "rate limited" and events[0]["errorType"] == "RuntimeError"
+    assert "data" not in events[0]
+    assert events[1]["data"] == {"matchScore": 65}
+
+
+def test_client_disconnect_cancels_the_pending_part(parts, monkeypatch):
+    gates, _ = parts
+    cancelled = []
+    real_cancel = full_analysis._cancel
+
+    async def spy(tasks):
+        cancelled.extend(tasks.values())
+        await real_cancel(tasks)
+
+    monkeypatch.setattr(full_analysis, "_cancel", spy)
+
+    async def scenario():
+        gates["analysis"].set()
+        stream = stream_full_analysis("resume", "jd", "SDE")
+        first = await stream.__anext__()
+        started = time.perf_counter()
+        await stream.aclose()
+        elapsed = time.perf_counter() - started
+        gates["comparison"].set()
+        return first, elapsed
+
+    first, elapsed = asyncio.run(scenario())
+    assert first["part"] == "analysis"
+    assert elapsed < 1
+    assert len(cancelled) == 1 and cancelled[0].cancelled()
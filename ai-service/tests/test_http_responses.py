@@ -0,0 +1,116 @@
+import asyncio
+import gzip
+
+import pytest
+
+from services import http_responses
+from services.http_responses import CompressionMiddleware, choose_encoding
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    monkeypatch.setattr(http_responses, "brotli", object())
+
+
+@pytest.fixture
+def without_brotli(monkeypatch):
+    monkeypatch.setattr(http_responses, "brotli", None)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0.0, gzip;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("identity;q=0, gzip", "gzip"),
+    ("identity;q=0", None),
+    ("*", "br"),
+    ("*;q=0.1, br;q=0", "gzip"),
+    ("*;q=0", None),
+    ("gzip;q=oops", None),
+    ("", None),
+])
+def test_choose_encoding_honours_q_values(with_brotli, header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_choose_encoding_without_brotli(without_brotli):
+    assert choose_encoding("br, gzip;q=0.5") == "gzip"
+    assert choose_encoding("br") is None
+
+
+def run(app, accept_encoding="gzip", minimum_size=100, sent=None):
+    """
+    Drive the middleware with one request; returns the messages sent
+    """
+    sent = [] if sent is None else sent
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, receive, send))
+    return sent
+
+
+def body_app(body: bytes, content_type=b"application/json"):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", content_type), (b"content-length", str(len(body)).encode())
+        ]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+def headers_of(messages):
+    return {k.decode().lower(): v.decode() for k, v in messages[0]["headers"]}
+
+
+def test_large_responses_are_compressed_with_vary(without_brotli):
+    body = b'{"weeks": "' + b"x" * 500 + b'"}'
+    sent = run(body_app(body))
+    headers = headers_of(sent)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(sent[1]["body"])
+    assert gzip.decompress(sent[1]["body"]) == body
+
+
+def test_small_responses_are_left_alone(without_brotli):
+    sent = run(body_app(b'{"ok": true}'))
+    headers = headers_of(sent)
+    assert "content-encoding" not in headers and "vary" not in headers
+    assert sent[1]["body"] == b'{"ok": true}'
+
+
+def test_clients_that_refuse_compression_get_identity(without_brotli):
+    body = b"x" * 500
+    sent = run(body_app(body), accept_encoding="gzip;q=0")
+    assert "content-encoding" not in headers_of(sent)
+    assert sent[1]["body"] == body
+
+
+def test_event_streams_are_never_buffered(without_brotli):
+    sent = run(body_app(b"data: " + b"x" * 500 + b"\n\n", content_type=b"text/event-stream"))
+    assert "content-encoding" not in headers_of(sent)
+
+
+def test_streamed_chunks_are_forwarded_as_they_are_produced(without_brotli):
+    forwarded = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        for i in range(3):
+            await send({"type": "http.response.body", "body": b"x" * 500, "more_body": True})
+            # The chunk already reached the client before the next one is produced
+            forwarded.append(len(sent_messages))
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent_messages = []
+    run(app, sent=sent_messages)
+    assert forwarded == [2, 3, 4]
+    assert "content-encoding" not in headers_of(sent_messages)
+    assert [m.get("body") for m in sent_messages[1:4]] == [b"x" * 500] * 3
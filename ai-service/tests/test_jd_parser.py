@@ -0,0 +1,95 @@
+import threading
+import time
+
+from services import jd_parser
+from services.jd_parser import ParsedJDCache, parse_job_description
+
+
+def test_hit_returns_the_cached_value():
+    cache = ParsedJDCache(max_entries=4)
+    calls = []
+    assert cache.get_or_parse("a", lambda: calls.append(1) or {"v": 1}) == {"v": 1}
+    assert cache.get_or_parse("a", lambda: calls.append(1) or {"v": 2}) == {"v": 1}
+    assert len(calls) == 1
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ParsedJDCache(max_entries=2)
+    cache.get_or_parse("a", lambda: "A")
+    cache.get_or_parse("b", lambda: "B")
+    cache.get_or_parse("a", lambda: "A2")  # "a" is now the most recent
+    cache.get_or_parse("c", lambda: "C")
+    assert cache.get_or_parse("a", lambda: "A3") == "A"
+    assert cache.get_or_parse("b", lambda: "B2") == "B2"
+
+
+def test_concurrent_misses_parse_once():
+    cache = ParsedJDCache()
+    calls = []
+    release = threading.Event()
+
+    def parse():
+        calls.append(1)
+        release.wait(5)
+        return {"parsed": True}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_parse("jd", parse))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Every thread is now either parsing or waiting on the in-flight parse
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"parsed": True}] * 8
+    assert cache.stats()["misses"] == 1
+
+
+def test_failed_parse_is_not_cached_and_waiters_retry():
+    cache = ParsedJDCache()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("LLM down")
+        return "ok"
+
+    try:
+        cache.get_or_parse("jd", flaky)
+    except RuntimeError:
+        pass
+    assert cache.get_or_parse("jd", flaky) == "ok"
+    assert len(attempts) == 2
+
+
+JD = (
+    "Data Engineer\n"
+    "Requirements:\n"
+    "- Python, SQL and Apache Spark for batch pipelines over terabytes of event data\n"
+    "- Experience with Airflow and AWS\n"
+    "Benefits:\n"
+    "- Free snacks and a gym membership\n"
+    "We are an equal opportunity employer; all qualified applicants will be considered.\n"
+)
+
+
+def test_boilerplate_is_removed_and_reformatted_jds_share_a_parse(monkeypatch):
+    monkeypatch.setattr(jd_parser, "jd_cache", ParsedJDCache())
+    seen = []
+
+    def fake_extract(clean_jd):
+        seen.append(clean_jd)
+        return {"requiredSkills": ["python"]}
+
+    monkeypatch.setattr(jd_parser, "_extract_requirements", fake_extract)
+    first = parse_job_description(JD)
+    second = parse_job_description(JD.replace("\n", "\r\n").replace("Python, SQL", "Python,  SQL"))
+
+    assert len(seen) == 1
+    assert first == second and first["requiredSkills"] == ["python"]
+    assert "Apache Spark" in seen[0]
+    assert "snacks" not in seen[0] and "equal opportunity" not in seen[0]
@@ -0,0 +1,77 @@
+from services.job_index import JobIndex
+
+PYTHON_JD = "Backend developer building REST APIs with Python, Django and PostgreSQL"
+REACT_JD = "Frontend developer building web apps with React, TypeScript and CSS"
+JAVA_JD = "Java engineer working on Spring Boot microservices and Kafka"
+RESUME = "Built Django REST APIs backed by PostgreSQL; strong Python skills"
+
+
+def build(index_dir=None):
+    index = JobIndex(index_dir=index_dir, dim=256)
+    index.load()
+    index.upsert("py", "Backend Developer", PYTHON_JD, owner="alice")
+    index.upsert("fe", "Frontend Developer", REACT_JD, owner="alice")
+    index.upsert("java", "Java Engineer", JAVA_JD, owner="bob")
+    return index
+
+
+def ids(result):
+    return [match["id"] for match in result["matches"]]
+
+
+def test_query_ranks_the_closest_job_first():
+    result = build().query(RESUME, ["python"], top_n=3)
+    assert ids(result)[0] == "py"
+    assert "python" in result["matches"][0]["matchedSkills"]
+
+
+def test_upsert_replaces_the_existing_row():
+    index = build()
+    index.upsert("py", "Frontend Developer", REACT_JD + " and Next.js", owner="alice")
+    assert len(index) == 3
+    assert set(ids(index.query("React TypeScript web apps", top_n=2))) == {"py", "fe"}
+    assert index.query(REACT_JD, top_n=3)["matches"][0]["title"] == "Frontend Developer"
+    assert ids(index.query(RESUME, top_n=1)) != ["py"]
+
+
+def test_remove_swaps_rows_and_keeps_lookups_valid():
+    index = build()
+    assert index.remove("py") is True
+    assert index.remove("py") is False
+    assert len(index) == 2
+    # "java" was the last row and now fills the hole
+    assert ids(index.query(JAVA_JD, top_n=1)) == ["java"]
+    assert "py" not in ids(index.query(RESUME, top_n=5))
+
+
+def test_owner_filter_only_returns_that_users_jobs():
+    index = build()
+    assert set(ids(index.query(RESUME + " Java Kafka", top_n=5, owner="alice"))) <= {"py", "fe"}
+    assert ids(index.query(JAVA_JD, top_n=5, owner="bob")) == ["java"]
+    assert ids(index.query(RESUME, top_n=5, owner="carol")) == []
+
+
+def test_reload_memory_maps_the_saved_index(tmp_path):
+    index = build(str(tmp_path))
+    assert index.save() is True
+    assert index.save() is False
+    expected = index.query(RESUME, top_n=3, owner="alice")
+
+    reloaded = JobIndex(index_dir=str(tmp_path), dim=256)
+    assert reloaded.load()["memoryMapped"] is True
+    assert len(reloaded) == 3
+    # IDF is refreshed lazily in the live index, so compare rankings, not scores
+    assert ids(reloaded.query(RESUME, top_n=3, owner="alice")) == ids(expected)
+
+    # The first write copies out of the read-only mapping
+    reloaded.remove("py")
+    reloaded.upsert("go", "Go Developer", "Go services with gRPC and PostgreSQL", owner="bob")
+    assert reloaded.stats()["memoryMapped"] is False
+    assert ids(reloaded.query("gRPC Go services", top_n=1, owner="bob")) == ["go"]
+    assert "py" not in ids(reloaded.query(RESUME, top_n=5))
+
+
+def test_index_with_a_different_dim_starts_empty(tmp_path):
+    build(str(tmp_path)).save()
+    other = JobIndex(index_dir=str(tmp_path), dim=512)
+    assert other.load()["jobs"] == 0
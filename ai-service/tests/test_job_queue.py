@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from services.job_queue import JobQueue, make_dedup_key, JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(str(tmp_path / "jobs.sqlite3"), workers=2, result_ttl=60)
+    yield q
+    if q._conn:
+        q._conn.close()
+
+
+async def wait_for(queue, job_id):
+    async for job in queue.subscribe(job_id, keepalive=0.05):
+        last = job
+    return last
+
+
+def test_dedup_key_ignores_key_order():
+    assert make_dedup_key("roadmap", {"a": 1, "b": 2}) == make_dedup_key("roadmap", {"b": 2, "a": 1})
+    assert make_dedup_key("roadmap", {"a": 1}) != make_dedup_key("interview_prep", {"a": 1})
+
+
+def test_submit_unknown_type(queue):
+    with pytest.raises(ValueError):
+        queue.submit("nope", {})
+
+
+def test_identical_pending_jobs_are_collapsed_and_priority_bumped(queue):
+    queue.register("roadmap", lambda payload: payload)
+    first = queue.submit("roadmap", {"role": "x"}, priority=1)
+    second = queue.submit("roadmap", {"role": "x"}, priority=9)
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert second["jobId"] == first["jobId"]
+    assert queue.get(first["jobId"])["priority"] == 9
+
+
+def test_queue_position_follows_priority(queue):
+    queue.register("roadmap", lambda payload: payload)
+    low = queue.submit("roadmap", {"n": 1}, priority=1)
+    high = queue.submit("roadmap", {"n": 2}, priority=8)
+    assert queue.get(high["jobId"])["queuePosition"] == 0
+    assert queue.get(low["jobId"])["queuePosition"] == 1
+
+
+def test_cancel_only_queued_jobs(queue):
+    queue.register("roadmap", lambda payload: payload)
+    job = queue.submit("roadmap", {"n": 1})
+    assert queue.cancel(job["jobId"])
+    assert queue.get(job["jobId"])["status"] == JOB_CANCELLED
+    assert not queue.cancel(job["jobId"])
+
+
+def test_jobs_run_and_record_results_and_failures(queue):
+    def handler(payload):
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+        return {"echo": payload["n"]}
+
+    async def scenario():
+        queue.register("roadmap", handler)
+        await queue.start()
+        try:
+            ok = queue.submit("roadmap", {"n": 1})
+            bad = queue.submit("roadmap", {"n": 2, "fail": True})
+            return await wait_for(queue, ok["jobId"]), await wait_for(queue, bad["jobId"])
+        finally:
+            await queue.stop()
+
+    ok, bad = asyncio.run(scenario())
+    assert ok["status"] == JOB_SUCCEEDED and ok["result"] == {"echo": 1}
+    assert bad["status"] == JOB_FAILED and "boom" in bad["error"]
+
+
+def test_interrupted_jobs_are_requeued_on_start(queue):
+    queue.register("roadmap", lambda payload: payload)
+    job = queue.submit("roadmap", {"n": 1})
+    queue._claim_next()
+    assert queue.get(job["jobId"])["status"] == "running"
+
+    async def restart():
+        await queue.start()
+        try:
+            return await wait_for(queue, job["jobId"])
+        finally:
+            await queue.stop()
+
+    finished = asyncio.run(restart())
+    assert finished["status"] == JOB_SUCCEEDED
+    assert finished["attempts"] == 2
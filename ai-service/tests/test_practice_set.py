@@ -0,0 +1,60 @@
+import asyncio
+
+from services import practice_set, classroom_assistants
+from services.classroom_assistants import split_batched_answers, prepare_practice_question
+from services.practice_set import plan_batches, run_practice_set
+
+
+def test_split_on_standalone_markers_only():
+    reply = (
+        "### Q1\nUse a queue.\n```python\nq1 = deque()\n### Q2\n```\nQ2 of the BFS is done.\n"
+        "### q2\n### Q2  \nDijkstra.\n### Q9\nout of range"
+    )
+    answers = split_batched_answers(reply, 2)
+    assert answers[1].startswith("Use a queue.") and "q1 = deque()" in answers[1] and "### q2" in answers[1]
+    assert answers[2] == "Dijkstra."
+    assert 9 not in answers
+
+
+def test_split_ignores_indented_or_inline_markers():
+    answers = split_batched_answers("### Q1\nSee  ### Q2 below\n    ### Q2\nstill one", 2)
+    assert list(answers) == [1]
+
+
+def test_plain_calculations_are_local_and_word_problems_get_a_hint():
+    assert prepare_practice_question("aptitude", "What is 15% of 240?")["source"] == "solver"
+    prompt = prepare_practice_question(
+        "aptitude", "A can do a work in 10 days and B in 15 days. How long will they take working together?"
+    )["prompt"]
+    assert "Calculator hint - standard formula gives: 6 days" in prompt and "exactly" not in prompt
+    assert prepare_practice_question("technical", "What is 15% of 240?") == {"prompt": "What is 15% of 240?"}
+
+
+def test_plan_batches_is_even_and_contiguous():
+    questions = [f"Explain topic {i}" for i in range(7)]
+    local, batches = plan_batches(questions, "technical", batch_size=5)
+    assert local == {}
+    assert [[index for index, _, _ in batch] for batch in batches] == [[0, 1, 2, 3], [4, 5, 6]]
+
+
+def test_run_practice_set_merges_batches_in_order(monkeypatch):
+    def fake_batch(assistant, questions, prompts):
+        return {position: f"answer to {question}" for position, question in enumerate(questions)}
+
+    monkeypatch.setattr(practice_set, "answer_practice_batch", fake_batch)
+    result = asyncio.run(run_practice_set(["a", "b", "c"], "technical", batch_size=2))
+    assert [a["response"] for a in result["answers"]] == ["answer to a", "answer to b", "answer to c"]
+    assert result["batches"] == 2 and result["role"] == "technical_assistant"
+
+
+def test_missing_answers_fall_back_to_single_calls(monkeypatch):
+    class FakeLLM:
+        def invoke(self, prompt):
+            return type("Reply", (), {"content": "### Q1\nfirst"})()
+
+    monkeypatch.setattr(classroom_assistants, "get_llm", lambda: FakeLLM())
+    monkeypatch.setitem(classroom_assistants.PRACTICE_ASSISTANTS, "technical", (
+        classroom_assistants.TECHNICAL_PROMPT, lambda question: {"response": f"single {question}"}, "technical_assistant"
+    ))
+    answers = classroom_assistants.answer_practice_batch("technical", ["one", "two"], ["one", "two"])
+    assert answers == {0: "first", 1: "single two"}
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from services.job_queue import JobQueue
+from services.precompute import Precomputer, JOB_TYPE, request_key, personalize_roadmap
+
+ROADMAP = {"weeks": [
+    {"weekNumber": 1, "focus": "Python Basics", "topics": ["Python syntax"], "tasks": ["Scripts"]},
+    {"weekNumber": 2, "focus": "Linux", "topics": ["Linux shell"], "tasks": ["Cron jobs"]},
+    {"weekNumber": 3, "focus": "Docker", "topics": ["Docker images"], "tasks": ["Containerize an app"]},
+    {"weekNumber": 4, "focus": "Kubernetes", "topics": ["Kubernetes pods"], "tasks": ["Deploy"]},
+]}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(str(tmp_path / "jobs.sqlite3"), workers=1)
+    q.register(JOB_TYPE, lambda payload: ROADMAP)
+    yield q
+    if q._conn:
+        q._conn.close()
+
+
+def test_roadmap_key_ignores_skills():
+    typed = {"target_role": "Site Reliability  Engineer", "timeframe_months": 1, "current_skills": ["py"]}
+    extracted = {"target_role": "site reliability engineer", "timeframe_months": 1, "current_skills": []}
+    assert request_key("roadmap", typed) == request_key("roadmap", extracted)
+
+
+def test_personalize_drops_weeks_the_student_covers():
+    assert personalize_roadmap(ROADMAP, 1, ["Python"], ["python"]) is ROADMAP
+    personalized = personalize_roadmap(ROADMAP, 1, [], ["python"])
+    assert "Python Basics" not in [w["focus"] for w in personalized["weeks"]]
+    assert [w["weekNumber"] for w in personalized["weeks"]] == [1, 2, 3, 4]
+    # Too little left to fill the timeframe -> let the LLM do it
+    assert personalize_roadmap(ROADMAP, 1, [], ["python", "linux"]) is None
+    # The plan skipped fundamentals the requester does not have
+    assert personalize_roadmap(ROADMAP, 1, ["python", "git"], ["python"]) is None
+
+
+def test_library_roles_are_not_speculated(queue):
+    precomputer = Precomputer(queue)
+    assert precomputer.schedule("u1", "resume", [], target_role="Software Engineer", timeframe_months=5) == \
+        {"scheduled": 0}
+    assert precomputer.stats()["byKind"]["roadmap"]["librarySkipped"] == 1
+
+
+def test_typed_skills_hit_the_speculative_roadmap(queue):
+    precomputer = Precomputer(queue)
+
+    async def scenario():
+        await queue.start()
+        try:
+            precomputer.schedule("u1", "resume", [], target_role="Site Reliability Engineer",
+                                 timeframe_months=1)
+            job_id = next(iter(precomputer._entries.values()))["jobId"]
+            async for job in queue.subscribe(job_id, keepalive=0.05):
+                pass
+            request = {"target_role": "site reliability engineer", "timeframe_months": 1,
+                       "current_skills": ["linux"]}
+            # Built from u1's resume: never served to anyone else
+            other = await precomputer.lookup("roadmap", request, "u2")
+            anonymous = await precomputer.lookup("roadmap", request)
+            return other, anonymous, await precomputer.lookup("roadmap", request, "u1")
+        finally:
+            await queue.stop()
+
+    other, anonymous, result = asyncio.run(scenario())
+    assert other is None and anonymous is None
+    assert result is not None and "Linux" not in [w["focus"] for w in result["weeks"]]
+    assert precomputer.stats()["byKind"]["roadmap"]["hits"] == 1
+
+
+def test_user_state_is_bounded(queue):
+    precomputer = Precomputer(queue, max_users=2)
+    for user in ("u1", "u2", "u3"):
+        precomputer.schedule(user, f"resume {user}", [], target_role="Site Reliability Engineer")
+    assert list(precomputer._users) == ["u2", "u3"]
+    assert {user for user, _ in precomputer._entries} == {"u2", "u3"}
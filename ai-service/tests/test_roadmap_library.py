@@ -0,0 +1,60 @@
+from services import roadmap_library
+from services.roadmap_library import roadmap_from_library, match_role, personalize, fits, _repack
+
+UNITS = [
+    [f"Topic {n}", [f"t{n}a", f"t{n}b", f"t{n}c"], [f"task {n}"], [tag]]
+    for n, tag in enumerate(["python", "sql", "git", "docker", "react", "aws"], start=1)
+] + [["Capstone Project", ["Build it"], ["Ship it"], []]]
+
+
+def week(focus, weight=1.0):
+    return {"focus": focus, "parts": [focus], "topics": [focus], "tasks": [], "weight": weight}
+
+
+def test_match_role_uses_aliases():
+    assert match_role("SDE-1") == "sde"
+    assert match_role("Senior Backend Engineer") == "sde"
+    assert match_role("Astronaut") is None
+
+
+def test_match_role_prefers_the_most_specific_role():
+    assert match_role("Frontend Software Engineer") == "frontend"
+    assert match_role("Software Engineer - Frontend") == "frontend"
+    assert match_role("Machine Learning Software Engineer") == "ml_engineer"
+    assert match_role("Senior Software Engineer") == "sde"
+    # Equally specific matches for two roles are left to the LLM
+    assert match_role("Backend and Frontend Developer") is None
+
+
+def test_repack_merges_lightest_pair_and_pads_before_closing_weeks():
+    merged = _repack([week("A"), week("B", 0.5), week("C", 0.5), week("D")], 3)
+    assert [w["focus"] for w in merged] == ["A", "B & C", "D"]
+
+    padded = _repack([week("A"), week("B"), week("Capstone Project")], 5)
+    assert [w["focus"] for w in padded] == [
+        "A", "Practice Sprint: A", "B", "Practice Sprint: B", "Capstone Project"
+    ]
+
+
+def test_known_skills_drop_or_shorten_weeks():
+    weeks = personalize(UNITS, ["Python", "SQL"], 5)
+    assert [w["weekNumber"] for w in weeks] == [1, 2, 3, 4, 5]
+    assert "Topic 1" not in [w["focus"] for w in weeks]
+    assert weeks[-1]["focus"] == "Capstone Project"
+
+
+def test_timeframes_far_from_the_curriculum_go_to_the_llm():
+    assert fits(20, 16) and fits(20, 28)
+    assert not fits(20, 4) and not fits(20, 48) and not fits(0, 4)
+    assert personalize(UNITS, [], 28) is None
+    assert roadmap_from_library("Software Engineer", 1, []) is None
+    assert roadmap_from_library("Software Engineer", 12, []) is None
+    assert len(roadmap_from_library("Software Engineer", 5, [])["weeks"]) == 20
+
+
+def test_prebuilt_plan_is_served_for_its_timeframe(monkeypatch):
+    library = {"version": 1, "roles": {"sde": {"title": "SDE", "weeks": UNITS, "plans": {"12": UNITS * 8}}}}
+    monkeypatch.setattr(roadmap_library, "_library", library)
+    monkeypatch.setattr(roadmap_library, "_aliases", [("sde", "sde")])
+    assert len(roadmap_from_library("sde", 12, [])["weeks"]) == 48
+    assert roadmap_from_library("sde", 11, []) is None
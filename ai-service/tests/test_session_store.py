@@ -0,0 +1,59 @@
+from services.session_store import (
+    SessionStore,
+    ConversationSession,
+    format_history,
+    RECENT_WINDOW,
+    SUMMARY_MAX_CHARS,
+)
+
+
+def test_format_history_matches_assistant_format():
+    assert format_history([{"role": "user", "content": "hi"}, {"role": "assistant", "content": "yo"}]) == \
+        "USER: hi\nASSISTANT: yo\n"
+
+
+def test_old_messages_fold_into_a_bounded_summary():
+    session = ConversationSession("mentor:1")
+    for i in range(40):
+        session.append("user", f"Question number {i}. With some detail after the first sentence.")
+    assert len(session.recent) == RECENT_WINDOW
+    assert session.turns == 40
+    assert sum(len(line) + 1 for line in session.summary) <= SUMMARY_MAX_CHARS
+    # Summaries keep only the first sentence
+    assert all("detail" not in line for line in session.summary)
+    assert session.context().startswith("Earlier in this conversation (summary):")
+    assert "Question number 39." in session.context()
+
+
+def test_context_is_recomputed_after_append():
+    session = ConversationSession("mentor:1")
+    session.append("user", "one")
+    before = session.context()
+    session.append("assistant", "two")
+    assert session.context() != before and "ASSISTANT: two" in session.context()
+
+
+def test_lru_eviction_spills_and_reloads(tmp_path):
+    store = SessionStore(max_sessions=2, spill_dir=str(tmp_path))
+    for n in range(3):
+        store.seed(SessionStore.make_key("mentor", str(n)), [{"role": "user", "content": f"hello {n}"}])
+    assert store.stats()["sessions"] == 2
+    restored = store.get("mentor:0")
+    assert restored is not None and restored.recent[0]["content"] == "hello 0"
+    assert store.get("mentor:missing") is None
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+def test_idle_sessions_expire_without_spill_dir():
+    store = SessionStore(idle_ttl=0)
+    store.seed("mentor:1", [{"role": "user", "content": "hi"}])
+    store._sessions["mentor:1"].last_used -= 5
+    assert store.get("mentor:1") is None
+
+
+def test_drop_removes_spilled_copy(tmp_path):
+    store = SessionStore(max_sessions=1, spill_dir=str(tmp_path))
+    store.seed("mentor:1", [{"role": "user", "content": "a"}])
+    store.seed("mentor:2", [{"role": "user", "content": "b"}])
+    store.drop("mentor:1")
+    assert store.get("mentor:1") is None
@@ -0,0 +1,94 @@
+from services import text_compression
+from services.text_compression import clean_text, strip_jd_boilerplate, trim_to_budget, compress_text
+from services.token_usage import count_tokens
+
+
+def test_clean_text_removes_pdf_junk():
+    text = (
+        "ACME Corp - Confidential\n"
+        "Built a distrib-\nuted cacheﬁle   layer\n"
+        "Page 1 of 2\n"
+        "ACME Corp - Confidential\n"
+        "Led the migration to Kubernetes clusters\n"
+        "Led the migration to Kubernetes clusters\n"
+        "ACME Corp - Confidential\n"
+    )
+    assert clean_text(text).split("\n") == [
+        "ACME Corp - Confidential",
+        "Built a distributed cachefile layer",
+        "Led the migration to Kubernetes clusters",
+    ]
+
+
+CODE = (
+    "def total(rows):\n"
+    "    result = 0\n"
+    "    for row in rows:\n"
+    "        result += row.amount    # running sum\n"
+    "        result += row.amount    # running sum\n"
+    "    return result"
+)
+
+
+def test_fenced_code_is_kept_verbatim():
+    text = "Why   is this wrong?\n```python\n" + CODE + "\n```\nThanks  a lot"
+    cleaned = clean_text(text)
+    assert "```python\n" + CODE + "\n```" in cleaned
+    assert cleaned.startswith("Why is this wrong?") and cleaned.endswith("Thanks a lot")
+
+
+def test_indented_code_is_kept_in_chat_history():
+    indented = "\n".join("    " + line for line in CODE.split("\n"))
+    text = "My function:\n\n" + indented + "\n\nreturns  the wrong total"
+    cleaned = compress_text(text, "chat")
+    assert indented in cleaned
+    assert cleaned.endswith("returns the wrong total")
+    # Resumes still get their PDF indentation flattened
+    assert indented not in clean_text(text)
+
+
+def test_unclosed_fence_keeps_the_rest():
+    text = "see:\n```\nx  =  1\nx  =  1"
+    assert clean_text(text) == "see:\n\n```\nx  =  1\nx  =  1"
+
+
+def test_jd_boilerplate_is_stripped():
+    jd = (
+        "Backend Engineer\n"
+        "Requirements:\n"
+        "- 3+ years of Python and PostgreSQL\n"
+        "- Experience with Docker and AWS\n"
+        "Benefits:\n"
+        "- Health insurance and paid time off\n"
+        "- Free lunches\n"
+        "Responsibilities:\n"
+        "- Design and ship REST APIs used by millions of customers every day\n"
+        "We are an equal opportunity employer and value diversity at our company.\n"
+    )
+    stripped = strip_jd_boilerplate(jd)
+    assert "Python and PostgreSQL" in stripped and "REST APIs" in stripped
+    assert "Free lunches" not in stripped
+    assert "equal opportunity" not in stripped
+
+
+def test_trim_keeps_salient_lines_in_order():
+    resume = "\n".join(
+        ["Hobbies:"] + [f"- Enjoy long walks, reading novels and cooking dish {i}" for i in range(20)]
+        + ["Skills:", "- Python, Docker, Kubernetes, AWS, PostgreSQL"]
+        + ["Projects:", "- Built a React and Node.js dashboard serving 10k users"]
+    )
+    trimmed = trim_to_budget(resume, "resume", 40)
+    assert count_tokens(trimmed) <= 40
+    assert trimmed.index("Skills:") < trimmed.index("Python, Docker")
+    assert trimmed.index("Python, Docker") < trimmed.index("React and Node.js")
+    assert "dish 19" not in trimmed
+
+
+def test_compress_text_only_trims_over_budget(monkeypatch):
+    monkeypatch.setitem(text_compression.TOKEN_BUDGETS, "notes", 5)
+    short = "Python and SQL"
+    assert compress_text(short, "notes") == short
+    long = "\n".join(f"Note {i}: practiced Python and SQL questions today" for i in range(10))
+    assert count_tokens(compress_text(long, "notes")) <= 5 + 12
+    # Chat history is cleaned but never trimmed
+    assert compress_text(long, "chat") == long
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import token_usage
+from services.token_usage import (
+    MeteredLLM,
+    UsageLedger,
+    BudgetExceededError,
+    extract_usage,
+    usage_scope,
+)
+
+
+class FakeLLM:
+    def __init__(self, reply="ok", tokens=(60, 40)):
+        self.reply = reply
+        self.tokens = tokens
+        self.calls = 0
+
+    def invoke(self, prompt, *args, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            content=self.reply,
+            usage_metadata={"input_tokens": self.tokens[0], "output_tokens": self.tokens[1]},
+        )
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    fresh = UsageLedger(global_budget=100)
+    monkeypatch.setattr(token_usage, "ledger", fresh)
+    monkeypatch.setattr(token_usage, "response_cache", token_usage.ResponseCache(16))
+    monkeypatch.setattr(token_usage, "FALLBACK_HEADROOM", 0.5)
+    return fresh
+
+
+def test_extract_usage_shapes():
+    assert extract_usage(SimpleNamespace(usage_metadata={"input_tokens": 3, "output_tokens": 4})) == (3, 4)
+    assert extract_usage(SimpleNamespace(
+        usage_metadata=None, response_metadata={"token_usage": {"prompt_tokens": 5, "completion_tokens": 6}}
+    )) == (5, 6)
+    assert extract_usage(SimpleNamespace(content="x")) is None
+
+
+def test_usage_is_attributed_to_endpoint_and_user(ledger):
+    llm = MeteredLLM(FakeLLM(), "main")
+    with usage_scope(endpoint="/ai/chat", user="u1"):
+        llm.invoke("hello")
+    snapshot = ledger.snapshot()
+    assert snapshot["byEndpoint"]["/ai/chat"]["totalTokens"] == 100
+    assert snapshot["byUser"]["u1"]["calls"] == 1
+
+
+def test_over_budget_serves_cache_before_degrading(ledger):
+    main, cheap = FakeLLM("main"), FakeLLM("cheap")
+    llm = MeteredLLM(main, "main", lambda: MeteredLLM(cheap, "cheap"))
+    llm.invoke("same prompt")
+    assert ledger.over_budget() == "global"
+
+    assert llm.invoke("same prompt").content == "main"
+    assert cheap.calls == 0
+
+
+def test_fallback_spend_counts_and_429_is_reachable(ledger):
+    main, cheap = FakeLLM("main"), FakeLLM("cheap", tokens=(10, 10))
+    llm = MeteredLLM(main, "main", lambda: MeteredLLM(cheap, "cheap"))
+    llm.invoke("first")
+
+    # Budget 100, headroom 50%: degraded calls until 150 tokens are used
+    for i in range(3):
+        assert llm.invoke(f"prompt {i}").content == "cheap"
+    assert ledger.snapshot()["totals"]["degradedCalls"] == 3
+    assert ledger.snapshot()["totals"]["totalTokens"] == 160
+    with pytest.raises(BudgetExceededError):
+        llm.invoke("one more")
+    # Degraded answers are cached for repeats of the same prompt
+    assert llm.invoke("prompt 0").content == "cheap"
+    assert cheap.calls == 3
+
+
+def test_no_fallback_raises_once_over_budget(ledger):
+    llm = MeteredLLM(FakeLLM(), "main")
+    llm.invoke("first")
+    with pytest.raises(BudgetExceededError):
+        llm.invoke("second")
+
+
+def test_user_budget(ledger):
+    ledger.global_budget = 0
+    ledger.user_budget = 50
+    llm = MeteredLLM(FakeLLM(), "main")
+    with usage_scope(user="heavy"):
+        llm.invoke("a")
+        with pytest.raises(BudgetExceededError):
+            llm.invoke("b")
+    with usage_scope(user="light"):
+        assert llm.invoke("b").content == "ok"
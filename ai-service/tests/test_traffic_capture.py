@@ -0,0 +1,79 @@
+import json
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import traffic_capture
+from services.traffic_capture import TrafficRecorder, TrafficCaptureMiddleware, anonymize, resume_name
+
+RESUME = "Priya Sharma | SDE\npriya.sharma@gmail.com, +91 98765 43210\nPriya built a SQL dashboard."
+
+
+class ListRecorder(TrafficRecorder):
+    def __init__(self):
+        super().__init__("capture.jsonl")
+        self.captured = []
+
+    def record(self, record: dict):
+        self.captured.append(record)
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    fresh = ListRecorder()
+    monkeypatch.setattr(traffic_capture, "recorder", fresh)
+    return fresh
+
+
+def test_resume_name_from_first_line():
+    assert resume_name(RESUME) == "Priya Sharma"
+    assert resume_name("\n  RESUME\nPriya Sharma") is None
+    assert resume_name("Worked at Acme from 2019 to 2023") is None
+
+
+def test_anonymize_scrubs_name_everywhere_in_the_body():
+    body = anonymize({"resume_text": RESUME, "jd_text": "Reach out to priya sharma", "user_id": "42"},
+                     names=["Priya Sharma"])
+    assert "Priya" not in json.dumps(body) and "priya" not in json.dumps(body)
+    assert body["resume_text"].startswith("Candidate Name | SDE\ncandidate@example.com, +00 00000 00000")
+    assert body["user_id"].startswith("anon-")
+
+
+def call(middleware, body: dict, user: str = "u1"):
+    async def scenario():
+        messages = [{"type": "http.request", "body": json.dumps(body).encode(), "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": "/ai/chat", "query_string": b"",
+                 "headers": [(b"x-user-id", user.encode())]}
+        await middleware(scope, receive, send)
+        return sent
+
+    return asyncio.run(scenario())
+
+
+def test_llm_responses_and_later_requests_are_scrubbed(recorder):
+    async def app(scope, receive, send):
+        request = json.loads((await receive())["body"])
+        reply = SimpleNamespace(content=f"Hi Priya! About: {request.get('message', '')}")
+        await asyncio.to_thread(traffic_capture._record_llm_call, "groq", "prompt", reply, 0.01, (1, 2))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    middleware = TrafficCaptureMiddleware(app, recorder)
+    call(middleware, {"resume_text": RESUME})
+    # A chat without a resume: the name is remembered for the same user
+    call(middleware, {"message": "I am Priya Sharma, help me"})
+
+    dump = json.dumps(recorder.captured)
+    assert "Priya" not in dump and "Sharma" not in dump
+    llm = [r for r in recorder.captured if r["type"] == "llm"]
+    assert llm[0]["response"] == "Hi Candidate! About: "
+    assert recorder.captured[-1]["body"]["message"] == "I am Candidate Name, help me"
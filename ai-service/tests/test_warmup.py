@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from services import llm_clients, warmup
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    """
+    Empty step list and readiness state; returns the step list
+    """
+    steps = []
+    monkeypatch.setattr(warmup, "_steps", steps)
+    monkeypatch.setattr(warmup, "_state", {
+        "ready": False, "startedAt": None, "finishedAt": None, "durationSeconds": None, "steps": {}, "failed": [],
+    })
+    monkeypatch.setattr(llm_clients, "_clients", {})
+    monkeypatch.delenv("WARMUP_PING_PROVIDERS", raising=False)
+    return steps
+
+
+def test_not_ready_until_every_step_has_finished(fresh):
+    release = threading.Event()
+    entered = threading.Event()
+    fresh.append(("fast", lambda: "done"))
+    fresh.append(("slow", lambda: entered.set() or release.wait(5)))
+
+    thread = threading.Thread(target=warmup.run_warmup)
+    thread.start()
+    assert entered.wait(5)
+    state = warmup.readiness()
+    assert warmup.is_ready() is False and state["ready"] is False
+    assert state["steps"]["fast"]["ok"] is True and "slow" not in state["steps"]
+
+    release.set()
+    thread.join()
+    state = warmup.readiness()
+    assert state["ready"] is True and state["failed"] == []
+    assert state["durationSeconds"] is not None
+
+
+def test_failed_step_is_reported(fresh, caplog):
+    def broken():
+        raise RuntimeError("index file is corrupt")
+
+    fresh.append(("job_index", broken))
+    fresh.append(("prompts", lambda: 12))
+    with caplog.at_level("WARNING", logger="services.warmup"):
+        state = warmup.run_warmup()
+
+    assert state["failed"] == ["job_index"]
+    assert state["steps"]["job_index"] == {
+        "ok": False, "seconds": state["steps"]["job_index"]["seconds"], "error": "index file is corrupt",
+    }
+    assert state["steps"]["prompts"]["ok"] is True and state["steps"]["prompts"]["detail"] == 12
+    assert "index file is corrupt" in caplog.text and "failed steps: job_index" in caplog.text
+    # Still ready: the failed part is rebuilt lazily on first use
+    assert state["ready"] is True
+
+
+def test_failed_client_build_is_retried_lazily(fresh):
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ImportError("No module named 'langchain_groq'")
+        return "client"
+
+    fresh.append(("clients", lambda: llm_clients._cached(("groq", "m"), factory)))
+    state = warmup.run_warmup()
+    assert state["failed"] == ["clients"] and "langchain_groq" in state["steps"]["clients"]["error"]
+    assert llm_clients.built_clients() == []
+
+    assert llm_clients._cached(("groq", "m"), factory) == "client"
+    assert llm_clients._cached(("groq", "m"), factory) == "client"
+    assert len(attempts) == 2
+    assert llm_clients.built_clients() == ["groq:m"]
+
+
+def test_readiness_returns_a_snapshot(fresh):
+    state = warmup.readiness()
+    state["steps"]["x"] = {}
+    state["failed"].append("x")
+    assert warmup.readiness()["steps"] == {} and warmup.readiness()["failed"] == []
@@ -1,7 +1,7 @@
 import Resume from '../models/Resume.js';
 import JobProfile from '../models/JobProfile.js';
 import Analysis from '../models/Analysis.js';
-import { compareResumeWithJD } from '../services/aiService.js';
+import { compareResumeWithJD, fullAnalysis } from '../services/aiService.js';
 
 /**
  * Compare resume with job description using AI
@@ -37,12 +37,19 @@ export const compareResumeAndJD = async (req, res) => {
       return res.status(403).json({ message: 'Unauthorized access to job profile' });
     }
 
-    // Call AI service
-    const aiResult = await compareResumeWithJD(
-      resume.rawText,
-      jobProfile.jdText,
-      jobProfile.title
-    );
+    // Call AI service. A resume that has not been analyzed yet gets the
+    // analysis and the comparison from a single fused call.
+    const needsResumeAnalysis = !resume.summary && resume.parsedSkills.length === 0;
+    const aiResult = needsResumeAnalysis
+      ? await fullAnalysis(resume.rawText, jobProfile.jdText, jobProfile.title)
+      : await compareResumeWithJD(resume.rawText, jobProfile.jdText, jobProfile.title, req.user.userId);
+
+    if (needsResumeAnalysis) {
+      resume.parsedSkills = aiResult.skills || [];
+      resume.parsedProjects = aiResult.projects || [];
+      resume.summary = aiResult.summary || '';
+      await resume.save();
+    }
 
     // Create analysis record
     const analysis = new Analysis({
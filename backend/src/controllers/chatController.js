@@ -1,9 +1,7 @@
-import axios from 'axios';
 import fs from 'fs';
 import ChatConversation from '../models/ChatConversation.js';
 import { extractTextFromFile } from '../utils/fileTextExtractor.js';
-
-const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://localhost:8000';
+import { sendChatTurn } from '../services/aiService.js';
 
 /**
  * Send a message to the AI mentor and save conversation
@@ -41,15 +39,7 @@ export const sendMessage = async (req, res) => {
       }
     }
 
-    // Call AI service
-    const aiResponse = await axios.post(`${AI_SERVICE_URL}/ai/chat`, {
-      message: finalMessage,
-      conversation_history: parsedHistory || [],
-    });
-
-    const mentorResponse = aiResponse.data.response;
-
-    // Find or create conversation for user
+    // Find or create conversation for user (its id keys the AI service session)
     let conversation = await ChatConversation.findOne({ user: req.user.userId });
 
     if (!conversation) {
@@ -59,6 +49,15 @@ export const sendMessage = async (req, res) => {
       });
     }
 
+    // Call AI service with only the new message; history is sent only if
+    // the AI service needs to re-seed its session
+    const history = conversation.messages.length
+      ? conversation.messages.map((m) => ({ role: m.role, content: m.content }))
+      : (parsedHistory || []);
+    const aiResponse = await sendChatTurn('/ai/chat', conversation._id.toString(), finalMessage, history);
+
+    const mentorResponse = aiResponse.response;
+
     // Add user message and mentor response
     conversation.messages.push({
       role: 'user',
@@ -1,9 +1,7 @@
-import axios from 'axios';
 import fs from 'fs';
 import ClassroomConversation from '../models/ClassroomConversation.js';
 import { extractTextFromFile } from '../utils/fileTextExtractor.js';
-
-const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://localhost:8000';
+import { sendChatTurn } from '../services/aiService.js';
 
 /**
  * Send message to classroom assistant
@@ -45,17 +43,7 @@ export const sendMessageToAssistant = async (req, res) => {
       }
     }
 
-    // Call appropriate AI service endpoint
-    const endpoint = `${AI_SERVICE_URL}/ai/classroom/${assistantType}`;
-    const aiResponse = await axios.post(endpoint, {
-      message: finalMessage,
-      conversation_history: parsedHistory || [],
-    });
-
-    const assistantResponse = aiResponse.data.response;
-    const assistantRole = aiResponse.data.role;
-
-    // Find or create conversation
+    // Find or create conversation (its id keys the AI service session)
     let conversation = await ClassroomConversation.findOne({ 
       user: req.user.userId,
       assistantType 
@@ -69,6 +57,20 @@ export const sendMessageToAssistant = async (req, res) => {
       });
     }
 
+    // Call appropriate AI service endpoint with only the new message
+    const history = conversation.messages.length
+      ? conversation.messages.map((m) => ({ role: m.role, content: m.content }))
+      : (parsedHistory || []);
+    const aiResponse = await sendChatTurn(
+      `/ai/classroom/${assistantType}`,
+      conversation._id.toString(),
+      finalMessage,
+      history
+    );
+
+    const assistantResponse = aiResponse.response;
+    const assistantRole = aiResponse.role;
+
     // Add messages
     conversation.messages.push({
       role: 'user',
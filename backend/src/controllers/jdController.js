@@ -1,4 +1,6 @@
 import JobProfile from '../models/JobProfile.js';
+import Resume from '../models/Resume.js';
+import { indexJobProfiles, removeIndexedJobProfile, recommendJobs } from '../services/aiService.js';
 
 /**
  * Create a new job profile
@@ -22,6 +24,11 @@ export const createJobProfile = async (req, res) => {
 
     await jobProfile.save();
 
+    // Keep the recommendation index in sync; never fail the request over it
+    indexJobProfiles([jobProfile]).catch((error) =>
+      console.error('Job profile indexing error:', error.message)
+    );
+
     res.status(201).json({
       message: 'Job profile created successfully',
       jobProfile: {
@@ -78,9 +85,49 @@ export const deleteJobProfile = async (req, res) => {
 
     await JobProfile.findByIdAndDelete(jdId);
 
+    removeIndexedJobProfile(jdId).catch((error) =>
+      console.error('Job profile index removal error:', error.message)
+    );
+
     res.json({ message: 'Job profile deleted successfully' });
   } catch (error) {
     console.error('Delete job profile error:', error);
     res.status(500).json({ message: 'Error deleting job profile', error: error.message });
   }
 };
+
+/**
+ * Rank the user's job profiles against one of their resumes
+ */
+export const getJobRecommendations = async (req, res) => {
+  try {
+    const { resumeId } = req.params;
+    const topN = Math.min(Math.max(parseInt(req.query.limit, 10) || 10, 1), 100);
+
+    const resume = await Resume.findById(resumeId);
+    if (!resume) {
+      return res.status(404).json({ message: 'Resume not found' });
+    }
+
+    if (resume.userId.toString() !== req.user.userId) {
+      return res.status(403).json({ message: 'Unauthorized access to resume' });
+    }
+
+    let result = await recommendJobs(resume.rawText, resume.parsedSkills, req.user.userId, topN);
+
+    // Profiles created before the index existed (or lost with it) are
+    // indexed on first use, then the query is retried once
+    if (result.matches.length === 0) {
+      const jobProfiles = await JobProfile.find({ userId: req.user.userId });
+      if (jobProfiles.length > 0) {
+        await indexJobProfiles(jobProfiles);
+        result = await recommendJobs(resume.rawText, resume.parsedSkills, req.user.userId, topN);
+      }
+    }
+
+    res.json({ recommendations: result.matches });
+  } catch (error) {
+    console.error('Get job recommendations error:', error);
+    res.status(500).json({ message: 'Error fetching job recommendations', error: error.message });
+  }
+};
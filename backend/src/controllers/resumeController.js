@@ -3,7 +3,9 @@ import path from 'path';
 import fs from 'fs';
 import pdfParse from 'pdf-parse';
 import Resume from '../models/Resume.js';
-import { analyzeResume } from '../services/aiService.js';
+import User from '../models/User.js';
+import JobProfile from '../models/JobProfile.js';
+import { analyzeResume, dropPrecomputed } from '../services/aiService.js';
 
 // Configure multer for PDF upload
 const storage = multer.diskStorage({
@@ -94,8 +96,16 @@ export const analyzeResumeById = async (req, res) => {
       return res.status(403).json({ message: 'Unauthorized access to resume' });
     }
 
-    // Call AI service
-    const aiResult = await analyzeResume(resume.rawText);
+    // Call AI service; the target role and the latest job profiles let it
+    // prepare the roadmap and comparisons the user is likely to ask for next
+    const [user, jobProfiles] = await Promise.all([
+      User.findById(req.user.userId).select('targetRole'),
+      JobProfile.find({ userId: req.user.userId }).sort({ createdAt: -1 }).limit(3),
+    ]);
+    const aiResult = await analyzeResume(resume.rawText, req.user.userId, {
+      targetRole: user?.targetRole,
+      jobs: jobProfiles,
+    });
 
     // Update resume with AI analysis
     resume.parsedSkills = aiResult.skills || [];
@@ -170,6 +180,10 @@ export const deleteResume = async (req, res) => {
 
     await resume.deleteOne();
 
+    dropPrecomputed(req.user.userId).catch((error) =>
+      console.error('Precompute drop error:', error.message)
+    );
+
     res.json({ message: 'Resume deleted successfully' });
   } catch (error) {
     console.error('Delete resume error:', error);
@@ -21,7 +21,8 @@ export const generateLearningRoadmap = async (req, res) => {
     const roadmapData = await generateRoadmap(
       targetRole,
       timeframeMonths,
-      currentSkills || []
+      currentSkills || [],
+      req.user.userId
     );
 
     // Save to database
@@ -1,5 +1,5 @@
 import express from 'express';
-import { createJobProfile, getUserJobProfiles, deleteJobProfile } from '../controllers/jdController.js';
+import { createJobProfile, getUserJobProfiles, deleteJobProfile, getJobRecommendations } from '../controllers/jdController.js';
 import { authMiddleware } from '../middleware/authMiddleware.js';
 
 const router = express.Router();
@@ -10,6 +10,9 @@ router.post('/', authMiddleware, createJobProfile);
 // GET /api/jd - Get all job profiles for authenticated user
 router.get('/', authMiddleware, getUserJobProfiles);
 
+// GET /api/jd/recommendations/:resumeId - Rank the user's job profiles for a resume
+router.get('/recommendations/:resumeId', authMiddleware, getJobRecommendations);
+
 // DELETE /api/jd/:jdId - Delete a job profile
 router.delete('/:jdId', authMiddleware, deleteJobProfile);
 
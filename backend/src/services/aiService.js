@@ -3,16 +3,25 @@ import axios from 'axios';
 const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://localhost:8000';
 
 /**
- * Analyze resume text using AI service
+ * Analyze resume text using AI service. With a userId and precompute hints
+ * ({ targetRole, jobs: [{ jdText, title }] }) the AI service also generates
+ * the likely follow-ups (roadmap, JD comparisons) in the background.
  */
-export const analyzeResume = async (resumeText) => {
+export const analyzeResume = async (resumeText, userId = null, precompute = null) => {
   try {
     const response = await axios.post(`${AI_SERVICE_URL}/ai/analyze-resume`, {
       resume_text: resumeText,
+      ...(userId && precompute && {
+        precompute: {
+          target_role: precompute.targetRole || null,
+          jobs: (precompute.jobs || []).map((jd) => ({ jd_text: jd.jdText, target_role: jd.title })),
+        },
+      }),
     }, {
       timeout: 30000,
       headers: {
         'Content-Type': 'application/json',
+        ...(userId && { 'X-User-Id': userId }),
       }
     });
     return response.data;
@@ -27,14 +36,17 @@ export const analyzeResume = async (resumeText) => {
 };
 
 /**
- * Compare resume with job description using AI service
+ * Compare resume with job description using AI service (with a userId, a
+ * comparison precomputed for that user is served when available)
  */
-export const compareResumeWithJD = async (resumeText, jdText, targetRole) => {
+export const compareResumeWithJD = async (resumeText, jdText, targetRole, userId = null) => {
   try {
     const response = await axios.post(`${AI_SERVICE_URL}/ai/compare-resume-jd`, {
       resume_text: resumeText,
       jd_text: jdText,
       target_role: targetRole,
+    }, {
+      headers: { ...(userId && { 'X-User-Id': userId }) },
     });
     return response.data;
   } catch (error) {
@@ -44,14 +56,35 @@ export const compareResumeWithJD = async (resumeText, jdText, targetRole) => {
 };
 
 /**
- * Generate learning roadmap using AI service
+ * Analyze resume and compare it with a job description in one AI service call
+ * (both LLM calls run concurrently on the AI service)
+ */
+export const fullAnalysis = async (resumeText, jdText, targetRole) => {
+  try {
+    const response = await axios.post(`${AI_SERVICE_URL}/ai/full-analysis`, {
+      resume_text: resumeText,
+      jd_text: jdText,
+      target_role: targetRole,
+    });
+    return response.data;
+  } catch (error) {
+    console.error('AI Service Error (full-analysis):', error.message);
+    throw new Error('Failed to analyze resume and JD with AI service');
+  }
+};
+
+/**
+ * Generate learning roadmap using AI service (with a userId, a roadmap
+ * precomputed for that user is served when available)
  */
-export const generateRoadmap = async (targetRole, timeframeMonths, currentSkills) => {
+export const generateRoadmap = async (targetRole, timeframeMonths, currentSkills, userId = null) => {
   try {
     const response = await axios.post(`${AI_SERVICE_URL}/ai/generate-roadmap`, {
       target_role: targetRole,
       timeframe_months: timeframeMonths,
       current_skills: currentSkills,
+    }, {
+      headers: { ...(userId && { 'X-User-Id': userId }) },
     });
     return response.data;
   } catch (error) {
@@ -59,3 +92,85 @@ export const generateRoadmap = async (targetRole, timeframeMonths, currentSkills
     throw new Error('Failed to generate roadmap with AI service');
   }
 };
+
+/**
+ * Send one chat turn to a chat/classroom endpoint using the AI service's
+ * server-side conversation session. Only the new message is sent; the full
+ * history is sent once to (re)seed the session when the AI service does not
+ * know the conversation yet (first turn, restart or eviction).
+ */
+export const sendChatTurn = async (path, conversationId, message, history = []) => {
+  const url = `${AI_SERVICE_URL}${path}`;
+  try {
+    const response = await axios.post(url, {
+      message,
+      conversation_id: conversationId,
+    });
+    return response.data;
+  } catch (error) {
+    if (error.response?.status !== 409) {
+      throw error;
+    }
+  }
+
+  const response = await axios.post(url, {
+    message,
+    conversation_id: conversationId,
+    conversation_history: history,
+  });
+  return response.data;
+};
+
+/**
+ * Add or update job profiles in the AI service's recommendation index
+ */
+export const indexJobProfiles = async (jobProfiles) => {
+  const response = await axios.post(`${AI_SERVICE_URL}/ai/job-profiles`, {
+    profiles: jobProfiles.map((jd) => ({
+      id: jd._id.toString(),
+      title: jd.title,
+      company: jd.company,
+      jd_text: jd.jdText,
+      owner: jd.userId.toString(),
+    })),
+  });
+  return response.data;
+};
+
+/**
+ * Remove a job profile from the recommendation index (missing is not an error)
+ */
+export const removeIndexedJobProfile = async (jobProfileId) => {
+  try {
+    await axios.delete(`${AI_SERVICE_URL}/ai/job-profiles/${jobProfileId}`);
+  } catch (error) {
+    if (error.response?.status !== 404) {
+      throw error;
+    }
+  }
+};
+
+/**
+ * Top-N job profiles of one user ranked against a resume
+ */
+export const recommendJobs = async (resumeText, skills, ownerId, topN = 10) => {
+  try {
+    const response = await axios.post(`${AI_SERVICE_URL}/ai/recommend-jobs`, {
+      resume_text: resumeText,
+      skills,
+      owner: ownerId,
+      top_n: topN,
+    });
+    return response.data;
+  } catch (error) {
+    console.error('AI Service Error (recommend-jobs):', error.message);
+    throw new Error('Failed to recommend jobs with AI service');
+  }
+};
+
+/**
+ * Drop a user's speculative follow-ups on the AI service (resume changed)
+ */
+export const dropPrecomputed = async (userId) => {
+  await axios.delete(`${AI_SERVICE_URL}/ai/precompute/${userId}`);
+};
@@ -10,7 +10,9 @@ try {
   mammoth = null;
 }
 
-const MAX_CHARS = 15000; // safety limit
+// Safety limit only: the AI service trims long inputs by salience, so a
+// tail cut here would drop content it could have kept
+const MAX_CHARS = 60000;
 
 export async function extractTextFromFile(filePath, mimetype, originalname) {
   const ext = path.extname(originalname || '').toLowerCase();